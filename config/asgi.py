@@ -5,6 +5,37 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
+
+Deploy ASGI (gunicorn + uvicorn worker)
+---------------------------------------
+View baca (daftar, rekap, API JSON) adalah view async; dashboard sync
+karena query-nya sudah digabung dan tidak ada yang bisa ditunggu paralel.
+Di gunicorn sync worker setiap worker hanya melayani satu request
+sekaligus; dengan uvicorn worker satu proses melayani banyak pembaca
+bersamaan, dan view sync (form, cetak PDF, export Excel) otomatis
+dijalankan Django di thread terpisah lewat sync_to_async::
+
+    gunicorn config.asgi:application \\
+        -c config/gunicorn.conf.py \\
+        -k uvicorn_worker.UvicornWorker \\
+        --workers ${WEB_CONCURRENCY:-2} \\
+        --bind 0.0.0.0:${PORT:-8000} \\
+        --timeout 120
+
+Catatan:
+
+* Di ASGI setiap request memakai thread DB sendiri, jadi koneksi
+  persisten tidak pernah dipakai ulang dan hanya menumpuk. Karena itu
+  DB_CONN_MAX_AGE default-nya 0 di entry point ini. Untuk PostgreSQL
+  gunakan PgBouncer (atau DB_POOL=True di Django 5.1+).
+* Deploy WSGI lama (``gunicorn config.wsgi``) tetap berjalan; view async
+  dijalankan di event loop sementara per request.
+* Metrik /metrics dijumlahkan dari file per worker di
+  PROMETHEUS_MULTIPROC_DIR. config/gunicorn.conf.py mengosongkan
+  direktori itu saat master start dan menandai worker yang mati
+  (mark_process_dead); tanpa ``-c config/gunicorn.conf.py`` file dari
+  proses lama ikut terjumlah. /metrics butuh METRIK_TOKEN di produksi.
+* Lokal: ``uvicorn config.asgi:application --reload``.
 """
 
 import os
@@ -12,5 +43,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -0,0 +1,24 @@
+# =========================================================
+# KONFIGURASI GUNICORN (lihat config/asgi.py)
+# =========================================================
+# prometheus_client mode multiprocess menulis satu file .db per PID di
+# PROMETHEUS_MULTIPROC_DIR dan /metrics menjumlahkan semuanya. File dari
+# deploy sebelumnya harus dibuang SEBELUM worker pertama start, jadi
+# dikosongkan di master (on_starting). Worker yang mati ditandai lewat
+# mark_process_dead() agar gauge live-nya tidak ikut terbaca; counter
+# dan histogram worker itu tetap dijumlahkan (nilainya tidak boleh turun).
+import os
+import shutil
+
+from config.settings import PROMETHEUS_MULTIPROC_DIR
+
+
+def on_starting(server):
+    shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid, PROMETHEUS_MULTIPROC_DIR)
@@ -49,7 +49,10 @@ INSTALLED_APPS = [
 ]
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # pindah ke sini
+    # WhiteNoise versi async-capable (lihat sarpras/middleware.py)
+    'sarpras.middleware.WhiteNoiseMiddleware',  # pindah ke sini
+    # Server-Timing + log request lambat (file statis tidak ikut diukur)
+    'sarpras.middleware.TimingMiddleware',
 
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -57,6 +60,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # ?profil=1 untuk superuser: view dijalankan di bawah cProfile
+    'sarpras.middleware.ProfilMiddleware',
 ]
 
 
@@ -64,7 +69,8 @@ ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates + waktu render untuk TimingMiddleware
+        'BACKEND': 'sarpras.backends.templates.DjangoTemplates',
 
         # =====================================
         # TEMPLATE DIR
@@ -91,12 +97,100 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # =====================================
 # DATABASE
 # =====================================
+# Koneksi dipakai ulang antar request (CONN_MAX_AGE detik, 0 = tutup
+# setiap akhir request). Health check memastikan koneksi yang sudah
+# diputus server (restart / idle timeout) tidak dipakai lagi.
+# config/asgi.py men-default-kan DB_CONN_MAX_AGE=0 (lihat catatan di sana).
+DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", "600"))
+DB_CONN_HEALTH_CHECKS = os.environ.get("DB_CONN_HEALTH_CHECKS", "True") == "True"
+
 DATABASES = {
     'default': dj_database_url.config(
-        default='sqlite:///' + str(BASE_DIR / 'db.sqlite3')
+        default='sqlite:///' + str(BASE_DIR / 'db.sqlite3'),
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=DB_CONN_HEALTH_CHECKS,
     )
 }
 
+# Profil SQLite untuk sekolah yang memakai db.sqlite3 di produksi:
+# PRAGMA di bawah dijalankan di setiap koneksi baru (signal
+# connection_created, sarpras/signals.py) dan transaksi dibuka dengan
+# BEGIN IMMEDIATE (sarpras/backends/sqlite3) agar penulis bersamaan
+# antre, bukan gagal "database is locked". Matikan dengan SQLITE_TUNING=False.
+SQLITE_TUNING = os.environ.get("SQLITE_TUNING", "True") == "True"
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': int(os.environ.get("SQLITE_MMAP_SIZE", str(128 * 1024 * 1024))),
+    # nilai negatif = KiB
+    'cache_size': -int(os.environ.get("SQLITE_CACHE_KB", "20000")),
+    'busy_timeout': int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    'temp_store': 'MEMORY',
+}
+
+if SQLITE_TUNING and DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default']['ENGINE'] = 'sarpras.backends.sqlite3'
+
+# Connection pool bawaan Django (butuh Django >= 5.1 + psycopg 3 dengan
+# psycopg_pool). Pool menggantikan koneksi persisten, jadi CONN_MAX_AGE
+# harus 0. requirements.txt masih Django 5.0 + psycopg2: di sana gunakan
+# PgBouncer dan biarkan DB_POOL=False.
+if (
+    os.environ.get("DB_POOL", "False") == "True"
+    and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql'
+):
+    import django
+    from importlib.util import find_spec
+    from django.core.exceptions import ImproperlyConfigured
+
+    if django.VERSION < (5, 1) or not (find_spec('psycopg') and find_spec('psycopg_pool')):
+        raise ImproperlyConfigured(
+            'DB_POOL=True butuh Django >= 5.1 dan psycopg[pool] (psycopg 3). '
+            'Dengan psycopg2 gunakan PgBouncer dan set DB_POOL=False.'
+        )
+
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': int(os.environ.get("DB_POOL_MIN", "2")),
+        'max_size': int(os.environ.get("DB_POOL_MAX", "10")),
+        'timeout': int(os.environ.get("DB_POOL_TIMEOUT", "10")),
+    }
+
+
+# =====================================
+# CACHE
+# =====================================
+# Default: cache file (dibagi semua worker gunicorn di satu server,
+# sehingga versi model di sarpras/cache_versi.py konsisten antar proses).
+# Jika REDIS_URL diset (butuh paket `redis`), cache memakai Redis.
+# CACHE_BACKEND=locmem untuk pengembangan satu proses.
+REDIS_URL = os.environ.get("REDIS_URL")
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "redis" if REDIS_URL else "file")
+
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'sarpras',
+        }
+    }
+elif CACHE_BACKEND == "locmem":
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'sarpras',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get("CACHE_DIR", str(BASE_DIR / '.cache')),
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+
 
 # =====================================
 # PASSWORD VALIDATION
@@ -126,6 +220,12 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# collectstatic menambahkan hash isi ke nama file (bootstrap.subset.min.3f2a…css)
+# dan menyiapkan versi .gz serta .br (jika paket Brotli terpasang).
+# WhiteNoise melayani file ber-hash dengan Cache-Control immutable 10
+# tahun, dan memilih .br / .gz sesuai Accept-Encoding browser.
+# Bootstrap, Bootstrap Icons dan Chart.js ada di sarpras/static/sarpras/vendor
+# (tidak lagi dari CDN); subset CSS-nya dibangun scripts/build_css.py.
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 
@@ -135,6 +235,67 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# di produksi (DEBUG=False) media dilayani Django sendiri, lihat
+# sarpras/media.py; set False jika sudah dilayani nginx / web server
+SERVE_MEDIA = os.environ.get("SERVE_MEDIA", "True") == "True"
+
+# gambar upload dinormalisasi di background (lihat sarpras/gambar.py):
+# EXIF dibuang, orientasi dibetulkan, diperkecil & dikompres ulang
+GAMBAR_MAKS_DIMENSI = int(os.environ.get("GAMBAR_MAKS_DIMENSI", "1600"))
+GAMBAR_KUALITAS = int(os.environ.get("GAMBAR_KUALITAS", "82"))
+GAMBAR_SIMPAN_ASLI = os.environ.get("GAMBAR_SIMPAN_ASLI", "False") == "True"
+
+
+# =====================================
+# PENGUKURAN & LOGGING
+# =====================================
+# TimingMiddleware (sarpras/middleware.py): header Server-Timing di setiap
+# response (db, tpl, pdf, total) dan satu baris JSON ke logger
+# "sarpras.lambat" untuk request yang lebih lama dari REQUEST_LAMBAT_MS
+# (0 = log dimatikan).
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "True") == "True"
+REQUEST_LAMBAT_MS = int(os.environ.get("REQUEST_LAMBAT_MS", "500"))
+
+# Profil on-demand (ProfilMiddleware): superuser menambahkan ?profil=1
+# atau header "X-Profil: 1"; view dijalankan di bawah cProfile dan file
+# .prof disimpan di PROFIL_DIR (di luar MEDIA_ROOT), daftarnya di admin
+# "Profil request". Mati secara default; nyalakan sementara saat
+# menyelidiki halaman lambat. Hanya PROFIL_MAKS profil terbaru yang
+# disimpan, yang lebih lama dihapus beserta file .prof-nya.
+PROFIL_AKTIF = os.environ.get("PROFIL_AKTIF", "False") == "True"
+PROFIL_DIR = os.environ.get("PROFIL_DIR", str(BASE_DIR / '.profil'))
+PROFIL_MAKS = int(os.environ.get("PROFIL_MAKS", "100"))
+
+# Metrik Prometheus di /metrics (sarpras/metrik.py). Nilai setiap worker
+# ditulis ke file di PROMETHEUS_MULTIPROC_DIR lalu dijumlahkan saat
+# scrape; variabel lingkungan ini harus sudah ada sebelum
+# prometheus_client di-import, jadi diset di sini; config/gunicorn.conf.py
+# mengosongkannya saat master start. Scrape wajib mengirim
+# "Authorization: Bearer <METRIK_TOKEN>"; tanpa METRIK_TOKEN /metrics
+# hanya terbuka saat DEBUG=True (selain itu 404).
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", str(BASE_DIR / '.metrik')
+)
+METRIK_TOKEN = os.environ.get("METRIK_TOKEN", "")
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'polos': {'format': '%(asctime)s %(levelname)s %(name)s %(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'polos'},
+    },
+    'loggers': {
+        'sarpras': {
+            'handlers': ['console'],
+            'level': os.environ.get("SARPRAS_LOG_LEVEL", "INFO"),
+            'propagate': False,
+        },
+    },
+}
+
 
 # =====================================
 # DEFAULT PRIMARY KEY
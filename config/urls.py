@@ -1,10 +1,14 @@
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 
 # untuk handle media (gambar)
 from django.conf import settings
 from django.conf.urls.static import static
 
+from sarpras.media import serve_media
+
 urlpatterns = [
     # admin django
     path('admin/', admin.site.urls),
@@ -19,14 +23,20 @@ urlpatterns = [
 # ===============================
 # SETTING MEDIA FILE
 # ===============================
-# agar file gambar (ImageField) bisa diakses di browser
-# HANYA aktif saat DEBUG = True
+# agar file gambar (ImageField) bisa diakses di browser.
+# Saat DEBUG memakai static() bawaan Django; di produksi memakai
+# sarpras.media.serve_media (Cache-Control immutable, ETag, Range),
+# kecuali SERVE_MEDIA=False karena media sudah dilayani web server.
 if settings.DEBUG:
     urlpatterns += static(
         settings.MEDIA_URL,
         document_root=settings.MEDIA_ROOT
     )
-
-
-
-
+elif settings.SERVE_MEDIA:
+    urlpatterns += [
+        re_path(
+            r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')),
+            serve_media,
+            name='media',
+        ),
+    ]
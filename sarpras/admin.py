@@ -1,4 +1,7 @@
 from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
 from django.utils.html import format_html
 
 # import model satu per satu (aman & jelas)
@@ -12,9 +15,12 @@ from .models import (
     BarangHabisPakai,
     BarangHabisPakaiMasuk,
     BarangHabisPakaiKeluar,
-    Ruangan
-            
+    Ruangan,
+    Reservasi,
+    MutasiPeralatan,
+    ProfilRequest,
 )
+from .total_ruangan import geser_peralatan
 
 # =====================================================
 # KIB B - PERALATAN & MESIN (ADA GAMBAR)
@@ -45,13 +51,37 @@ class PeralatanMesinAdmin(admin.ModelAdmin):
 
     gambar_preview.short_description = 'Gambar'
 
+    # total per ruangan / gedung ikut diperbarui (lihat total_ruangan.py)
+    def save_model(self, request, obj, form, change):
+        lama = None
+        if change:
+            lama = (
+                PeralatanMesin.objects
+                .filter(pk=obj.pk)
+                .values_list('ruangan_id', 'jumlah')
+                .first()
+            )
+        super().save_model(request, obj, form, change)
+        geser_peralatan(lama, (obj.ruangan_id, obj.jumlah))
+
+    def delete_model(self, request, obj):
+        geser_peralatan(lama=(obj.ruangan_id, obj.jumlah))
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        for ruangan_id, jumlah in queryset.values_list('ruangan_id', 'jumlah'):
+            geser_peralatan(lama=(ruangan_id, jumlah))
+        super().delete_queryset(request, queryset)
+
 #==================================================================
 # habis pakai disisni
 #==================================================================
 
 @admin.register(BarangHabisPakai)
 class BarangHabisPakaiAdmin(admin.ModelAdmin):
-    list_display = ('kode_barang', 'nama_barang', 'stok', 'satuan')
+    list_display = ('kode_barang', 'nama_barang', 'stok', 'stok_minimum', 'perlu_restock', 'satuan')
+    list_editable = ('stok_minimum',)
+    list_filter = ('perlu_restock',)
     search_fields = ('kode_barang', 'nama_barang')
 
 
@@ -66,6 +96,72 @@ class BarangKeluarAdmin(admin.ModelAdmin):
     list_display = ('barang', 'jumlah', 'tanggal', 'pengguna', 'keperluan')
     list_filter = ('tanggal', 'pengguna')
 
+# =====================================================
+# RESERVASI PERALATAN
+# =====================================================
+@admin.register(Reservasi)
+class ReservasiAdmin(admin.ModelAdmin):
+    list_display = ('barang', 'pemesan', 'jumlah', 'tanggal_mulai', 'tanggal_selesai', 'status')
+    list_filter = ('status', 'tanggal_mulai')
+    search_fields = ('pemesan', 'barang__nama', 'barang__kode_barang')
+
+@admin.register(MutasiPeralatan)
+class MutasiPeralatanAdmin(admin.ModelAdmin):
+    list_display = ('peralatan', 'dari_ruangan', 'ke_ruangan', 'tanggal', 'keterangan')
+    list_filter = ('tanggal',)
+    search_fields = ('peralatan__nama', 'peralatan__kode_barang')
+
+# =====================================================
+# PROFIL REQUEST (HASIL ?profil=1, HANYA BACA)
+# =====================================================
+@admin.register(ProfilRequest)
+class ProfilRequestAdmin(admin.ModelAdmin):
+    list_display = ('waktu', 'method', 'url', 'status', 'durasi_ms', 'query', 'pengguna', 'unduh')
+    list_filter = ('waktu', 'view')
+    search_fields = ('url', 'view')
+    date_hierarchy = 'waktu'
+    fields = ('waktu', 'pengguna', 'method', 'url', 'view', 'status', 'durasi_ms', 'query', 'unduh', 'ringkasan')
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                '<int:pk>/unduh/',
+                self.admin_site.admin_view(self.unduh_view),
+                name='sarpras_profilrequest_unduh',
+            ),
+        ] + super().get_urls()
+
+    def unduh(self, obj):
+        return format_html(
+            '<a href="{}">.prof</a>',
+            reverse('admin:sarpras_profilrequest_unduh', args=[obj.pk])
+        )
+
+    unduh.short_description = 'Unduh'
+
+    # file profil berisi jalur kode & isi URL: hanya untuk yang boleh melihat
+    def unduh_view(self, request, pk):
+        if not self.has_view_permission(request):
+            raise Http404
+        profil = get_object_or_404(ProfilRequest, pk=pk)
+        try:
+            berkas = profil.berkas.open('rb')
+        except FileNotFoundError:
+            raise Http404('File profil sudah tidak ada.')
+        return FileResponse(
+            berkas,
+            as_attachment=True,
+            filename=profil.berkas.name.rsplit('/', 1)[-1],
+            content_type='application/octet-stream',
+        )
+
 # =====================================================
 # MODEL LAIN (REGISTRASI SIMPEL, TIDAK DIUBAH)
 # =====================================================
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class SarprasConfig(AppConfig):
     name = 'sarpras'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,19 @@
+# =========================================================
+# BACKEND SQLITE DENGAN BEGIN IMMEDIATE
+# =========================================================
+# transaction.atomic() di SQLite membuka transaksi dengan BEGIN
+# (DEFERRED): kunci tulis baru diminta saat UPDATE pertama. Dua request
+# yang sama-sama sudah membaca stok lalu ingin menulis akan saling
+# tunggu dan salah satunya gagal "database is locked" tanpa menunggu
+# busy_timeout. Dengan BEGIN IMMEDIATE kunci tulis diambil di awal
+# transaksi, jadi penulis berikutnya antre (busy_timeout) dan membaca
+# stok terbaru. Setara OPTIONS['transaction_mode'] = 'IMMEDIATE' di
+# Django 5.1+.
+#
+# PRAGMA (WAL, synchronous, mmap, cache) diset di sarpras/signals.py.
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute("BEGIN IMMEDIATE")
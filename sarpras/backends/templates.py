@@ -0,0 +1,28 @@
+# =========================================================
+# TEMPLATE BACKEND DJANGO + PENGUKURAN WAKTU RENDER
+# =========================================================
+# Sama dengan django.template.backends.django.DjangoTemplates, hanya
+# Template.render dibungkus ukur('template') (lihat pengukuran.py).
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates as _DjangoTemplates
+from django.template.backends.django import Template as _Template
+from django.template.backends.django import reraise
+
+from ..pengukuran import ukur
+
+
+class Template(_Template):
+    def render(self, context=None, request=None):
+        with ukur('template'):
+            return super().render(context, request)
+
+
+class DjangoTemplates(_DjangoTemplates):
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -0,0 +1,141 @@
+# =========================================================
+# CACHE BERVERSI PER MODEL
+# =========================================================
+# Setiap model KIB / BHP punya satu kunci versi di cache. Kunci cache
+# halaman / queryset memuat versi model-model yang dibacanya, misalnya
+#
+#   sarpras:peralatan_rekap:18f3a...   (versi PeralatanMesin)
+#
+# Begitu tabelnya berubah, versi diganti (signal post_save /
+# post_delete, atau panggilan naikkan() setelah queryset.update()),
+# sehingga kunci lama tidak pernah dibaca lagi dan kedaluwarsa sendiri.
+# Tidak ada daftar kunci yang perlu dihapus satu per satu.
+#
+# Versi berupa token unik (waktu dalam nanodetik), bukan counter +1,
+# karena incr() di cache file / locmem tidak atomik antar proses: dua
+# perubahan bersamaan tetap menghasilkan versi yang berbeda dari
+# versi yang mungkin sudah dipakai pembaca.
+#
+# aversi() / aambil() adalah pasangan async untuk view async (ASGI).
+# ditunda() menggabungkan banyak naikkan() (operasi massal) jadi satu.
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+PREFIX = 'sarpras'
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _key(model):
+    return f'{PREFIX}:versi:{model._meta.label_lower}'
+
+
+def _token():
+    return format(time.time_ns(), 'x')
+
+
+def versi(*models):
+    """Gabungan versi semua `models`, dipakai sebagai bagian kunci cache."""
+    keys = [_key(model) for model in models]
+    ada = cache.get_many(keys)
+
+    for key in keys:
+        if key not in ada:
+            cache.add(key, _token(), None)
+            ada[key] = cache.get(key)
+
+    return '.'.join(str(ada[key]) for key in keys)
+
+
+async def aversi(*models):
+    keys = [_key(model) for model in models]
+    ada = await cache.aget_many(keys)
+
+    for key in keys:
+        if key not in ada:
+            await cache.aadd(key, _token(), None)
+            ada[key] = await cache.aget(key)
+
+    return '.'.join(str(ada[key]) for key in keys)
+
+
+_tunda = threading.local()
+
+
+def naikkan(*models):
+    """Ganti versi `models` setelah transaksi yang sedang berjalan commit."""
+    keys = [_key(model) for model in models]
+
+    tertunda = getattr(_tunda, 'keys', None)
+    if tertunda is not None:
+        tertunda.update(keys)
+        return
+
+    transaction.on_commit(
+        lambda: cache.set_many({key: _token() for key in keys}, None)
+    )
+
+
+@contextmanager
+def ditunda():
+    """
+    Kumpulkan semua naikkan() di dalam blok dan ganti versinya sekali
+    di akhir. Dipakai untuk operasi massal (misalnya queryset.delete()
+    ribuan baris) yang memicu signal post_delete per baris.
+    """
+    if getattr(_tunda, 'keys', None) is not None:
+        yield
+        return
+
+    _tunda.keys = set()
+    try:
+        yield
+    finally:
+        keys, _tunda.keys = _tunda.keys, None
+        if keys:
+            transaction.on_commit(
+                lambda: cache.set_many({key: _token() for key in keys}, None)
+            )
+
+
+def _kunci(nama, nomor_versi, param):
+    key = f'{PREFIX}:{nama}:{nomor_versi}'
+    if param:
+        digest = hashlib.md5(
+            json.dumps(param, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        key += f':{digest}'
+    return key
+
+
+def kunci(nama, models, **param):
+    return _kunci(nama, versi(*models), param)
+
+
+def ambil(nama, models, hitung, timeout=CACHE_TIMEOUT, **param):
+    """
+    Ambil hasil `hitung()` dari cache, atau hitung lalu simpan.
+    Hasil harus bisa di-pickle (list / dict, bukan queryset lazy).
+    """
+    key = kunci(nama, models, **param)
+    hasil = cache.get(key)
+    if hasil is None:
+        hasil = hitung()
+        cache.set(key, hasil, timeout)
+    return hasil
+
+
+async def aambil(nama, models, hitung, timeout=CACHE_TIMEOUT, **param):
+    """Seperti ambil(), tetapi `hitung` adalah coroutine function."""
+    key = _kunci(nama, await aversi(*models), param)
+    hasil = await cache.aget(key)
+    if hasil is None:
+        hasil = await hitung()
+        await cache.aset(key, hasil, timeout)
+    return hasil
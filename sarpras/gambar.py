@@ -0,0 +1,154 @@
+# =========================================================
+# NORMALISASI GAMBAR UPLOAD (DI BACKGROUND)
+# =========================================================
+# Foto dari HP bisa berukuran beberapa MB, membawa EXIF (termasuk
+# lokasi GPS) dan orientasinya hanya tersimpan di tag EXIF. Setelah
+# form disimpan, gambar dimasukkan ke antrian worker (satu thread per
+# proses) sehingga request POST langsung selesai. Worker:
+#
+#   1. membetulkan orientasi dari EXIF lalu membuang EXIF,
+#   2. memperkecil ke GAMBAR_MAKS_DIMENSI,
+#   3. menyimpan ulang sebagai JPEG (GAMBAR_KUALITAS),
+#   4. mengarahkan baris ke file baru (nama = hash isi),
+#   5. memindahkan file asli ke asli/ jika GAMBAR_SIMPAN_ASLI, atau
+#      menghapusnya jika tidak dipakai baris lain.
+#
+# Proses ini idempoten: gambar yang sudah kecil, JPEG dan tanpa EXIF
+# dilewati. Antrian hanya hidup di memori, jadi gambar yang belum
+# sempat diproses saat server restart diselesaikan oleh command
+# `normalisasi_gambar`.
+#
+# Pillow baru di-import saat gambar benar-benar dibuka, bukan saat modul
+# dimuat, karena modul ini ikut ter-import lewat config/urls.py
+# (sarpras.media) di setiap worker.
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+
+from . import cache_versi
+from .storage import gambar_storage
+from .thumbnail import buat_thumbnail
+
+
+logger = logging.getLogger(__name__)
+
+FOLDER_ASLI = 'asli'
+
+# model yang field `gambar`-nya dinormalisasi
+MODEL_GAMBAR = ('sarpras.PeralatanMesin', 'sarpras.Buku')
+
+_antrian = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sarpras-gambar')
+
+
+def _opsi():
+    return (
+        getattr(settings, 'GAMBAR_MAKS_DIMENSI', 1600),
+        getattr(settings, 'GAMBAR_KUALITAS', 82),
+        getattr(settings, 'GAMBAR_SIMPAN_ASLI', False),
+    )
+
+
+def _perlu_normalisasi(img, maks):
+    return (
+        img.format != 'JPEG'
+        or max(img.size) > maks
+        or bool(img.getexif())
+    )
+
+
+def _normalisasi_bytes(img, maks, kualitas):
+    from PIL import Image, ImageOps
+
+    img = ImageOps.exif_transpose(img)
+
+    if img.mode in ('RGBA', 'LA', 'P'):
+        # transparansi diganti latar putih (JPEG tidak punya alpha)
+        img = img.convert('RGBA')
+        latar = Image.new('RGB', img.size, (255, 255, 255))
+        latar.paste(img, mask=img.getchannel('A'))
+        img = latar
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    img.thumbnail((maks, maks), Image.LANCZOS)
+
+    buffer = BytesIO()
+    img.save(buffer, format='JPEG', quality=kualitas, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def _masih_dipakai(name):
+    return any(
+        apps.get_model(label).objects.filter(gambar=name).exists()
+        for label in MODEL_GAMBAR
+    )
+
+
+def normalisasi(model_label, name):
+    """
+    Normalisasi satu file gambar dan arahkan semua baris `model_label`
+    yang memakainya ke file hasil. Mengembalikan nama file baru, atau
+    None jika tidak ada yang diubah.
+    """
+    from PIL import Image
+
+    maks, kualitas, simpan_asli = _opsi()
+
+    try:
+        with gambar_storage.open(name, 'rb') as f:
+            img = Image.open(f)
+            if not _perlu_normalisasi(img, maks):
+                return None
+            hasil = _normalisasi_bytes(img, maks, kualitas)
+    except FileNotFoundError:
+        return None
+    except (OSError, Image.DecompressionBombError, ValueError):
+        logger.warning('Gambar %s tidak bisa dinormalisasi', name, exc_info=True)
+        return None
+
+    folder = name.rsplit('/', 1)[0]
+    baru = gambar_storage.save(f'{folder}/gambar.jpg', ContentFile(hasil))
+    if baru == name:
+        return None
+
+    model = apps.get_model(model_label)
+    model.objects.filter(gambar=name).update(gambar=baru)
+    cache_versi.naikkan(model)
+
+    if simpan_asli:
+        asli = f'{FOLDER_ASLI}/{name}'
+        if not default_storage.exists(asli):
+            with gambar_storage.open(name, 'rb') as f:
+                default_storage.save(asli, f)
+
+    if not _masih_dipakai(name):
+        gambar_storage.delete(name)
+
+    buat_thumbnail(baru)
+    return baru
+
+
+def _kerjakan(model_label, name):
+    try:
+        normalisasi(model_label, name)
+    except Exception:
+        logger.exception('Normalisasi gambar %s gagal', name)
+    finally:
+        # thread worker punya koneksi database sendiri
+        connection.close()
+
+
+def jadwalkan(obj):
+    """Masukkan gambar `obj` ke antrian setelah transaksi commit."""
+    if not obj.gambar:
+        return
+
+    label = obj._meta.label
+    name = obj.gambar.name
+    transaction.on_commit(lambda: _antrian.submit(_kerjakan, label, name))
@@ -0,0 +1,143 @@
+# =========================================================
+# HIERARKI ASET: GEDUNG -> RUANGAN -> PERALATAN (JSON)
+# =========================================================
+# Pohon lengkap diambil dengan jumlah query tetap (gedung, ruangan,
+# peralatan per ruangan, peralatan tanpa ruangan) memakai Prefetch +
+# only(), lalu di-encode per gedung agar bisa di-stream.
+#
+# Hasil JSON di-cache dengan kunci yang memuat versi Gedung, Ruangan
+# dan PeralatanMesin (lihat cache_versi.py), jadi otomatis diganti
+# setiap kali salah satu tabel itu berubah.
+#
+# ahierarki_json() adalah versi async (ASGI): cek cache tanpa thread,
+# dan potongan JSON di-stream lewat async generator.
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from . import cache_versi
+from .models import Gedung, PeralatanMesin, Ruangan
+
+
+MODEL_HIERARKI = (Gedung, Ruangan, PeralatanMesin)
+CACHE_TIMEOUT = 60 * 60 * 24
+
+KOLOM_GEDUNG = ('id', 'kode_barang', 'nama', 'lokasi', 'item_count', 'total_unit')
+KOLOM_RUANGAN = ('id', 'kode', 'nama', 'penanggung_jawab', 'item_count', 'total_unit')
+KOLOM_PERALATAN = ('id', 'kode_barang', 'nama', 'jumlah', 'kondisi', 'tahun_perolehan')
+
+
+# =====================================================
+# AMBIL DATA
+# =====================================================
+def _ambil():
+    peralatan = PeralatanMesin.objects.only('ruangan', *KOLOM_PERALATAN).order_by('nama', 'id')
+
+    gedung = list(
+        Gedung.objects
+        .only(*KOLOM_GEDUNG)
+        .order_by('nama', 'id')
+        .prefetch_related(
+            Prefetch(
+                'ruangan',
+                queryset=Ruangan.objects.only('gedung', *KOLOM_RUANGAN).order_by('nama', 'id'),
+            ),
+            Prefetch('ruangan__peralatan', queryset=peralatan),
+        )
+    )
+    tanpa_ruangan = list(peralatan.filter(ruangan__isnull=True))
+
+    return gedung, tanpa_ruangan
+
+
+def _data(obj, kolom):
+    return {field: getattr(obj, field) for field in kolom}
+
+
+def _gedung_json(g):
+    data = _data(g, KOLOM_GEDUNG)
+    data['ruangan'] = [
+        {
+            **_data(r, KOLOM_RUANGAN),
+            'peralatan': [_data(p, KOLOM_PERALATAN) for p in r.peralatan.all()],
+        }
+        for r in g.ruangan.all()
+    ]
+    return json.dumps(data)
+
+
+def _potongan(gedung, tanpa_ruangan, nomor_versi):
+    """Potongan teks JSON, satu gedung per potongan."""
+    ruangan = sum(len(g.ruangan.all()) for g in gedung)
+    ringkasan = {
+        'gedung': len(gedung),
+        'ruangan': ruangan,
+        'item': sum(g.item_count for g in gedung) + len(tanpa_ruangan),
+        'unit': sum(g.total_unit for g in gedung) + sum(p.jumlah for p in tanpa_ruangan),
+    }
+
+    yield f'{{"versi": {json.dumps(nomor_versi)}, "jumlah": {json.dumps(ringkasan)}, "gedung": ['
+
+    for i, g in enumerate(gedung):
+        yield (', ' if i else '') + _gedung_json(g)
+
+    yield '], "tanpa_ruangan": '
+    yield json.dumps([_data(p, KOLOM_PERALATAN) for p in tanpa_ruangan])
+    yield '}'
+
+
+# =====================================================
+# ENTRY POINT UNTUK VIEW
+# =====================================================
+def _kunci(nomor_versi):
+    return f'{cache_versi.PREFIX}:hierarki_json:{nomor_versi}'
+
+
+def hierarki_json():
+    """
+    (versi, cached_bytes, iterator). Jika sudah ada di cache,
+    iterator None; jika belum, iterator menghasilkan potongan JSON
+    dan menyimpan hasil lengkapnya ke cache setelah selesai.
+    """
+    nomor_versi = cache_versi.versi(*MODEL_HIERARKI)
+    key = _kunci(nomor_versi)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return nomor_versi, cached, None
+
+    gedung, tanpa_ruangan = _ambil()
+
+    def stream():
+        potongan = []
+        for teks in _potongan(gedung, tanpa_ruangan, nomor_versi):
+            teks = teks.encode()
+            potongan.append(teks)
+            yield teks
+        cache.set(key, b''.join(potongan), CACHE_TIMEOUT)
+
+    return nomor_versi, None, stream()
+
+
+async def ahierarki_json():
+    """Seperti hierarki_json(), iterator-nya async generator."""
+    nomor_versi = await cache_versi.aversi(*MODEL_HIERARKI)
+    key = _kunci(nomor_versi)
+
+    cached = await cache.aget(key)
+    if cached is not None:
+        return nomor_versi, cached, None
+
+    gedung, tanpa_ruangan = await sync_to_async(_ambil)()
+
+    async def stream():
+        potongan = []
+        for teks in _potongan(gedung, tanpa_ruangan, nomor_versi):
+            teks = teks.encode()
+            potongan.append(teks)
+            yield teks
+        await cache.aset(key, b''.join(potongan), CACHE_TIMEOUT)
+
+    return nomor_versi, None, stream()
@@ -0,0 +1,114 @@
+# =========================================================
+# KARTU STOK BARANG HABIS PAKAI
+# =========================================================
+# Satu query UNION ALL atas tabel masuk & keluar, saldo berjalan
+# dihitung dengan window SUM di database. Index (barang, tanggal)
+# di kedua tabel membuat query ini tetap cepat walau riwayatnya
+# bertahun-tahun.
+from datetime import date
+
+from django.db import connection
+
+from .models import (
+    BarangHabisPakai,
+    BarangHabisPakaiMasuk,
+    BarangHabisPakaiKeluar,
+)
+
+
+# urutan transaksi di hari yang sama: masuk dulu, baru keluar
+URUT_MASUK = 0
+URUT_KELUAR = 1
+
+KOLOM = ('jenis', 'id', 'tanggal', 'urut', 'masuk', 'keluar', 'pihak', 'keterangan', 'saldo')
+
+
+def _sql(dengan_cursor, dengan_limit):
+    masuk = BarangHabisPakaiMasuk._meta.db_table
+    keluar = BarangHabisPakaiKeluar._meta.db_table
+    barang = BarangHabisPakai._meta.db_table
+
+    sql = f"""
+        SELECT jenis, id, tanggal, urut, masuk, keluar, pihak, keterangan, saldo
+        FROM (
+            SELECT
+                g.*,
+                (SELECT b.stok FROM {barang} b WHERE b.id = %s)
+                    - SUM(g.masuk - g.keluar) OVER ()
+                    + SUM(g.masuk - g.keluar) OVER (
+                        ORDER BY g.tanggal, g.urut, g.id
+                        ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+                    ) AS saldo
+            FROM (
+                SELECT 'masuk' AS jenis, id, tanggal, {URUT_MASUK} AS urut,
+                       jumlah AS masuk, 0 AS keluar,
+                       sumber AS pihak, keterangan
+                FROM {masuk}
+                WHERE barang_id = %s
+                UNION ALL
+                SELECT 'keluar' AS jenis, id, tanggal, {URUT_KELUAR} AS urut,
+                       0 AS masuk, jumlah AS keluar,
+                       pengguna AS pihak, keperluan AS keterangan
+                FROM {keluar}
+                WHERE barang_id = %s
+            ) g
+        ) kartu
+    """
+
+    if dengan_cursor:
+        sql += """
+        WHERE tanggal > %s
+           OR (tanggal = %s AND (urut > %s OR (urut = %s AND id > %s)))
+        """
+
+    sql += " ORDER BY tanggal, urut, id"
+
+    if dengan_limit:
+        sql += " LIMIT %s"
+
+    return sql
+
+
+def encode_cursor(baris):
+    return f"{baris['tanggal'].isoformat()}_{baris['urut']}_{baris['id']}"
+
+
+def decode_cursor(value):
+    """'2026-01-31_1_42' -> (date, urut, id). None jika tidak valid."""
+    try:
+        tanggal, urut, pk = value.split('_')
+        return date.fromisoformat(tanggal), int(urut), int(pk)
+    except (AttributeError, ValueError):
+        return None
+
+
+def kartu_stok(barang_id, setelah=None, limit=None):
+    """
+    Baris kartu stok secara kronologis, masing-masing dengan saldo berjalan.
+
+    Saldo diawali dari selisih stok sekarang dengan total mutasi, sehingga
+    stok awal yang diinput lewat tambah/import ikut terhitung dan saldo
+    baris terakhir selalu sama dengan `BarangHabisPakai.stok`.
+    """
+    params = [barang_id, barang_id, barang_id]
+
+    if setelah:
+        tanggal, urut, pk = setelah
+        params += [tanggal, tanggal, urut, urut, pk]
+
+    if limit:
+        params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(_sql(bool(setelah), bool(limit)), params)
+        rows = cursor.fetchall()
+
+    hasil = []
+    for row in rows:
+        baris = dict(zip(KOLOM, row))
+        # sqlite mengembalikan tanggal sebagai string
+        if isinstance(baris['tanggal'], str):
+            baris['tanggal'] = date.fromisoformat(baris['tanggal'])
+        hasil.append(baris)
+
+    return hasil
@@ -0,0 +1,179 @@
+# =========================================================
+# KETERSEDIAAN PERALATAN BERDASARKAN RESERVASI & PEMINJAMAN
+# =========================================================
+# Semua perhitungan dilakukan di database (subquery), bukan
+# looping per barang di Python. Query tumpang-tindih memakai
+# index (barang, tanggal_mulai, tanggal_selesai) di Reservasi.
+#
+# PeralatanMesin.jumlah adalah unit yang ada di tempat saat ini
+# (peminjaman_create menguranginya, peminjaman_kembali menambahnya).
+# Unit yang dimiliki = jumlah + unit yang sedang dipinjam. Peminjaman
+# aktif menempati unit dari tanggal_pinjam sampai tanggal_kembali
+# (rencana); yang terlambat dianggap kembali paling cepat hari ini,
+# dan yang tanpa tanggal kembali menempati unit tanpa batas.
+from datetime import date
+
+from django.db.models import (
+    DateField,
+    F,
+    IntegerField,
+    Max,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Peminjaman, PeralatanMesin, Reservasi
+
+
+def _tanggal(value):
+    return Value(value, output_field=DateField())
+
+
+def _subtotal(qs, field):
+    return Coalesce(
+        Subquery(
+            qs.order_by().values('barang').annotate(total=Sum(field)).values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def reservasi_bertumpang(mulai, selesai):
+    """Reservasi aktif yang rentangnya beririsan dengan [mulai, selesai]."""
+    return Reservasi.objects.filter(
+        status='aktif',
+        tanggal_mulai__lte=selesai,
+        tanggal_selesai__gte=mulai,
+    )
+
+
+def peminjaman_aktif():
+    """Peminjaman yang belum kembali, dengan anotasi `sampai` (akhir efektif)."""
+    return (
+        Peminjaman.objects
+        .filter(status='dipinjam')
+        .annotate(
+            sampai=Greatest(
+                Coalesce('tanggal_kembali', _tanggal(date.max)),
+                _tanggal(timezone.localdate()),
+                output_field=DateField(),
+            )
+        )
+    )
+
+
+def peminjaman_bertumpang(mulai, selesai):
+    """Peminjaman aktif yang rentangnya beririsan dengan [mulai, selesai]."""
+    return peminjaman_aktif().filter(
+        tanggal_pinjam__lte=selesai,
+        sampai__gte=mulai,
+    )
+
+
+def _beban_pada_titik(mulai, selesai):
+    """Total unit reservasi + peminjaman yang menutupi OuterRef('titik')."""
+    reservasi = reservasi_bertumpang(mulai, selesai).filter(
+        barang=OuterRef('barang'),
+        tanggal_mulai__lte=OuterRef('titik'),
+        tanggal_selesai__gte=OuterRef('titik'),
+    )
+    pinjam = peminjaman_bertumpang(mulai, selesai).filter(
+        barang=OuterRef('barang'),
+        tanggal_pinjam__lte=OuterRef('titik'),
+        sampai__gte=OuterRef('titik'),
+    )
+    return _subtotal(reservasi, 'jumlah') + _subtotal(pinjam, 'jumlah_pinjam')
+
+
+def _puncak(qs, field_mulai, mulai, selesai):
+    return (
+        qs
+        .annotate(
+            titik=Greatest(field_mulai, _tanggal(mulai), output_field=DateField())
+        )
+        .annotate(beban=_beban_pada_titik(mulai, selesai))
+        .order_by()
+        .values('barang')
+        .annotate(puncak=Max('beban'))
+    )
+
+
+def puncak_per_barang(mulai, selesai):
+    """
+    Puncak pemakaian bersamaan (reservasi + peminjaman) per barang dalam
+    rentang [mulai, selesai].
+
+    Beban hanya naik pada tanggal mulai sebuah reservasi / peminjaman,
+    jadi puncaknya selalu jatuh di salah satu titik GREATEST(mulai_x, mulai).
+    Untuk setiap titik dihitung total unit yang menutupinya, lalu diambil
+    MAX per barang. Hasil: dua queryset values('barang', 'puncak'), titik
+    dari reservasi dan titik dari peminjaman.
+    """
+    return (
+        _puncak(reservasi_bertumpang(mulai, selesai), 'tanggal_mulai', mulai, selesai),
+        _puncak(peminjaman_bertumpang(mulai, selesai), 'tanggal_pinjam', mulai, selesai),
+    )
+
+
+def _dimiliki():
+    return F('jumlah') + _subtotal(
+        peminjaman_aktif().filter(barang=OuterRef('pk')), 'jumlah_pinjam'
+    )
+
+
+def katalog_rentang(mulai, selesai):
+    """
+    Seluruh peralatan dengan anotasi `milik` (unit dimiliki), `dipesan`
+    (puncak reservasi + peminjaman dalam rentang) dan `tersedia`
+    (milik - dipesan), dalam satu query.
+    """
+    dari_reservasi, dari_pinjam = (
+        Coalesce(
+            Subquery(qs.filter(barang=OuterRef('pk')).values('puncak'), output_field=IntegerField()),
+            Value(0),
+        )
+        for qs in puncak_per_barang(mulai, selesai)
+    )
+
+    return (
+        PeralatanMesin.objects
+        .annotate(
+            milik=_dimiliki(),
+            dipesan=Greatest(dari_reservasi, dari_pinjam),
+        )
+        .annotate(tersedia=F('milik') - F('dipesan'))
+    )
+
+
+def katalog_pada_tanggal(tanggal):
+    """Peralatan yang masih bebas pada satu tanggal, untuk seluruh katalog."""
+    reservasi = reservasi_bertumpang(tanggal, tanggal).filter(barang=OuterRef('pk'))
+    pinjam = peminjaman_bertumpang(tanggal, tanggal).filter(barang=OuterRef('pk'))
+
+    return (
+        PeralatanMesin.objects
+        .annotate(
+            milik=_dimiliki(),
+            dipesan=_subtotal(reservasi, 'jumlah') + _subtotal(pinjam, 'jumlah_pinjam'),
+        )
+        .annotate(tersedia=F('milik') - F('dipesan'))
+    )
+
+
+def sisa_untuk_rentang(barang, mulai, selesai):
+    """
+    Jumlah unit `barang` yang masih bisa dipesan / dipinjam untuk
+    [mulai, selesai]. Panggil setelah baris barang dikunci dengan
+    select_for_update() agar dua transaksi bersamaan tidak lolos.
+    """
+    return (
+        katalog_rentang(mulai, selesai)
+        .filter(pk=barang.pk)
+        .values_list('tersedia', flat=True)
+        .get()
+    )
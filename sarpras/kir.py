@@ -0,0 +1,219 @@
+# =========================================================
+# KARTU INVENTARIS RUANGAN (KIR) - PDF
+# =========================================================
+# Data KIR diambil dengan query yang sudah menjumlah total di SQL,
+# lalu diubah menjadi dict biasa. Dari dict itu dibuat sidik
+# (sha1) yang dipakai sebagai kunci cache: selama isi ruangan tidak
+# berubah, PDF tidak dirender ulang.
+#
+# Mode batch merender banyak ruangan sekaligus di process pool.
+# Worker hanya menerima dict (tanpa akses database) dan mengembalikan
+# bytes PDF. Pool dibuat dengan start method 'spawn', bukan fork:
+# pool dibuat di dalam request worker gunicorn / uvicorn, dan fork akan
+# ikut menyalin koneksi database yang terbuka serta thread antrian
+# gambar (gambar.py) ke proses anak.
+#
+# xhtml2pdf (reportlab, html5lib, pyhanko) dan pypdf di-import di dalam
+# fungsi yang memakainya, supaya worker yang tidak pernah mencetak KIR
+# tidak ikut menanggung waktu import-nya. Model juga di-import di dalam
+# fungsi: proses 'spawn' meng-import modul ini untuk memanggil
+# _init_worker, sebelum django.setup() berjalan.
+import base64
+import hashlib
+import json
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.template.loader import get_template
+
+from .pengukuran import ukur
+
+
+CACHE_PREFIX = 'sarpras:kir_pdf'
+CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# batch kecil dirender langsung, tidak perlu membuat process pool
+BATCH_MIN_POOL = 4
+
+KOLOM_PERALATAN = ('kode_barang', 'nama', 'jumlah', 'kondisi', 'tahun_perolehan')
+
+
+def _logo_base64():
+    logo_path = os.path.join(
+        settings.BASE_DIR,
+        'sarpras',
+        'static',
+        'sarpras',
+        'logo_sekolah.png'
+    )
+
+    with open(logo_path, "rb") as image_file:
+        return base64.b64encode(image_file.read()).decode()
+
+
+# =====================================================
+# AMBIL DATA (SEMUA RUANGAN DALAM 2 QUERY)
+# =====================================================
+def data_kir(ruangan_qs):
+    """
+    dict ruangan_id -> data KIR (info ruangan, daftar peralatan,
+    total_item, total_unit) untuk semua ruangan di `ruangan_qs`.
+    """
+    from .models import PeralatanMesin
+
+    ruangan = list(
+        ruangan_qs
+        .select_related('gedung')
+        .order_by('gedung__nama', 'nama')
+    )
+    ids = [r.id for r in ruangan]
+
+    peralatan = {}
+    for row in (
+        PeralatanMesin.objects
+        .filter(ruangan__in=ids)
+        .order_by('nama', 'id')
+        .values('ruangan', *KOLOM_PERALATAN)
+    ):
+        peralatan.setdefault(row.pop('ruangan'), []).append(row)
+
+    hasil = {}
+    for r in ruangan:
+        # total diambil dari kolom denormalisasi (lihat total_ruangan.py)
+        hasil[r.id] = {
+            'ruangan': {
+                'id': r.id,
+                'nama': r.nama,
+                'kode': r.kode,
+                'penanggung_jawab': r.penanggung_jawab or '',
+                'gedung': r.gedung.nama,
+            },
+            'peralatan': peralatan.get(r.id, []),
+            'total_item': r.item_count,
+            'total_unit': r.total_unit,
+        }
+
+    return hasil
+
+
+def sidik(data):
+    return hashlib.sha1(
+        json.dumps(data, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _cache_key(data):
+    return f"{CACHE_PREFIX}:{data['ruangan']['id']}:{sidik(data)}"
+
+
+# =====================================================
+# RENDER (DIPANGGIL DI PROSES UTAMA ATAU WORKER)
+# =====================================================
+def _init_worker():
+    # proses 'spawn' mulai dari interpreter kosong: Django di-setup
+    # ulang, dan koneksi yang mungkin dibuka saat setup ditutup karena
+    # worker tidak memakai database
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+def render_kir(data, logo_base64):
+    from xhtml2pdf import pisa
+
+    html = get_template('sarpras/kir_pdf.html').render({
+        **data,
+        'logo_base64': logo_base64,
+    })
+
+    buffer = BytesIO()
+    with ukur('pdf'):
+        pisa.CreatePDF(html, dest=buffer)
+    return buffer.getvalue()
+
+
+def _render_batch(payloads):
+    """Render PDF yang belum ada di cache. payloads: list data KIR."""
+    if not payloads:
+        return []
+
+    logo = _logo_base64()
+
+    if len(payloads) < BATCH_MIN_POOL:
+        return [render_kir(data, logo) for data in payloads]
+
+    workers = getattr(settings, 'KIR_BATCH_WORKERS', None) or os.cpu_count()
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(payloads)),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+    ) as pool:
+        return list(pool.map(render_kir, payloads, [logo] * len(payloads)))
+
+
+def kir_pdf_batch(ruangan_qs):
+    """list (data, pdf_bytes) untuk semua ruangan, memakai cache."""
+    semua = list(data_kir(ruangan_qs).values())
+
+    keys = {id(data): _cache_key(data) for data in semua}
+    cached = cache.get_many(keys.values())
+
+    belum = [data for data in semua if keys[id(data)] not in cached]
+    with ukur('pdf'):
+        baru = dict(zip((keys[id(d)] for d in belum), _render_batch(belum)))
+
+    if baru:
+        cache.set_many(baru, CACHE_TIMEOUT)
+
+    cached.update(baru)
+    return [(data, cached[keys[id(data)]]) for data in semua]
+
+
+def kir_pdf(ruangan_id):
+    from .models import Ruangan
+
+    hasil = kir_pdf_batch(Ruangan.objects.filter(id=ruangan_id))
+    return hasil[0] if hasil else (None, None)
+
+
+# =====================================================
+# GABUNG HASIL BATCH
+# =====================================================
+def nama_file(data):
+    ruangan = data['ruangan']
+    kode = ruangan['kode'] or ruangan['id']
+    return f"KIR_{kode}_{ruangan['nama']}.pdf".replace('/', '-').replace(' ', '_')
+
+
+def gabung_zip(hasil):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        dipakai = set()
+        for data, pdf in hasil:
+            nama = nama_file(data)
+            if nama in dipakai:
+                nama = f"{data['ruangan']['id']}_{nama}"
+            dipakai.add(nama)
+            zf.writestr(nama, pdf)
+    return buffer.getvalue()
+
+
+def gabung_pdf(hasil):
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for _, pdf in hasil:
+        writer.append(BytesIO(pdf))
+
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,128 @@
+import os
+import shutil
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from sarpras.gambar import MODEL_GAMBAR
+from sarpras.thumbnail import FOLDER as FOLDER_THUMB
+
+
+def _scan(root):
+    """Semua file di bawah `root` (rekursif, os.scandir): (path, DirEntry)."""
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except FileNotFoundError:
+            continue
+
+
+class Command(BaseCommand):
+    help = (
+        'Hapus (atau karantina) file gambar & thumbnail di MEDIA_ROOT yang '
+        'tidak dipakai baris mana pun'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Hanya tampilkan file yang akan dibersihkan',
+        )
+        parser.add_argument(
+            '--karantina',
+            metavar='DIR',
+            help='Pindahkan ke DIR (di luar MEDIA_ROOT) alih-alih menghapus',
+        )
+        parser.add_argument(
+            '--umur-menit',
+            type=int,
+            default=60,
+            help='Lewati file yang lebih baru dari ini (upload yang belum commit)',
+        )
+
+    def handle(self, *args, **options):
+        media_root = os.fspath(settings.MEDIA_ROOT)
+        dry_run = options['dry_run']
+        karantina = options['karantina']
+        batas = time.time() - options['umur_menit'] * 60
+
+        # ===================== SET PATH YANG DIPAKAI =====================
+        dipakai = set()
+        folders = set()
+        for label in MODEL_GAMBAR:
+            model = apps.get_model(label)
+            folders.add(model._meta.get_field('gambar').upload_to.strip('/'))
+            dipakai.update(
+                model.objects
+                .exclude(gambar='')
+                .exclude(gambar__isnull=True)
+                .values_list('gambar', flat=True)
+                .iterator(chunk_size=10000)
+            )
+
+        # thumbs/peralatan/<hash>_80.webp dipakai jika peralatan/<hash>.* dipakai
+        stem_dipakai = {os.path.splitext(name)[0] for name in dipakai}
+
+        def yatim(rel):
+            if rel.startswith(FOLDER_THUMB + '/'):
+                stem = rel[len(FOLDER_THUMB) + 1:].rsplit('_', 1)[0]
+                return stem not in stem_dipakai
+            return rel not in dipakai
+
+        # ===================== SCAN & BERSIHKAN =====================
+        diperiksa = 0
+        jumlah = 0
+        byte = 0
+
+        roots = [os.path.join(media_root, f) for f in sorted(folders)]
+        roots += [os.path.join(media_root, FOLDER_THUMB, f) for f in sorted(folders)]
+
+        for root in roots:
+            for entry in _scan(root):
+                diperiksa += 1
+                rel = os.path.relpath(entry.path, media_root).replace(os.sep, '/')
+
+                if not yatim(rel):
+                    continue
+
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime > batas:
+                    continue
+
+                jumlah += 1
+                byte += stat.st_size
+
+                if options['verbosity'] >= 2:
+                    self.stdout.write(f'  {rel}')
+
+                if dry_run:
+                    continue
+
+                if karantina:
+                    tujuan = os.path.join(karantina, rel)
+                    os.makedirs(os.path.dirname(tujuan), exist_ok=True)
+                    shutil.move(entry.path, tujuan)
+                else:
+                    os.remove(entry.path)
+
+        if dry_run:
+            aksi = 'akan dibersihkan'
+        elif karantina:
+            aksi = f'dipindah ke {karantina}'
+        else:
+            aksi = 'dihapus'
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{diperiksa} file diperiksa ({len(dipakai)} dipakai), '
+            f'{jumlah} file yatim {aksi} ({byte / 1024 / 1024:.1f} MB)'
+        ))
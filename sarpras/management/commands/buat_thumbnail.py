@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from sarpras.models import Buku, PeralatanMesin
+from sarpras.thumbnail import buat_thumbnail
+
+
+class Command(BaseCommand):
+    help = 'Buat thumbnail (WebP & JPEG) untuk semua gambar peralatan dan buku'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--timpa',
+            action='store_true',
+            help='Buat ulang thumbnail yang sudah ada',
+        )
+
+    def handle(self, *args, **options):
+        # nama gambar = hash isi, jadi satu file cukup diproses sekali
+        names = set()
+        for model in (PeralatanMesin, Buku):
+            names.update(
+                model.objects
+                .exclude(gambar='')
+                .exclude(gambar__isnull=True)
+                .values_list('gambar', flat=True)
+            )
+
+        dibuat = 0
+        for name in sorted(names):
+            dibuat += buat_thumbnail(name, timpa=options['timpa'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(names)} gambar diproses, {dibuat} thumbnail dibuat'
+        ))
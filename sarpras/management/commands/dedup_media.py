@@ -0,0 +1,103 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from sarpras import cache_versi
+from sarpras.models import Buku, PeralatanMesin
+from sarpras.storage import gambar_storage, hash_isi, nama_hash
+
+
+# (model, field) yang memakai ContentHashStorage
+FIELD_GAMBAR = (
+    (PeralatanMesin, 'gambar'),
+    (Buku, 'gambar'),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Satukan file gambar yang isinya identik menjadi satu file bernama '
+        'hash isi, arahkan ulang semua baris, lalu hapus salinannya'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Hanya tampilkan apa yang akan dilakukan',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        total_file = 0
+        total_byte = 0
+
+        for model, field in FIELD_GAMBAR:
+            hapus, byte = self.dedup(model, field, dry_run)
+            total_file += hapus
+            total_byte += byte
+
+        label = 'akan dihapus' if dry_run else 'dihapus'
+        self.stdout.write(self.style.SUCCESS(
+            f'{total_file} file {label}, hemat {total_byte / 1024 / 1024:.1f} MB'
+        ))
+
+    def dedup(self, model, field, dry_run):
+        storage = gambar_storage
+        folder = model._meta.get_field(field).upload_to.rstrip('/')
+
+        if not storage.exists(folder):
+            return 0, 0
+
+        # ===================== KELOMPOKKAN FILE PER HASH =====================
+        grup = {}
+        _, files = storage.listdir(folder)
+        for nama in files:
+            name = f'{folder}/{nama}'
+            with storage.open(name, 'rb') as f:
+                grup.setdefault(nama_hash(name, hash_isi(f)), []).append(name)
+
+        # nama lama -> nama hash
+        tujuan = {
+            name: target
+            for target, names in grup.items()
+            for name in names
+            if name != target
+        }
+
+        # ===================== BARIS YANG PERLU DIARAHKAN ULANG =====================
+        pindah = {}
+        for pk, name in model.objects.filter(**{f'{field}__in': tujuan}).values_list('id', field):
+            pindah.setdefault(tujuan[name], []).append(pk)
+
+        hapus = len(files) - len(grup)
+        byte = sum(
+            (len(names) - 1) * storage.size(names[0])
+            for names in grup.values()
+        )
+
+        self.stdout.write(
+            f'{folder}/: {len(files)} file, {len(grup)} isi unik, '
+            f'{sum(len(pks) for pks in pindah.values())} baris diarahkan ulang'
+        )
+
+        if dry_run:
+            return hapus, byte
+
+        # 1. pastikan file bernama hash ada (disalin dari salah satu anggota)
+        for target, names in grup.items():
+            if target not in names:
+                with storage.open(names[0], 'rb') as f:
+                    storage.save(target, f)
+
+        # 2. arahkan baris ke file hash
+        with transaction.atomic():
+            for target, pks in pindah.items():
+                model.objects.filter(id__in=pks).update(**{field: target})
+            cache_versi.naikkan(model)
+
+        # 3. baru hapus salinan lama
+        for name in tujuan:
+            storage.delete(name)
+
+        return hapus, byte
@@ -0,0 +1,32 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from sarpras.gambar import MODEL_GAMBAR, normalisasi
+
+
+class Command(BaseCommand):
+    help = (
+        'Normalisasi semua gambar peralatan dan buku (buang EXIF, betulkan '
+        'orientasi, perkecil, kompres ulang) yang belum diproses'
+    )
+
+    def handle(self, *args, **options):
+        diproses = 0
+        diubah = 0
+
+        for label in MODEL_GAMBAR:
+            names = set(
+                apps.get_model(label).objects
+                .exclude(gambar='')
+                .exclude(gambar__isnull=True)
+                .values_list('gambar', flat=True)
+            )
+
+            for name in sorted(names):
+                diproses += 1
+                if normalisasi(label, name):
+                    diubah += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{diproses} gambar diperiksa, {diubah} dinormalisasi'
+        ))
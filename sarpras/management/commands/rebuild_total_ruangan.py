@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+
+from sarpras.models import Ruangan
+from sarpras.total_ruangan import rebuild_total_ruangan
+
+
+class Command(BaseCommand):
+    help = 'Hitung ulang total item & unit peralatan per ruangan dan per gedung'
+
+    def handle(self, *args, **options):
+        gedung = rebuild_total_ruangan()
+        total = Ruangan.objects.aggregate(
+            item=Sum('item_count'),
+            unit=Sum('total_unit'),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Total diperbarui: {Ruangan.objects.count()} ruangan, {gedung} gedung "
+            f"({total['item'] or 0} item, {total['unit'] or 0} unit)"
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from sarpras.saldo_bulanan import rebuild_saldo_bulanan
+
+
+class Command(BaseCommand):
+    help = 'Bangun ulang snapshot saldo bulanan barang habis pakai dari ledger masuk/keluar'
+
+    def handle(self, *args, **options):
+        total = rebuild_saldo_bulanan()
+        self.stdout.write(self.style.SUCCESS(
+            f'Snapshot saldo bulanan dibuat: {total} baris'
+        ))
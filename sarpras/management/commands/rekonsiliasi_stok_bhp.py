@@ -0,0 +1,115 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from sarpras import cache_versi, prakiraan
+from sarpras.models import (
+    BarangHabisPakai,
+    BarangHabisPakaiMasuk,
+    BarangHabisPakaiKeluar,
+)
+from sarpras.saldo_bulanan import rebuild_saldo_bulanan
+
+
+SUMBER_PENYESUAIAN = 'Penyesuaian rekonsiliasi'
+
+
+def _total(model):
+    return Coalesce(
+        Subquery(
+            model.objects
+            .filter(barang=OuterRef('pk'))
+            .order_by()
+            .values('barang')
+            .annotate(total=Sum('jumlah'))
+            .values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def total_ledger():
+    """Ekspresi total masuk - keluar di ledger (bisa negatif)."""
+    return _total(BarangHabisPakaiMasuk) - _total(BarangHabisPakaiKeluar)
+
+
+class Command(BaseCommand):
+    help = (
+        'Bandingkan stok BHP dengan total masuk - keluar di ledger '
+        'dan (opsional) catat selisihnya sebagai transaksi penyesuaian'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help=(
+                'Catat selisih sebagai barang masuk / keluar penyesuaian; '
+                'stok tidak diubah'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        # satu query grouped untuk semua barang, hanya yang selisih
+        selisih = (
+            BarangHabisPakai.objects
+            .annotate(ledger=total_ledger())
+            .exclude(stok=F('ledger'))
+            .order_by('kode_barang')
+        )
+
+        rows = list(selisih.values_list('id', 'kode_barang', 'nama_barang', 'stok', 'ledger'))
+
+        if not rows:
+            self.stdout.write(self.style.SUCCESS('Semua stok sesuai dengan ledger'))
+            return
+
+        self.stdout.write(f"{'KODE':<15} {'NAMA BARANG':<35} {'STOK':>8} {'LEDGER':>8} {'SELISIH':>8}")
+        for _, kode, nama, stok, ledger in rows:
+            self.stdout.write(
+                f"{kode:<15} {nama[:35]:<35} {stok:>8} {ledger:>8} {stok - ledger:>8}"
+            )
+
+        self.stdout.write(self.style.WARNING(f'{len(rows)} barang tidak sesuai'))
+
+        if not options['fix']:
+            return
+
+        # stok adalah sumber kebenaran (kartu stok & saldo bulanan dihitung
+        # mundur dari stok); yang dilengkapi adalah ledger-nya, misalnya
+        # stok awal barang lama yang tidak punya baris barang masuk
+        tanggal = timezone.localdate()
+        masuk = []
+        keluar = []
+        for barang_id, _, _, stok, ledger in rows:
+            if stok > ledger:
+                masuk.append(BarangHabisPakaiMasuk(
+                    barang_id=barang_id,
+                    jumlah=stok - ledger,
+                    tanggal=tanggal,
+                    sumber=SUMBER_PENYESUAIAN,
+                ))
+            else:
+                keluar.append(BarangHabisPakaiKeluar(
+                    barang_id=barang_id,
+                    jumlah=ledger - stok,
+                    tanggal=tanggal,
+                    pengguna='Rekonsiliasi',
+                    keperluan='Penyesuaian stok',
+                ))
+
+        with transaction.atomic():
+            BarangHabisPakaiMasuk.objects.bulk_create(masuk)
+            BarangHabisPakaiKeluar.objects.bulk_create(keluar)
+            cache_versi.naikkan(BarangHabisPakaiMasuk, BarangHabisPakaiKeluar)
+            if keluar:
+                prakiraan.hapus_cache()
+
+            # ledger berubah tanpa perubahan stok: saldo awal bulan
+            # pertama ikut bergeser, jadi snapshot dibangun ulang
+            rebuild_saldo_bulanan()
+
+        self.stdout.write(self.style.SUCCESS(f'{len(rows)} barang disesuaikan'))
@@ -0,0 +1,327 @@
+"""
+Isi database dengan data sintetis untuk uji beban (lihat
+scripts/load_test.py).
+
+Semua baris dibuat dengan bulk_create per batch di dalam satu transaksi,
+lalu kolom turunan dibangun ulang sekali di akhir (total per ruangan /
+gedung, saldo bulanan BHP, versi cache), karena bulk_create tidak
+memanggil save() maupun signal.
+
+Kode barang data sintetis selalu berawalan "SEED-", sehingga bisa
+dihapus lagi dengan --hapus tanpa menyentuh data asli.
+
+Contoh:
+
+    python manage.py seed_sarpras                 # satu sekolah
+    python manage.py seed_sarpras --skala 25      # satu kabupaten
+    python manage.py seed_sarpras --hapus --skala 5 --seed 7
+"""
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from sarpras import cache_versi
+from sarpras.models import (
+    BarangHabisPakai,
+    BarangHabisPakaiKeluar,
+    BarangHabisPakaiMasuk,
+    Buku,
+    Gedung,
+    Peminjaman,
+    PeralatanMesin,
+    Ruangan,
+)
+from sarpras.saldo_bulanan import rebuild_saldo_bulanan
+from sarpras.signals import MODEL_TERVERSI
+from sarpras.total_ruangan import rebuild_total_ruangan
+
+
+AWALAN = 'SEED-'
+
+# jumlah per skala 1 (kira-kira satu SMA / SMK)
+DASAR = {
+    'gedung': 4,
+    'ruangan_per_gedung': 8,
+    'peralatan_per_ruangan': 15,
+    'buku': 1500,
+    'bhp': 120,
+    'peminjaman': 400,
+}
+
+NAMA_GEDUNG = ['Gedung Utama', 'Gedung Praktik', 'Gedung Perpustakaan', 'Gedung Serbaguna', 'Gedung Laboratorium']
+NAMA_RUANGAN = [
+    'Kelas X', 'Kelas XI', 'Kelas XII', 'Lab Komputer', 'Lab IPA', 'Lab Bahasa',
+    'Ruang Guru', 'Ruang TU', 'Ruang Kepala Sekolah', 'Perpustakaan', 'Ruang UKS',
+    'Ruang OSIS', 'Bengkel', 'Gudang', 'Aula', 'Ruang BK',
+]
+NAMA_PERALATAN = [
+    'Meja Siswa', 'Kursi Siswa', 'Meja Guru', 'Kursi Guru', 'Lemari Arsip',
+    'Papan Tulis', 'Proyektor', 'Layar Proyektor', 'Komputer PC', 'Laptop',
+    'Printer', 'AC Split', 'Kipas Angin', 'Rak Buku', 'Filing Cabinet',
+    'Mikroskop', 'Speaker Aktif', 'Televisi', 'Dispenser', 'Jam Dinding',
+]
+KONDISI = ['Baik'] * 16 + ['Rusak Ringan'] * 3 + ['Rusak Berat']
+
+KATA_JUDUL = [
+    'Matematika', 'Fisika', 'Kimia', 'Biologi', 'Sejarah', 'Geografi',
+    'Ekonomi', 'Sosiologi', 'Bahasa Indonesia', 'Bahasa Inggris', 'Informatika',
+    'Seni Budaya', 'Pendidikan Pancasila', 'Prakarya', 'Akuntansi', 'Kewirausahaan',
+]
+JENIS_BUKU = ['Buku Siswa', 'Buku Guru', 'Modul', 'Latihan Soal', 'Ensiklopedia']
+NAMA_DEPAN = ['Budi', 'Siti', 'Agus', 'Dewi', 'Rina', 'Hendra', 'Sri', 'Eko', 'Wahyu', 'Nur', 'Andi', 'Lestari']
+NAMA_BELAKANG = ['Santoso', 'Rahayu', 'Wijaya', 'Hidayat', 'Kurniawan', 'Susanti', 'Pratama', 'Setiawan', 'Lubis', 'Nasution']
+
+BHP = [
+    ('Kertas HVS A4', 'Rim'), ('Kertas HVS F4', 'Rim'), ('Spidol Whiteboard', 'Pcs'),
+    ('Tinta Printer Hitam', 'Botol'), ('Tinta Printer Warna', 'Botol'), ('Pulpen', 'Box'),
+    ('Map Plastik', 'Pcs'), ('Amplop Coklat', 'Pak'), ('Lakban', 'Roll'),
+    ('Sabun Cuci Tangan', 'Botol'), ('Tisu', 'Pak'), ('Kapur Tulis', 'Box'),
+    ('Baterai AA', 'Pak'), ('Stapler Isi', 'Box'), ('Cairan Pel', 'Jerigen'),
+]
+SUMBER = ['BOS', 'BOS', 'BOS', 'Komite', 'Hibah']
+KEPERLUAN = ['KBM', 'Ujian', 'Administrasi', 'Kebersihan', 'Kegiatan OSIS']
+
+
+def _nama_orang(rng):
+    return f'{rng.choice(NAMA_DEPAN)} {rng.choice(NAMA_BELAKANG)}'
+
+
+class Command(BaseCommand):
+    help = 'Buat data sintetis (gedung, ruangan, peralatan, buku, BHP, peminjaman) untuk uji beban'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skala',
+            type=float,
+            default=1,
+            help='Pengali jumlah data; 1 kira-kira satu sekolah (default 1)',
+        )
+        parser.add_argument(
+            '--bulan',
+            type=int,
+            default=12,
+            help='Panjang riwayat transaksi BHP & peminjaman dalam bulan (default 12)',
+        )
+        parser.add_argument(
+            '--transaksi-per-bulan',
+            type=int,
+            default=6,
+            help='Rata-rata transaksi keluar per barang BHP per bulan (default 6)',
+        )
+        parser.add_argument('--seed', type=int, default=2024, help='Seed random (hasil bisa diulang)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--hapus',
+            action='store_true',
+            help='Hapus dulu data sintetis sebelumnya (kode berawalan SEED-)',
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        self.batch = options['batch_size']
+        skala = options['skala']
+        jumlah = {nama: max(1, round(nilai * skala)) for nama, nilai in DASAR.items()}
+        # ukuran ruangan tidak ikut membesar: sekolah lebih banyak, bukan kelas lebih besar
+        jumlah['ruangan_per_gedung'] = DASAR['ruangan_per_gedung']
+        jumlah['peralatan_per_ruangan'] = DASAR['peralatan_per_ruangan']
+
+        mulai = time.perf_counter()
+
+        with transaction.atomic():
+            if options['hapus']:
+                self.hapus()
+            elif PeralatanMesin.objects.filter(kode_barang__startswith=AWALAN).exists():
+                raise CommandError('Data sintetis sudah ada; jalankan dengan --hapus untuk membuat ulang')
+
+            hari_ini = timezone.localdate()
+            awal = hari_ini - timedelta(days=30 * options['bulan'])
+
+            peralatan = self.buat_aset(rng, jumlah)
+            self.buat_peminjaman(rng, peralatan, jumlah['peminjaman'], awal, hari_ini)
+            self.buat_buku(rng, jumlah['buku'])
+            self.buat_bhp(rng, jumlah['bhp'], options['transaksi_per_bulan'], awal, hari_ini)
+
+            self.stdout.write('Membangun ulang total ruangan & saldo bulanan ...')
+            rebuild_total_ruangan()
+            rebuild_saldo_bulanan()
+            cache_versi.naikkan(*MODEL_TERVERSI)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Selesai dalam {time.perf_counter() - mulai:.1f} detik'
+        ))
+
+    def _simpan(self, model, objek):
+        dibuat = model.objects.bulk_create(objek, batch_size=self.batch)
+        self.stdout.write(f'  {model.__name__:<24} {len(dibuat):>8} baris')
+        return dibuat
+
+    def hapus(self):
+        # Peminjaman, Ruangan, ledger & saldo BHP ikut terhapus (CASCADE);
+        # signal post_delete per baris cukup mengganti versi cache sekali
+        with cache_versi.ditunda():
+            for model in (PeralatanMesin, Gedung, Buku, BarangHabisPakai):
+                total, _ = model.objects.filter(kode_barang__startswith=AWALAN).delete()
+                self.stdout.write(f'  hapus {model.__name__:<18} {total:>8} baris (termasuk relasi)')
+
+    # =====================================================
+    # GEDUNG, RUANGAN, PERALATAN
+    # =====================================================
+    def buat_aset(self, rng, jumlah):
+        gedung = self._simpan(Gedung, [
+            Gedung(
+                kode_barang=f'{AWALAN}GD-{i:04d}',
+                nama=f'{rng.choice(NAMA_GEDUNG)} {i}',
+                lokasi=f'Kampus {i // 4 + 1}',
+                luas=rng.randrange(200, 2000, 10),
+                kondisi=rng.choice(KONDISI),
+                tahun_perolehan=rng.randint(1985, 2023),
+            )
+            for i in range(1, jumlah['gedung'] + 1)
+        ])
+
+        ruangan = self._simpan(Ruangan, [
+            Ruangan(
+                gedung=g,
+                nama=f'{rng.choice(NAMA_RUANGAN)} {n}',
+                kode=f'{AWALAN}R-{g.pk}-{n:02d}',
+                penanggung_jawab=_nama_orang(rng),
+            )
+            for g in gedung
+            for n in range(1, jumlah['ruangan_per_gedung'] + 1)
+        ])
+
+        nomor = 0
+        peralatan = []
+        for r in ruangan:
+            for _ in range(rng.randint(jumlah['peralatan_per_ruangan'] // 2, jumlah['peralatan_per_ruangan'] * 3 // 2)):
+                nomor += 1
+                nama = rng.choice(NAMA_PERALATAN)
+                peralatan.append(PeralatanMesin(
+                    kode_barang=f'{AWALAN}PM-{nomor:07d}',
+                    nama=nama,
+                    jumlah=rng.randint(1, 40) if nama.startswith(('Meja', 'Kursi')) else rng.randint(1, 5),
+                    kondisi=rng.choice(KONDISI),
+                    tahun_perolehan=rng.randint(2005, 2024),
+                    ruangan=r,
+                ))
+        return self._simpan(PeralatanMesin, peralatan)
+
+    # =====================================================
+    # PEMINJAMAN (YANG MASIH DIPINJAM MENGURANGI JUMLAH)
+    # =====================================================
+    def buat_peminjaman(self, rng, peralatan, total, awal, hari_ini):
+        hari = (hari_ini - awal).days
+        bisa_dipinjam = [p for p in peralatan if p.jumlah >= 2]
+        if not bisa_dipinjam:
+            return
+
+        dipinjam = {}
+        pinjam = []
+        tanggal_pinjam = []
+        for _ in range(total):
+            barang = rng.choice(bisa_dipinjam)
+            tanggal = awal + timedelta(days=rng.randint(0, hari))
+            jumlah = rng.randint(1, max(1, min(3, barang.jumlah // 2)))
+
+            # sebagian pinjaman dua minggu terakhir belum kembali, selama
+            # jumlah yang dipinjam tidak menghabiskan barangnya
+            masih = (
+                (hari_ini - tanggal).days < 14
+                and rng.random() < 0.6
+                and barang.jumlah - dipinjam.get(barang.pk, 0) > jumlah
+            )
+            if masih:
+                dipinjam[barang.pk] = dipinjam.get(barang.pk, 0) + jumlah
+
+            tanggal_pinjam.append(tanggal)
+            pinjam.append(Peminjaman(
+                barang=barang,
+                peminjam=_nama_orang(rng),
+                jumlah_pinjam=jumlah,
+                tanggal_kembali=None if masih else min(hari_ini, tanggal + timedelta(days=rng.randint(1, 7))),
+                status='dipinjam' if masih else 'kembali',
+            ))
+
+        pinjam = self._simpan(Peminjaman, pinjam)
+
+        # tanggal_pinjam auto_now_add: bulk_create selalu mengisi hari ini
+        for p, tanggal in zip(pinjam, tanggal_pinjam):
+            p.tanggal_pinjam = tanggal
+        Peminjaman.objects.bulk_update(pinjam, ['tanggal_pinjam'], batch_size=self.batch)
+
+        # barang yang sedang dipinjam sudah keluar dari jumlah peralatan
+        berubah = [p for p in peralatan if p.pk in dipinjam]
+        for p in berubah:
+            p.jumlah -= dipinjam[p.pk]
+        PeralatanMesin.objects.bulk_update(berubah, ['jumlah'], batch_size=self.batch)
+
+    # =====================================================
+    # BUKU
+    # =====================================================
+    def buat_buku(self, rng, total):
+        self._simpan(Buku, [
+            Buku(
+                kode_barang=f'{AWALAN}BK-{i:07d}',
+                judul=f'{rng.choice(KATA_JUDUL)} {rng.choice(JENIS_BUKU)} Kelas {rng.choice(["X", "XI", "XII"])}',
+                pengarang=_nama_orang(rng),
+                jumlah=rng.randint(1, 60),
+                kondisi=rng.choice(KONDISI),
+                tahun_terbit=rng.randint(2000, 2024),
+            )
+            for i in range(1, total + 1)
+        ])
+
+    # =====================================================
+    # BHP + LEDGER MASUK / KELUAR (STOK = MASUK - KELUAR)
+    # =====================================================
+    def buat_bhp(self, rng, total, per_bulan, awal, hari_ini):
+        barang = []
+        for i in range(1, total + 1):
+            nama, satuan = rng.choice(BHP)
+            barang.append(BarangHabisPakai(
+                kode_barang=f'{AWALAN}BHP-{i:05d}',
+                nama_barang=f'{nama} #{i}',
+                satuan=satuan,
+                stok_minimum=rng.choice([0, 5, 10, 20]),
+            ))
+        barang = self._simpan(BarangHabisPakai, barang)
+
+        hari = (hari_ini - awal).days
+        bulan = max(1, hari // 30)
+        masuk = []
+        keluar = []
+        for b in barang:
+            # kejadian urut tanggal: restock tiap bulan, pemakaian di antaranya
+            kejadian = [(awal + timedelta(days=30 * n), 'masuk') for n in range(bulan)]
+            kejadian += [
+                (awal + timedelta(days=rng.randint(0, hari)), 'keluar')
+                for _ in range(rng.randint(per_bulan * bulan // 2, per_bulan * bulan * 3 // 2))
+            ]
+            kejadian.sort()
+
+            stok = 0
+            for tanggal, jenis in kejadian:
+                if jenis == 'masuk':
+                    n = rng.randint(10, 60)
+                    stok += n
+                    masuk.append(BarangHabisPakaiMasuk(
+                        barang=b, jumlah=n, tanggal=tanggal, sumber=rng.choice(SUMBER),
+                    ))
+                elif stok:
+                    n = min(stok, rng.randint(1, 8))
+                    stok -= n
+                    keluar.append(BarangHabisPakaiKeluar(
+                        barang=b, jumlah=n, tanggal=tanggal,
+                        pengguna=_nama_orang(rng), keperluan=rng.choice(KEPERLUAN),
+                    ))
+
+            b.stok = stok
+            b.perlu_restock = stok <= b.stok_minimum
+
+        BarangHabisPakai.objects.bulk_update(barang, ['stok', 'perlu_restock'], batch_size=self.batch)
+        self._simpan(BarangHabisPakaiMasuk, masuk)
+        self._simpan(BarangHabisPakaiKeluar, keluar)
@@ -0,0 +1,143 @@
+# =========================================================
+# MELAYANI FILE MEDIA DI PRODUKSI
+# =========================================================
+# django.conf.urls.static hanya aktif saat DEBUG. View ini dipakai di
+# produksi (kecuali SERVE_MEDIA=False karena media dilayani nginx):
+#
+# - file bernama hash isi (gambar & thumbnail) tidak pernah berubah,
+#   jadi dikirim dengan Cache-Control immutable selama setahun dan
+#   hash-nya dipakai langsung sebagai ETag;
+# - file lain (misalnya logo) memakai ETag ukuran+mtime dan cache pendek;
+# - If-None-Match -> 304 tanpa membuka file;
+# - respons penuh memakai FileResponse (wsgi.file_wrapper / sendfile);
+# - satu rentang Range: bytes=... dijawab 206 Partial Content.
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+from .gambar import FOLDER_ASLI
+
+
+NAMA_HASH = re.compile(r'^(?P<hash>[0-9a-f]{64})(?:_\d+)?$')
+RANGE = re.compile(r'^bytes=(?P<awal>\d*)-(?P<akhir>\d*)$')
+
+CACHE_IMMUTABLE = 'public, max-age=31536000, immutable'
+CACHE_BIASA = 'public, max-age=3600'
+
+UKURAN_CHUNK = 64 * 1024
+
+
+def _etag(path, stat):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    cocok = NAMA_HASH.match(stem)
+    if cocok:
+        return f'"{stem}"', CACHE_IMMUTABLE
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"', CACHE_BIASA
+
+
+def _cocok_etag(header, etag):
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return etag in [tag.strip().removeprefix('W/') for tag in header.split(',')]
+
+
+def _rentang(header, ukuran):
+    """(awal, akhir) inklusif, None jika tidak ada / tidak didukung, 'invalid' jika di luar file."""
+    cocok = RANGE.match(header.strip()) if header else None
+    if not cocok or ukuran == 0:
+        return None
+
+    awal, akhir = cocok['awal'], cocok['akhir']
+    if not awal and not akhir:
+        return None
+
+    if not awal:
+        # bytes=-500 -> 500 byte terakhir
+        awal, akhir = max(ukuran - int(akhir), 0), ukuran - 1
+    else:
+        awal = int(awal)
+        akhir = min(int(akhir), ukuran - 1) if akhir else ukuran - 1
+
+    if awal >= ukuran or awal > akhir:
+        return 'invalid'
+    return awal, akhir
+
+
+def _baca_rentang(f, awal, akhir):
+    try:
+        f.seek(awal)
+        sisa = akhir - awal + 1
+        while sisa > 0:
+            chunk = f.read(min(UKURAN_CHUNK, sisa))
+            if not chunk:
+                break
+            sisa -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+@require_safe
+def serve_media(request, path):
+    # file asli (sebelum normalisasi) masih berisi EXIF, tidak untuk publik
+    if path.split('/', 1)[0] == FOLDER_ASLI:
+        raise Http404
+
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(fullpath)
+    except (ValueError, OSError):
+        raise Http404
+
+    if not os.path.isfile(fullpath):
+        raise Http404
+
+    etag, cache_control = _etag(fullpath, stat)
+
+    if _cocok_etag(request.headers.get('If-None-Match'), etag):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Cache-Control'] = cache_control
+        return response
+
+    content_type = mimetypes.guess_type(fullpath)[0] or 'application/octet-stream'
+    ukuran = stat.st_size
+
+    rentang = None
+    if request.headers.get('If-Range', etag) == etag:
+        rentang = _rentang(request.headers.get('Range'), ukuran)
+
+    if rentang == 'invalid':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{ukuran}'
+    elif rentang:
+        awal, akhir = rentang
+        response = StreamingHttpResponse(
+            _baca_rentang(open(fullpath, 'rb'), awal, akhir),
+            status=206,
+            content_type=content_type,
+        )
+        response['Content-Length'] = str(akhir - awal + 1)
+        response['Content-Range'] = f'bytes {awal}-{akhir}/{ukuran}'
+    else:
+        response = FileResponse(open(fullpath, 'rb'), content_type=content_type)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = cache_control
+    return response
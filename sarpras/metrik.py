@@ -0,0 +1,110 @@
+# =========================================================
+# METRIK PROMETHEUS (/metrics)
+# =========================================================
+# prometheus_client dalam mode multiprocess: setiap worker gunicorn /
+# uvicorn menulis nilainya ke file mmap sendiri di
+# PROMETHEUS_MULTIPROC_DIR (default-nya diset di settings.py), dan view
+# /metrics menjumlahkan semua file itu. Jadi angka yang dibaca
+# Prometheus sama, worker mana pun yang melayani scrape.
+#
+# Direktori itu harus dikosongkan sekali saat deploy / restart, SEBELUM
+# worker dijalankan (bukan dari worker). config/gunicorn.conf.py
+# melakukannya di hook on_starting dan memanggil mark_process_dead()
+# untuk worker yang mati (child_exit). Tanpa gunicorn:
+#
+#   rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+#
+# Sumber data:
+#   request / pdf : TimingMiddleware (lihat pengukuran.py)
+#   import        : peralatan_import, buku_import, bhp_import
+#   mutasi stok   : saldo_bulanan.catat_mutasi (BHP masuk / keluar)
+import os
+
+from django.conf import settings
+from django.db import transaction
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+
+os.makedirs(settings.PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+# view tanpa nama URL (404, redirect APPEND_SLASH) dijadikan satu label
+TANPA_NAMA = 'tidak_dikenal'
+
+request_durasi = Histogram(
+    'sarpras_request_durasi_detik',
+    'Durasi request per nama URL',
+    ['view', 'method'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+request_total = Counter(
+    'sarpras_request',
+    'Jumlah request per nama URL dan status',
+    ['view', 'method', 'status'],
+)
+pdf_durasi = Histogram(
+    'sarpras_pdf_durasi_detik',
+    'Durasi render PDF (pisa.CreatePDF) per laporan',
+    ['laporan'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+import_baris = Counter(
+    'sarpras_import_baris',
+    'Baris file import yang disimpan / ditolak',
+    ['jenis', 'hasil'],
+)
+import_laju = Histogram(
+    'sarpras_import_baris_per_detik',
+    'Laju import (baris diproses per detik) per file',
+    ['jenis'],
+    buckets=(5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+mutasi_stok = Counter(
+    'sarpras_mutasi_stok',
+    'Transaksi mutasi stok barang habis pakai',
+    ['arah'],
+)
+mutasi_stok_unit = Counter(
+    'sarpras_mutasi_stok_unit',
+    'Jumlah unit barang habis pakai yang masuk / keluar',
+    ['arah'],
+)
+
+
+def catat_request(view, method, status, durasi, durasi_pdf=0.0):
+    view = view or TANPA_NAMA
+    request_durasi.labels(view, method).observe(durasi)
+    request_total.labels(view, method, str(status)).inc()
+    if durasi_pdf:
+        pdf_durasi.labels(view).observe(durasi_pdf)
+
+
+def catat_import(jenis, disimpan, ditolak, durasi):
+    import_baris.labels(jenis, 'disimpan').inc(disimpan)
+    import_baris.labels(jenis, 'ditolak').inc(ditolak)
+    if durasi > 0:
+        import_laju.labels(jenis).observe((disimpan + ditolak) / durasi)
+
+
+def catat_mutasi_stok(masuk=0, keluar=0):
+    """Dihitung setelah commit, transaksi yang di-rollback tidak ikut."""
+    def _catat():
+        for arah, jumlah in (('masuk', masuk), ('keluar', keluar)):
+            if jumlah:
+                mutasi_stok.labels(arah).inc()
+                mutasi_stok_unit.labels(arah).inc(jumlah)
+
+    transaction.on_commit(_catat)
+
+
+def ekspor():
+    """Teks eksposisi Prometheus dari semua worker: (isi, content_type)."""
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,259 @@
+# =========================================================
+# MIDDLEWARE
+# =========================================================
+# WhiteNoiseMiddleware bawaan hanya sync. Di bawah ASGI, satu middleware
+# sync di rantai membuat Django pindah ke thread untuk setiap request,
+# sehingga view async di belakangnya tetap memegang satu thread selama
+# request berjalan. Subclass di bawah bisa dipanggil sync (WSGI) maupun
+# async (ASGI) tanpa mengubah cara file statis dilayani.
+#
+# TimingMiddleware mengukur setiap request (lihat pengukuran.py),
+# menambahkan header Server-Timing, dan menulis satu baris JSON ke
+# logger "sarpras.lambat" untuk request di atas REQUEST_LAMBAT_MS.
+# Angka yang sama dikirim ke histogram Prometheus (lihat metrik.py).
+#
+# ProfilMiddleware menjalankan view di bawah cProfile jika superuser
+# meminta (?profil=1 atau header "X-Profil: 1") dan menyimpan hasilnya
+# sebagai ProfilRequest (.prof, bisa diunduh dari admin). Hanya
+# PROFIL_MAKS profil terbaru yang disimpan.
+import cProfile
+import io
+import json
+import logging
+import marshal
+import pstats
+from time import perf_counter
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import slugify
+from whitenoise.middleware import WhiteNoiseMiddleware as _WhiteNoiseMiddleware
+
+from . import metrik, pengukuran
+from .models import ProfilRequest
+
+
+logger = logging.getLogger('sarpras.lambat')
+
+
+class WhiteNoiseMiddleware(_WhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+# =====================================================
+# WAKTU PER REQUEST
+# =====================================================
+def _ms(detik):
+    return round(detik * 1000, 1)
+
+
+def _server_timing(hasil, total):
+    bagian = [
+        f'db;dur={_ms(hasil.db)};desc="{hasil.query} query"',
+        f'tpl;dur={_ms(hasil.template)}',
+    ]
+    if hasil.pdf:
+        bagian.append(f'pdf;dur={_ms(hasil.pdf)}')
+    bagian.append(f'total;dur={_ms(total)}')
+    return ', '.join(bagian)
+
+
+class TimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header = getattr(settings, 'SERVER_TIMING', True)
+        self.batas = getattr(settings, 'REQUEST_LAMBAT_MS', 500) / 1000
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        hasil, token = pengukuran.mulai()
+        try:
+            response = self.get_response(request)
+        finally:
+            pengukuran.selesai(token)
+
+        self.catat(request, response, hasil)
+        return response
+
+    async def __acall__(self, request):
+        hasil, token = pengukuran.mulai()
+        try:
+            response = await self.get_response(request)
+        finally:
+            pengukuran.selesai(token)
+
+        self.catat(request, response, hasil)
+        return response
+
+    def catat(self, request, response, hasil):
+        total = hasil.total
+        match = request.resolver_match
+
+        metrik.catat_request(
+            match.view_name if match else None,
+            request.method,
+            response.status_code,
+            total,
+            hasil.pdf,
+        )
+
+        if self.header:
+            response['Server-Timing'] = _server_timing(hasil, total)
+
+        if self.batas and total >= self.batas:
+            logger.warning(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'route': match.route if match else None,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                'total_ms': _ms(total),
+                'query': hasil.query,
+                'db_ms': _ms(hasil.db),
+                'template_ms': _ms(hasil.template),
+                'pdf_ms': _ms(hasil.pdf),
+            }))
+
+
+# =====================================================
+# PROFIL ON-DEMAND (cProfile)
+# =====================================================
+PARAM_PROFIL = 'profil'
+HEADER_PROFIL = 'HTTP_X_PROFIL'
+
+# jumlah fungsi teratas di ProfilRequest.ringkasan
+JUMLAH_RINGKASAN = 30
+
+
+def _minta_profil(request):
+    if request.GET.get(PARAM_PROFIL) != '1' and request.META.get(HEADER_PROFIL) != '1':
+        return False
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_superuser)
+
+
+def _simpan_profil(request, profilers, durasi, query, response):
+    # view async punya dua profiler (lihat ProfilMiddleware);
+    # pstats menggabungkannya. marshal sebelum strip_dirs() mengubah
+    # nama file di stats.
+    teks = io.StringIO()
+    stats = pstats.Stats(*profilers, stream=teks)
+    isi = marshal.dumps(stats.stats)
+    stats.strip_dirs().sort_stats('cumulative').print_stats(JUMLAH_RINGKASAN)
+
+    match = request.resolver_match
+    view = (match.view_name or match._func_path) if match else ''
+
+    profil = ProfilRequest(
+        pengguna_id=request.user.pk,
+        method=request.method,
+        url=request.get_full_path()[:500],
+        view=view[:200],
+        status=response.status_code if response is not None else None,
+        durasi_ms=round(durasi * 1000, 1),
+        query=query,
+        ringkasan=teks.getvalue(),
+    )
+    nama = f'{timezone.now():%Y%m%d-%H%M%S}-{slugify(view) or "view"}.prof'
+    profil.berkas.save(nama, ContentFile(isi))
+
+    logging.getLogger('sarpras.profil').info(
+        'profil #%s %s %s %.1f ms', profil.pk, request.method, profil.url, profil.durasi_ms
+    )
+
+    _pangkas_profil()
+
+
+def _pangkas_profil():
+    # delete() lewat queryset tetap memicu post_delete per baris,
+    # jadi file .prof ikut terhapus (signals.hapus_berkas_profil)
+    maks = getattr(settings, 'PROFIL_MAKS', 100)
+    lama = ProfilRequest.objects.order_by('-waktu', '-pk').values_list('pk', flat=True)[maks:]
+    ProfilRequest.objects.filter(pk__in=list(lama)).delete()
+
+
+def _profil_coroutine(view_func, profiler):
+    async def view(*args, **kwargs):
+        profiler.enable()
+        try:
+            return await view_func(*args, **kwargs)
+        finally:
+            profiler.disable()
+    return view
+
+
+class ProfilMiddleware(MiddlewareMixin):
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFIL_AKTIF', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    # process_view sengaja sync: di ASGI Django menjalankannya di thread
+    # request (sync_to_async thread_sensitive), thread yang sama dengan
+    # view sync dan dengan query ORM yang di-await view async.
+    #
+    # cProfile hanya mencatat thread yang memanggil enable(). Badan view
+    # async (termasuk render template) berjalan di thread event loop,
+    # jadi coroutine-nya dibungkus profiler kedua yang diaktifkan dari
+    # dalam coroutine itu sendiri. force_new_loop memberi request ini
+    # loop sendiri agar coroutine request lain tidak ikut tercatat.
+    # Kedua profiler digabung menjadi satu .prof.
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not _minta_profil(request):
+            return None
+
+        profilers = [cProfile.Profile()]
+
+        if iscoroutinefunction(view_func):
+            profilers.append(cProfile.Profile())
+            view_func = async_to_sync(
+                _profil_coroutine(view_func, profilers[1]),
+                force_new_loop=True,
+            )
+
+        hasil = pengukuran.aktif()
+        query_awal = hasil.query if hasil else 0
+
+        response = None
+        mulai = perf_counter()
+        try:
+            response = profilers[0].runcall(view_func, request, *view_args, **view_kwargs)
+        finally:
+            durasi = perf_counter() - mulai
+            query = hasil.query - query_awal if hasil else 0
+            _simpan_profil(request, profilers, durasi, query, response)
+
+        return response
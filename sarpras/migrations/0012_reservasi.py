@@ -0,0 +1,31 @@
+# Generated by Django 5.0.6 on 2026-10-19 12:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sarpras', '0011_peralatanmesin_ruangan'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reservasi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pemesan', models.CharField(max_length=200)),
+                ('keperluan', models.CharField(blank=True, max_length=200)),
+                ('jumlah', models.PositiveIntegerField()),
+                ('tanggal_mulai', models.DateField()),
+                ('tanggal_selesai', models.DateField()),
+                ('status', models.CharField(choices=[('aktif', 'Aktif'), ('batal', 'Batal')], default='aktif', max_length=20)),
+                ('dibuat', models.DateTimeField(auto_now_add=True)),
+                ('barang', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservasi', to='sarpras.peralatanmesin')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['barang', 'tanggal_mulai', 'tanggal_selesai'], name='reservasi_barang_rentang_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.6 on 2026-10-19 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sarpras', '0012_reservasi'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='baranghabispakaikeluar',
+            index=models.Index(fields=['barang', 'tanggal'], name='bhp_keluar_barang_tgl_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='baranghabispakaimasuk',
+            index=models.Index(fields=['barang', 'tanggal'], name='bhp_masuk_barang_tgl_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-19 12:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sarpras', '0013_bhp_barang_tanggal_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaldoBulananBHP',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('periode', models.DateField()),
+                ('saldo_awal', models.IntegerField(default=0)),
+                ('masuk', models.PositiveIntegerField(default=0)),
+                ('keluar', models.PositiveIntegerField(default=0)),
+                ('saldo_akhir', models.IntegerField(default=0)),
+                ('barang', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saldo_bulanan', to='sarpras.baranghabispakai')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['periode'], name='saldo_bulanan_periode_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='saldobulananbhp',
+            constraint=models.UniqueConstraint(fields=('barang', 'periode'), name='saldo_bulanan_barang_periode_uniq'),
+        ),
+    ]
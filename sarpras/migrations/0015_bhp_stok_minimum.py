@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-19 12:33
+
+from django.db import migrations, models
+
+
+def isi_perlu_restock(apps, schema_editor):
+    BarangHabisPakai = apps.get_model('sarpras', 'BarangHabisPakai')
+    BarangHabisPakai.objects.filter(stok__lte=models.F('stok_minimum')).update(perlu_restock=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sarpras', '0014_saldobulananbhp'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baranghabispakai',
+            name='perlu_restock',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='baranghabispakai',
+            name='stok_minimum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='baranghabispakai',
+            index=models.Index(fields=['perlu_restock', 'nama_barang'], name='bhp_restock_idx'),
+        ),
+        migrations.RunPython(isi_perlu_restock, migrations.RunPython.noop),
+    ]
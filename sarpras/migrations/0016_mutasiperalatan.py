@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-19 12:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sarpras', '0015_bhp_stok_minimum'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MutasiPeralatan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tanggal', models.DateTimeField(default=django.utils.timezone.now)),
+                ('keterangan', models.CharField(blank=True, max_length=255)),
+                ('dari_ruangan', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mutasi_keluar', to='sarpras.ruangan')),
+                ('ke_ruangan', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mutasi_masuk', to='sarpras.ruangan')),
+                ('peralatan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mutasi', to='sarpras.peralatanmesin')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['peralatan', 'tanggal'], name='mutasi_peralatan_tgl_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.0.6 on 2026-10-19 12:39
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def _agregat(qs, field, fungsi):
+    return Coalesce(
+        Subquery(qs.order_by().values(field).annotate(total=fungsi).values('total')),
+        0,
+    )
+
+
+def isi_total(apps, schema_editor):
+    PeralatanMesin = apps.get_model('sarpras', 'PeralatanMesin')
+    Ruangan = apps.get_model('sarpras', 'Ruangan')
+    Gedung = apps.get_model('sarpras', 'Gedung')
+
+    peralatan = PeralatanMesin.objects.filter(ruangan=OuterRef('pk'))
+    Ruangan.objects.update(
+        item_count=_agregat(peralatan, 'ruangan', Count('id')),
+        total_unit=_agregat(peralatan, 'ruangan', Sum('jumlah')),
+    )
+
+    ruangan = Ruangan.objects.filter(gedung=OuterRef('pk'))
+    Gedung.objects.update(
+        item_count=_agregat(ruangan, 'gedung', Sum('item_count')),
+        total_unit=_agregat(ruangan, 'gedung', Sum('total_unit')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sarpras', '0016_mutasiperalatan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gedung',
+            name='item_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='gedung',
+            name='total_unit',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ruangan',
+            name='item_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ruangan',
+            name='total_unit',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(isi_total, migrations.RunPython.noop),
+    ]
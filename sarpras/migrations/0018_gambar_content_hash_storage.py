@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-19 12:41
+
+import sarpras.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sarpras', '0017_ruangan_gedung_total'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='buku',
+            name='gambar',
+            field=models.ImageField(blank=True, null=True, storage=sarpras.storage.ContentHashStorage(), upload_to='buku/'),
+        ),
+        migrations.AlterField(
+            model_name='peralatanmesin',
+            name='gambar',
+            field=models.ImageField(blank=True, null=True, storage=sarpras.storage.ContentHashStorage(), upload_to='peralatan/'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.6 on 2026-10-19 13:02
+
+import django.db.models.deletion
+import django.utils.timezone
+import sarpras.storage
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sarpras', '0018_gambar_content_hash_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfilRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('waktu', models.DateTimeField(default=django.utils.timezone.now)),
+                ('method', models.CharField(max_length=10)),
+                ('url', models.CharField(max_length=500)),
+                ('view', models.CharField(blank=True, max_length=200)),
+                ('status', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('durasi_ms', models.FloatField()),
+                ('query', models.PositiveIntegerField(default=0)),
+                ('ringkasan', models.TextField(blank=True)),
+                ('berkas', models.FileField(storage=sarpras.storage.profil_storage, upload_to='%Y/%m/')),
+                ('pengguna', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'profil request',
+                'verbose_name_plural': 'profil request',
+                'ordering': ['-waktu'],
+            },
+        ),
+    ]
@@ -0,0 +1,110 @@
+from django.db import migrations
+from django.db.models import IntegerField, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+
+
+# Barang yang dibuat sebelum bhp_tambah / bhp_import mencatat stok awal
+# punya stok tanpa baris barang masuk. Selisih stok - ledger dicatat
+# sebagai "Stok awal" di tanggal transaksi pertamanya (atau hari ini),
+# agar rekonsiliasi_stok_bhp --fix tidak menganggapnya selisih.
+def _agregat(model, fungsi):
+    return Subquery(
+        model.objects
+        .filter(barang=OuterRef('pk'))
+        .order_by()
+        .values('barang')
+        .annotate(hasil=fungsi)
+        .values('hasil')
+    )
+
+
+def _mutasi_per_bulan(model):
+    return (
+        model.objects
+        .annotate(periode=TruncMonth('tanggal'))
+        .order_by()
+        .values('barang', 'periode')
+        .annotate(total=Sum('jumlah'))
+        .values_list('barang', 'periode', 'total')
+    )
+
+
+def _rebuild_saldo_bulanan(apps):
+    # salinan sarpras.saldo_bulanan.rebuild_saldo_bulanan untuk model historis
+    BarangHabisPakai = apps.get_model('sarpras', 'BarangHabisPakai')
+    Masuk = apps.get_model('sarpras', 'BarangHabisPakaiMasuk')
+    Keluar = apps.get_model('sarpras', 'BarangHabisPakaiKeluar')
+    SaldoBulananBHP = apps.get_model('sarpras', 'SaldoBulananBHP')
+
+    mutasi = {}
+    for barang_id, periode, total in _mutasi_per_bulan(Masuk):
+        mutasi.setdefault(barang_id, {}).setdefault(periode, [0, 0])[0] += total
+    for barang_id, periode, total in _mutasi_per_bulan(Keluar):
+        mutasi.setdefault(barang_id, {}).setdefault(periode, [0, 0])[1] += total
+
+    stok = dict(BarangHabisPakai.objects.values_list('id', 'stok'))
+
+    rows = []
+    for barang_id, per_bulan in mutasi.items():
+        saldo = stok.get(barang_id, 0) - sum(m - k for m, k in per_bulan.values())
+        for periode in sorted(per_bulan):
+            masuk, keluar = per_bulan[periode]
+            rows.append(SaldoBulananBHP(
+                barang_id=barang_id,
+                periode=periode,
+                saldo_awal=saldo,
+                masuk=masuk,
+                keluar=keluar,
+                saldo_akhir=saldo + masuk - keluar,
+            ))
+            saldo += masuk - keluar
+
+    SaldoBulananBHP.objects.all().delete()
+    SaldoBulananBHP.objects.bulk_create(rows, batch_size=1000)
+
+
+def isi_stok_awal(apps, schema_editor):
+    BarangHabisPakai = apps.get_model('sarpras', 'BarangHabisPakai')
+    Masuk = apps.get_model('sarpras', 'BarangHabisPakaiMasuk')
+    Keluar = apps.get_model('sarpras', 'BarangHabisPakaiKeluar')
+
+    barang = BarangHabisPakai.objects.annotate(
+        total_masuk=Coalesce(_agregat(Masuk, Sum('jumlah')), 0, output_field=IntegerField()),
+        total_keluar=Coalesce(_agregat(Keluar, Sum('jumlah')), 0, output_field=IntegerField()),
+        masuk_pertama=_agregat(Masuk, Min('tanggal')),
+        keluar_pertama=_agregat(Keluar, Min('tanggal')),
+    )
+
+    hari_ini = timezone.localdate()
+    rows = []
+    for b in barang.iterator(chunk_size=2000):
+        selisih = b.stok - (b.total_masuk - b.total_keluar)
+        if selisih <= 0:
+            continue
+        tanggal = min(
+            [t for t in (b.masuk_pertama, b.keluar_pertama) if t] or [hari_ini]
+        )
+        rows.append(Masuk(
+            barang_id=b.id,
+            jumlah=selisih,
+            tanggal=tanggal,
+            sumber='Stok awal',
+        ))
+
+    if not rows:
+        return
+
+    Masuk.objects.bulk_create(rows, batch_size=1000)
+    _rebuild_saldo_bulanan(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sarpras', '0019_profilrequest'),
+    ]
+
+    operations = [
+        migrations.RunPython(isi_stok_awal, migrations.RunPython.noop),
+    ]
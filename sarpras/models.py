@@ -1,8 +1,11 @@
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 from django.db import models
 from django.utils import timezone
 
+from .storage import gambar_storage, profil_storage
+
 
 # =====================
 # KIB A - TANAH
@@ -29,6 +32,7 @@ class PeralatanMesin(models.Model):
     tahun_perolehan = models.PositiveIntegerField()
     gambar = models.ImageField(
         upload_to='peralatan/',
+        storage=gambar_storage,
         blank=True,
         null=True)
 
@@ -76,6 +80,21 @@ class Peminjaman(models.Model):
 # =====================
 # KIB C - GEDUNG & BANGUNAN
 # =====================
+KOLOM_TOTAL = ('item_count', 'total_unit')
+
+
+def _tanpa_kolom_total(instance, kwargs):
+    # save() penuh dari form edit / admin membawa item_count & total_unit
+    # lama di memori dan akan menimpa F() update dari total_ruangan.py,
+    # jadi pada UPDATE kolom total tidak pernah ikut ditulis
+    if instance._state.adding or kwargs.get('update_fields') is not None:
+        return
+    kwargs['update_fields'] = [
+        f.name for f in instance._meta.concrete_fields
+        if not f.primary_key and f.name not in KOLOM_TOTAL
+    ]
+
+
 class Gedung(models.Model):
     kode_barang = models.CharField(max_length=50)
     nama = models.CharField(max_length=200)
@@ -84,6 +103,14 @@ class Gedung(models.Model):
     kondisi = models.CharField(max_length=100)
     tahun_perolehan = models.IntegerField()
 
+    # total seluruh ruangan di gedung ini (lihat total_ruangan.py)
+    item_count = models.IntegerField(default=0, editable=False)
+    total_unit = models.IntegerField(default=0, editable=False)
+
+    def save(self, *args, **kwargs):
+        _tanpa_kolom_total(self, kwargs)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.nama
     
@@ -103,6 +130,15 @@ class Ruangan(models.Model):
     kode = models.CharField(max_length=50)
     penanggung_jawab = models.CharField(max_length=200, blank=True, null=True)
 
+    # disimpan agar daftar ruangan tidak perlu COUNT/SUM ke tabel
+    # peralatan; diperbarui lewat total_ruangan.py
+    item_count = models.IntegerField(default=0, editable=False)
+    total_unit = models.IntegerField(default=0, editable=False)
+
+    def save(self, *args, **kwargs):
+        _tanpa_kolom_total(self, kwargs)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.gedung.nama} - {self.nama}"
 
@@ -131,7 +167,7 @@ class Buku(models.Model):
     jumlah = models.IntegerField()
     kondisi = models.CharField(max_length=50)
     tahun_terbit = models.IntegerField()
-    gambar = models.ImageField( upload_to='buku/', blank=True, null=True)
+    gambar = models.ImageField(upload_to='buku/', storage=gambar_storage, blank=True, null=True)
 
     def __str__(self):
         return self.judul
@@ -141,11 +177,42 @@ class Buku(models.Model):
 #====================================================
 
 
+def perlu_restock_expr():
+    """Ekspresi SQL untuk flag perlu_restock (dipakai pada queryset.update)."""
+    return models.ExpressionWrapper(
+        models.Q(stok__lte=models.F('stok_minimum')),
+        output_field=models.BooleanField()
+    )
+
+
 class BarangHabisPakai(models.Model):
     kode_barang = models.CharField(max_length=50, unique=True)
     nama_barang = models.CharField(max_length=200)
     satuan = models.CharField(max_length=50, default='Unit')
     stok = models.PositiveIntegerField(default=0)
+    stok_minimum = models.PositiveIntegerField(default=0)
+
+    # disimpan (bukan dihitung saat query) agar daftar restock cukup
+    # membaca index, diperbarui setiap kali stok / stok_minimum berubah
+    perlu_restock = models.BooleanField(default=False, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['perlu_restock', 'nama_barang'], name='bhp_restock_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.perlu_restock = self.stok <= self.stok_minimum
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'stok', 'stok_minimum'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'perlu_restock'}
+
+        super().save(*args, **kwargs)
+
+    @property
+    def kekurangan(self):
+        return max(self.stok_minimum - self.stok, 0)
 
     def __str__(self):
         return f"{self.nama_barang} ({self.stok})"
@@ -162,6 +229,11 @@ class BarangHabisPakaiMasuk(models.Model):
     sumber = models.CharField(max_length=200)
     keterangan = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['barang', 'tanggal'], name='bhp_masuk_barang_tgl_idx'),
+        ]
+
     def __str__(self):
         return f"Masuk {self.barang.nama_barang} ({self.jumlah})"
 
@@ -178,6 +250,11 @@ class BarangHabisPakaiKeluar(models.Model):
     keperluan = models.CharField(max_length=200)
     keterangan = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['barang', 'tanggal'], name='bhp_keluar_barang_tgl_idx'),
+        ]
+
     def __str__(self):
         return f"Keluar {self.barang.nama_barang} ({self.jumlah})"
     
@@ -185,3 +262,137 @@ class BarangHabisPakaiKeluar(models.Model):
 
 
     
+# =====================================================
+# RESERVASI PERALATAN (PEMESANAN UNTUK TANGGAL MENDATANG)
+# =====================================================
+class Reservasi(models.Model):
+    STATUS_CHOICES = (
+        ('aktif', 'Aktif'),
+        ('batal', 'Batal'),
+    )
+
+    barang = models.ForeignKey(
+        PeralatanMesin,
+        on_delete=models.CASCADE,
+        related_name='reservasi'
+    )
+    pemesan = models.CharField(max_length=200)
+    keperluan = models.CharField(max_length=200, blank=True)
+    jumlah = models.PositiveIntegerField()
+    tanggal_mulai = models.DateField()
+    tanggal_selesai = models.DateField()
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='aktif'
+    )
+    dibuat = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # dipakai query tumpang-tindih: barang = ? AND mulai <= ? AND selesai >= ?
+            models.Index(
+                fields=['barang', 'tanggal_mulai', 'tanggal_selesai'],
+                name='reservasi_barang_rentang_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.barang.nama} - {self.pemesan} ({self.tanggal_mulai} s/d {self.tanggal_selesai})"
+
+
+# =====================================================
+# SALDO BULANAN BHP (SNAPSHOT PENUTUPAN PER BULAN)
+# =====================================================
+class SaldoBulananBHP(models.Model):
+    barang = models.ForeignKey(
+        BarangHabisPakai,
+        on_delete=models.CASCADE,
+        related_name='saldo_bulanan'
+    )
+    # selalu tanggal 1 pada bulan tersebut
+    periode = models.DateField()
+    saldo_awal = models.IntegerField(default=0)
+    masuk = models.PositiveIntegerField(default=0)
+    keluar = models.PositiveIntegerField(default=0)
+    saldo_akhir = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['barang', 'periode'],
+                name='saldo_bulanan_barang_periode_uniq'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['periode'], name='saldo_bulanan_periode_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.barang.nama_barang} {self.periode:%m/%Y} ({self.saldo_akhir})"
+
+
+# =====================================================
+# MUTASI PERALATAN (PINDAH RUANGAN)
+# =====================================================
+class MutasiPeralatan(models.Model):
+    peralatan = models.ForeignKey(
+        PeralatanMesin,
+        on_delete=models.CASCADE,
+        related_name='mutasi'
+    )
+    dari_ruangan = models.ForeignKey(
+        Ruangan,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='mutasi_keluar'
+    )
+    ke_ruangan = models.ForeignKey(
+        Ruangan,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='mutasi_masuk'
+    )
+    tanggal = models.DateTimeField(default=timezone.now)
+    keterangan = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['peralatan', 'tanggal'], name='mutasi_peralatan_tgl_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.peralatan.nama}: {self.dari_ruangan} → {self.ke_ruangan}"
+
+
+# =====================================================
+# PROFIL REQUEST (cProfile, LIHAT ProfilMiddleware)
+# =====================================================
+class ProfilRequest(models.Model):
+    waktu = models.DateTimeField(default=timezone.now)
+    pengguna = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    method = models.CharField(max_length=10)
+    url = models.CharField(max_length=500)
+    view = models.CharField(max_length=200, blank=True)
+    status = models.PositiveSmallIntegerField(null=True, blank=True)
+    durasi_ms = models.FloatField()
+    query = models.PositiveIntegerField(default=0)
+    # 30 fungsi teratas (cumulative), supaya bisa dibaca tanpa mengunduh
+    ringkasan = models.TextField(blank=True)
+    berkas = models.FileField(upload_to='%Y/%m/', storage=profil_storage)
+
+    class Meta:
+        ordering = ['-waktu']
+        verbose_name = 'profil request'
+        verbose_name_plural = 'profil request'
+
+    def __str__(self):
+        return f"{self.method} {self.url} ({self.durasi_ms:.0f} ms)"
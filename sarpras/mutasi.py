@@ -0,0 +1,70 @@
+# =========================================================
+# MUTASI PERALATAN ANTAR RUANGAN
+# =========================================================
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import cache_versi
+from .models import MutasiPeralatan, PeralatanMesin
+from .total_ruangan import ubah_total
+
+
+@transaction.atomic
+def pindahkan(peralatan_ids, ke_ruangan_id, keterangan=''):
+    """
+    Pindahkan banyak peralatan ke satu ruangan.
+
+    Posisi lama dibaca sekali (terkunci), riwayat ditulis dengan satu
+    bulk_create dan perpindahannya dengan satu queryset.update().
+    Total ruangan/gedung diperbarui sekali per ruangan asal.
+    Peralatan yang sudah berada di ruangan tujuan dilewati.
+    Mengembalikan jumlah peralatan yang dipindahkan.
+    """
+    posisi = list(
+        PeralatanMesin.objects
+        .select_for_update()
+        .filter(id__in=peralatan_ids)
+        .exclude(ruangan_id=ke_ruangan_id)
+        .values_list('id', 'ruangan_id', 'jumlah')
+    )
+
+    if not posisi:
+        return 0
+
+    sekarang = timezone.now()
+    MutasiPeralatan.objects.bulk_create([
+        MutasiPeralatan(
+            peralatan_id=peralatan_id,
+            dari_ruangan_id=dari_ruangan_id,
+            ke_ruangan_id=ke_ruangan_id,
+            tanggal=sekarang,
+            keterangan=keterangan,
+        )
+        for peralatan_id, dari_ruangan_id, _ in posisi
+    ])
+
+    PeralatanMesin.objects.filter(
+        id__in=[peralatan_id for peralatan_id, _, _ in posisi]
+    ).update(ruangan_id=ke_ruangan_id)
+
+    # ruangan asal -> [item, unit]
+    asal = defaultdict(lambda: [0, 0])
+    for _, dari_ruangan_id, jumlah in posisi:
+        asal[dari_ruangan_id][0] += 1
+        asal[dari_ruangan_id][1] += jumlah
+
+    for dari_ruangan_id, (item, unit) in asal.items():
+        ubah_total(dari_ruangan_id, item=-item, unit=-unit)
+
+    ubah_total(
+        ke_ruangan_id,
+        item=len(posisi),
+        unit=sum(jumlah for _, _, jumlah in posisi),
+    )
+
+    # queryset.update() tidak memicu signal
+    cache_versi.naikkan(PeralatanMesin)
+
+    return len(posisi)
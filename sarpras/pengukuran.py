@@ -0,0 +1,82 @@
+# =========================================================
+# PENGUKURAN WAKTU PER REQUEST
+# =========================================================
+# TimingMiddleware (sarpras/middleware.py) membuat satu Pengukuran per
+# request dan menaruhnya di ContextVar. Semua yang dijalankan untuk
+# request itu, termasuk query di thread DB (sync_to_async menyalin
+# context), menambah angka ke objek yang sama:
+#
+#   query / db  : catat_query, dipasang di setiap koneksi baru lewat
+#                 connection.execute_wrappers (signals.py)
+#   template    : Template.render di sarpras/backends/templates.py
+#   pdf         : blok `with ukur('pdf')` di sekitar pisa.CreatePDF
+#
+# Waktu template sudah termasuk query yang baru dieksekusi saat render
+# (queryset lazy), jadi angka-angka ini tidak untuk dijumlahkan.
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+
+_aktif = ContextVar('sarpras_pengukuran', default=None)
+
+
+class Pengukuran:
+    __slots__ = ('mulai', 'query', 'db', 'template', 'pdf', '_dalam')
+
+    def __init__(self):
+        self.mulai = perf_counter()
+        self.query = 0
+        self.db = 0.0
+        self.template = 0.0
+        self.pdf = 0.0
+        self._dalam = set()
+
+    @property
+    def total(self):
+        return perf_counter() - self.mulai
+
+
+def mulai():
+    """Mulai pengukuran untuk context saat ini: (pengukuran, token)."""
+    pengukuran = Pengukuran()
+    return pengukuran, _aktif.set(pengukuran)
+
+
+def selesai(token):
+    _aktif.reset(token)
+
+
+def aktif():
+    """Pengukuran request yang sedang berjalan (None di luar request)."""
+    return _aktif.get()
+
+
+def catat_query(execute, sql, params, many, context):
+    pengukuran = _aktif.get()
+    if pengukuran is None:
+        return execute(sql, params, many, context)
+
+    t = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        pengukuran.query += 1
+        pengukuran.db += perf_counter() - t
+
+
+@contextmanager
+def ukur(jenis):
+    """Tambahkan durasi blok ke `jenis` ('template' / 'pdf'). Blok bersarang dihitung sekali."""
+    pengukuran = _aktif.get()
+    if pengukuran is None or jenis in pengukuran._dalam:
+        yield
+        return
+
+    pengukuran._dalam.add(jenis)
+    t = perf_counter()
+    try:
+        yield
+    finally:
+        pengukuran._dalam.discard(jenis)
+        setattr(pengukuran, jenis, getattr(pengukuran, jenis) + perf_counter() - t)
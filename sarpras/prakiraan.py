@@ -0,0 +1,150 @@
+# =========================================================
+# PRAKIRAAN PEMAKAIAN BARANG HABIS PAKAI
+# =========================================================
+# Seluruh riwayat BarangHabisPakaiKeluar diambil dengan satu query
+# (sudah dijumlah per barang per bulan di database), dipivot menjadi
+# matriks NumPy barang x bulan, lalu rata-rata bergerak dan faktor
+# musiman dihitung untuk semua barang sekaligus (tanpa loop per barang).
+#
+# Laju pemakaian disimpan di cache dan dihapus setiap ada transaksi
+# keluar baru (lihat signals.py). Stok tidak ikut di-cache supaya
+# perkiraan "habis dalam N hari" selalu memakai stok terbaru.
+#
+# NumPy baru di-import saat laju benar-benar dihitung (cache kosong),
+# bukan saat modul dimuat, karena modul ini ikut ter-import lewat
+# signals.py di setiap worker.
+from django.core.cache import cache
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import BarangHabisPakai, BarangHabisPakaiKeluar
+
+
+CACHE_KEY = 'sarpras:prakiraan_bhp'
+
+# jumlah bulan untuk rata-rata bergerak
+JENDELA_BULAN = 3
+
+HARI_PER_BULAN = 365.25 / 12
+
+
+def _indeks_bulan(tanggal):
+    return tanggal.year * 12 + tanggal.month - 1
+
+
+def hitung_laju_pemakaian(hari_ini=None):
+    """
+    Hitung laju pemakaian semua barang dari ledger keluar.
+
+    Hasil: dict barang_id -> {
+        'rata_rata': rata-rata bergerak pemakaian per bulan,
+        'musiman': perkiraan pemakaian bulan depan (rata-rata x faktor musiman),
+        'per_hari': laju pemakaian harian yang dipakai untuk prakiraan,
+    }
+    Bulan berjalan tidak dihitung karena datanya belum lengkap.
+    """
+    hari_ini = hari_ini or timezone.localdate()
+    bulan_ini = _indeks_bulan(hari_ini)
+
+    rows = list(
+        BarangHabisPakaiKeluar.objects
+        .filter(tanggal__lt=hari_ini.replace(day=1))
+        .annotate(periode=TruncMonth('tanggal'))
+        .order_by()
+        .values('barang', 'periode')
+        .annotate(total=Sum('jumlah'))
+        .values_list('barang', 'periode', 'total')
+    )
+
+    if not rows:
+        return {}
+
+    import numpy as np
+
+    barang_ids = np.array([r[0] for r in rows])
+    bulan = np.array([_indeks_bulan(r[1]) for r in rows])
+    total = np.array([r[2] for r in rows], dtype=float)
+
+    # ===================== PIVOT barang x bulan =====================
+    ids, baris = np.unique(barang_ids, return_inverse=True)
+    bulan_awal = bulan.min()
+    jumlah_bulan = bulan_ini - bulan_awal
+    kolom = bulan - bulan_awal
+
+    matriks = np.zeros((len(ids), jumlah_bulan))
+    np.add.at(matriks, (baris, kolom), total)
+
+    # ===================== RATA-RATA BERGERAK =====================
+    jendela = min(JENDELA_BULAN, jumlah_bulan)
+    rata_rata = matriks[:, -jendela:].mean(axis=1)
+
+    # ===================== FAKTOR MUSIMAN =====================
+    # rata-rata per bulan kalender (Jan..Des) dibagi rata-rata keseluruhan
+    bulan_kalender = (np.arange(jumlah_bulan) + bulan_awal) % 12
+    per_kalender = np.zeros((len(ids), 12))
+    banyak = np.bincount(bulan_kalender, minlength=12)
+    np.add.at(per_kalender.T, bulan_kalender, matriks.T)
+    per_kalender = per_kalender / np.maximum(banyak, 1)
+
+    rata_keseluruhan = matriks.mean(axis=1)
+    bulan_depan = bulan_ini % 12
+
+    # musiman hanya dipakai jika bulan yang sama sudah pernah tercatat
+    faktor = np.where(
+        (rata_keseluruhan > 0) & (banyak[bulan_depan] > 0),
+        per_kalender[:, bulan_depan] / np.where(rata_keseluruhan > 0, rata_keseluruhan, 1),
+        1.0,
+    )
+    musiman = rata_rata * faktor
+
+    # pakai yang lebih besar agar prakiraan tidak terlalu optimis
+    per_hari = np.maximum(rata_rata, musiman) / HARI_PER_BULAN
+
+    return {
+        int(barang_id): {
+            'rata_rata': float(rata_rata[i]),
+            'musiman': float(musiman[i]),
+            'per_hari': float(per_hari[i]),
+        }
+        for i, barang_id in enumerate(ids)
+    }
+
+
+def _cache_key():
+    # ganti bulan = jendela rata-rata bergeser, jadi kunci ikut berganti
+    return f"{CACHE_KEY}:{timezone.localdate():%Y-%m}"
+
+
+def laju_pemakaian():
+    laju = cache.get(_cache_key())
+    if laju is None:
+        laju = hitung_laju_pemakaian()
+        cache.set(_cache_key(), laju, None)
+    return laju
+
+
+def hapus_cache():
+    cache.delete(_cache_key())
+
+
+def prakiraan_bhp():
+    """
+    Daftar semua barang dengan anotasi Python `rata_rata`, `musiman`
+    dan `sisa_hari` (None jika belum ada pemakaian), urut dari yang
+    paling cepat habis.
+    """
+    laju = laju_pemakaian()
+    data = list(BarangHabisPakai.objects.order_by('nama_barang'))
+
+    for b in data:
+        info = laju.get(b.id)
+        b.rata_rata = round(info['rata_rata'], 1) if info else 0
+        b.musiman = round(info['musiman'], 1) if info else 0
+        b.sisa_hari = (
+            int(b.stok / info['per_hari'])
+            if info and info['per_hari'] > 0 else None
+        )
+
+    data.sort(key=lambda b: (b.sisa_hari is None, b.sisa_hari or 0))
+    return data
@@ -0,0 +1,199 @@
+# =========================================================
+# SALDO BULANAN BARANG HABIS PAKAI
+# =========================================================
+# Tabel SaldoBulananBHP menyimpan saldo awal, masuk, keluar dan
+# saldo akhir per barang per bulan. Tabel ini dibangun ulang oleh
+# command `rekap_saldo_bulanan` dan diperbarui sedikit-sedikit
+# (F() update) setiap kali bhp_masuk / bhp_keluar mencatat mutasi.
+# Laporan periode cukup membaca tabel ini tanpa memindai ledger.
+from django.db import transaction
+from django.db.models import F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncMonth
+
+from . import metrik
+from .models import (
+    BarangHabisPakai,
+    BarangHabisPakaiMasuk,
+    BarangHabisPakaiKeluar,
+    SaldoBulananBHP,
+)
+
+
+def awal_bulan(tanggal):
+    return tanggal.replace(day=1)
+
+
+def bulan_berikutnya(periode):
+    if periode.month == 12:
+        return periode.replace(year=periode.year + 1, month=1, day=1)
+    return periode.replace(month=periode.month + 1, day=1)
+
+
+# =====================================================
+# UPDATE INKREMENTAL (DIPANGGIL DARI bhp_masuk / bhp_keluar)
+# =====================================================
+def catat_mutasi(barang, tanggal, stok_sebelum, masuk=0, keluar=0):
+    """
+    Tambahkan satu mutasi ke snapshot bulan `tanggal`.
+
+    Harus dipanggil di dalam transaksi yang sama dengan perubahan stok,
+    setelah baris barang dikunci dengan select_for_update().
+    """
+    periode = awal_bulan(tanggal)
+    selisih = masuk - keluar
+
+    metrik.catat_mutasi_stok(masuk=masuk, keluar=keluar)
+
+    updated = SaldoBulananBHP.objects.filter(
+        barang=barang,
+        periode=periode,
+    ).update(
+        masuk=F('masuk') + masuk,
+        keluar=F('keluar') + keluar,
+        saldo_akhir=F('saldo_akhir') + selisih,
+    )
+
+    if not updated:
+        sebelumnya = (
+            SaldoBulananBHP.objects
+            .filter(barang=barang, periode__lt=periode)
+            .order_by('-periode')
+            .values_list('saldo_akhir', flat=True)
+            .first()
+        )
+        if sebelumnya is None:
+            sesudahnya = (
+                SaldoBulananBHP.objects
+                .filter(barang=barang, periode__gt=periode)
+                .order_by('periode')
+                .values_list('saldo_awal', flat=True)
+                .first()
+            )
+            sebelumnya = stok_sebelum if sesudahnya is None else sesudahnya
+
+        SaldoBulananBHP.objects.create(
+            barang=barang,
+            periode=periode,
+            saldo_awal=sebelumnya,
+            masuk=masuk,
+            keluar=keluar,
+            saldo_akhir=sebelumnya + selisih,
+        )
+
+    # transaksi bertanggal mundur menggeser saldo bulan-bulan sesudahnya
+    SaldoBulananBHP.objects.filter(
+        barang=barang,
+        periode__gt=periode,
+    ).update(
+        saldo_awal=F('saldo_awal') + selisih,
+        saldo_akhir=F('saldo_akhir') + selisih,
+    )
+
+
+# =====================================================
+# BANGUN ULANG SELURUH SNAPSHOT
+# =====================================================
+def _mutasi_per_bulan(model):
+    return (
+        model.objects
+        .annotate(periode=TruncMonth('tanggal'))
+        .order_by()
+        .values('barang', 'periode')
+        .annotate(total=Sum('jumlah'))
+        .values_list('barang', 'periode', 'total')
+    )
+
+
+@transaction.atomic
+def rebuild_saldo_bulanan():
+    """
+    Hitung ulang seluruh snapshot dari ledger: dua query grouped
+    (masuk & keluar per barang per bulan), satu query stok, lalu
+    bulk_create. Saldo awal bulan pertama = stok sekarang dikurangi
+    total mutasi, sama seperti kartu stok.
+    """
+    mutasi = {}
+
+    for barang_id, periode, total in _mutasi_per_bulan(BarangHabisPakaiMasuk):
+        mutasi.setdefault(barang_id, {}).setdefault(periode, [0, 0])[0] += total
+
+    for barang_id, periode, total in _mutasi_per_bulan(BarangHabisPakaiKeluar):
+        mutasi.setdefault(barang_id, {}).setdefault(periode, [0, 0])[1] += total
+
+    stok = dict(
+        BarangHabisPakai.objects
+        .filter(id__in=mutasi.keys())
+        .values_list('id', 'stok')
+    )
+
+    rows = []
+    for barang_id, per_bulan in mutasi.items():
+        total_selisih = sum(m - k for m, k in per_bulan.values())
+        saldo = stok.get(barang_id, 0) - total_selisih
+
+        for periode in sorted(per_bulan):
+            masuk, keluar = per_bulan[periode]
+            rows.append(SaldoBulananBHP(
+                barang_id=barang_id,
+                periode=periode,
+                saldo_awal=saldo,
+                masuk=masuk,
+                keluar=keluar,
+                saldo_akhir=saldo + masuk - keluar,
+            ))
+            saldo += masuk - keluar
+
+    SaldoBulananBHP.objects.all().delete()
+    SaldoBulananBHP.objects.bulk_create(rows, batch_size=1000)
+
+    return len(rows)
+
+
+# =====================================================
+# BACA SALDO SATU PERIODE (SEMUA BARANG, SATU QUERY)
+# =====================================================
+def saldo_periode(periode):
+    """
+    Semua barang dengan anotasi saldo_awal, jumlah_masuk, jumlah_keluar
+    dan saldo_akhir untuk bulan `periode`. Barang tanpa mutasi di bulan
+    itu memakai saldo akhir snapshot terakhir sebelumnya.
+    """
+    periode = awal_bulan(periode)
+
+    bulan_ini = SaldoBulananBHP.objects.filter(
+        barang=OuterRef('pk'),
+        periode=periode,
+    )
+    terakhir = (
+        SaldoBulananBHP.objects
+        .filter(barang=OuterRef('pk'), periode__lte=periode)
+        .order_by('-periode')
+    )
+    berikutnya = (
+        SaldoBulananBHP.objects
+        .filter(barang=OuterRef('pk'), periode__gt=periode)
+        .order_by('periode')
+    )
+
+    def kolom(qs, field):
+        return Subquery(qs.values(field)[:1], output_field=IntegerField())
+
+    # nama anotasi diberi awalan agar tidak bentrok dengan related_name
+    # 'masuk' / 'keluar' di BarangHabisPakai
+    return (
+        BarangHabisPakai.objects
+        .annotate(
+            jumlah_masuk=Coalesce(kolom(bulan_ini, 'masuk'), 0),
+            jumlah_keluar=Coalesce(kolom(bulan_ini, 'keluar'), 0),
+            saldo_akhir=Coalesce(
+                kolom(terakhir, 'saldo_akhir'),
+                kolom(berikutnya, 'saldo_awal'),
+                'stok',
+                output_field=IntegerField(),
+            ),
+        )
+        .annotate(
+            saldo_awal=F('saldo_akhir') - F('jumlah_masuk') + F('jumlah_keluar')
+        )
+        .order_by('nama_barang')
+    )
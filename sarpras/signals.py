@@ -0,0 +1,79 @@
+# =========================================================
+# SIGNALS
+# =========================================================
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import (
+    BarangHabisPakai,
+    BarangHabisPakaiKeluar,
+    BarangHabisPakaiMasuk,
+    Buku,
+    Gedung,
+    Jalan,
+    PeralatanMesin,
+    ProfilRequest,
+    Ruangan,
+    Tanah,
+)
+from . import cache_versi, pengukuran, prakiraan
+
+
+# tabel KIB & BHP yang versinya dipakai sebagai kunci cache
+MODEL_TERVERSI = (
+    Tanah,
+    PeralatanMesin,
+    Gedung,
+    Ruangan,
+    Jalan,
+    Buku,
+    BarangHabisPakai,
+    BarangHabisPakaiMasuk,
+    BarangHabisPakaiKeluar,
+)
+
+
+# laju pemakaian (prakiraan) hanya bergantung pada ledger keluar
+@receiver([post_save, post_delete], sender=BarangHabisPakaiKeluar)
+def hapus_cache_prakiraan(sender, **kwargs):
+    prakiraan.hapus_cache()
+
+
+# cache halaman / queryset berversi per model (lihat cache_versi.py);
+# queryset.update() tidak memicu signal, jadi pemanggilnya memanggil
+# cache_versi.naikkan() sendiri
+def naikkan_versi(sender, **kwargs):
+    cache_versi.naikkan(sender)
+
+
+for _model in MODEL_TERVERSI:
+    post_save.connect(naikkan_versi, sender=_model, dispatch_uid=f'versi_{_model.__name__}')
+    post_delete.connect(naikkan_versi, sender=_model, dispatch_uid=f'versi_{_model.__name__}')
+
+
+# file .prof milik sendiri (tidak dibagi seperti gambar), ikut dihapus
+@receiver(post_delete, sender=ProfilRequest)
+def hapus_berkas_profil(sender, instance, **kwargs):
+    if instance.berkas:
+        instance.berkas.delete(save=False)
+
+
+# profil SQLite (lihat SQLITE_PRAGMAS di settings.py)
+@receiver(connection_created)
+def tuning_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_TUNING', False):
+        return
+
+    with connection.cursor() as cursor:
+        for pragma, nilai in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {pragma} = {nilai}')
+
+
+# jumlah & durasi query per request (lihat pengukuran.py); signal ini
+# terpanggil lagi setiap reconnect pada objek koneksi yang sama
+@receiver(connection_created)
+def pasang_pengukuran_query(sender, connection, **kwargs):
+    if pengukuran.catat_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(pengukuran.catat_query)
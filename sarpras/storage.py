@@ -0,0 +1,82 @@
+# =========================================================
+# STORAGE GAMBAR BERDASARKAN ISI (CONTENT HASH)
+# =========================================================
+# Nama file = sha256 isi file, misalnya
+#   peralatan/ec7b61c2...9f.jpg
+# sehingga upload ulang gambar yang sama tidak membuat salinan baru
+# (FileSystemStorage biasa menambahkan akhiran acak _AbC123x).
+# Jika file dengan hash yang sama sudah ada, upload cukup menunjuk ke
+# file tersebut.
+#
+# Karena satu file bisa dipakai beberapa baris, file TIDAK boleh
+# dihapus saat baris dihapus / gambarnya diganti. File yatim dibersihkan
+# terpisah.
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+UKURAN_CHUNK = 64 * 1024
+
+
+def hash_isi(content):
+    """sha256 (hex) dari file / File Django, posisi baca dikembalikan ke awal."""
+    sha = hashlib.sha256()
+
+    if hasattr(content, 'seek'):
+        content.seek(0)
+
+    if hasattr(content, 'chunks'):
+        for chunk in content.chunks(UKURAN_CHUNK):
+            sha.update(chunk)
+    else:
+        for chunk in iter(lambda: content.read(UKURAN_CHUNK), b''):
+            sha.update(chunk)
+
+    if hasattr(content, 'seek'):
+        content.seek(0)
+
+    return sha.hexdigest()
+
+
+def nama_hash(name, digest):
+    """'peralatan/kursi susun.JPG' + digest -> 'peralatan/<digest>.jpg'"""
+    folder = os.path.dirname(name)
+    ext = os.path.splitext(name)[1].lower()
+    return os.path.join(folder, f'{digest}{ext}')
+
+
+@deconstructible
+class ContentHashStorage(FileSystemStorage):
+    """FileSystemStorage yang menamai file dengan hash isinya."""
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        name = nama_hash(name, hash_isi(content))
+
+        # isi yang sama sudah tersimpan: tidak perlu menulis lagi
+        if self.exists(name):
+            return name
+
+        return super().save(name, content, max_length=max_length)
+
+
+gambar_storage = ContentHashStorage()
+
+
+# =========================================================
+# STORAGE HASIL PROFIL REQUEST (.prof)
+# =========================================================
+# Disimpan di PROFIL_DIR, di luar MEDIA_ROOT, supaya tidak ikut
+# dilayani /media/: file profil hanya bisa diunduh lewat admin.
+def profil_storage():
+    return FileSystemStorage(location=settings.PROFIL_DIR)
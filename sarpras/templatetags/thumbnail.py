@@ -0,0 +1,15 @@
+from django import template
+
+from sarpras.thumbnail import srcset
+
+
+register = template.Library()
+
+
+@register.simple_tag
+def thumbnail(gambar):
+    """
+    {% thumbnail p.gambar as thumb %} -> thumb.webp / thumb.jpeg (srcset)
+    dan thumb.src, atau None jika harus memakai gambar asli.
+    """
+    return srcset(gambar)
@@ -1,3 +1,1074 @@
-from django.test import TestCase
+import importlib
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.contrib.auth import get_user_model
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.http import Http404
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .gambar import normalisasi
+from .kartu_stok import decode_cursor, encode_cursor, kartu_stok
+from . import metrik
+from .media import CACHE_BIASA, CACHE_IMMUTABLE, serve_media
+from .ketersediaan import katalog_pada_tanggal, katalog_rentang, sisa_untuk_rentang
+from .models import (
+    BarangHabisPakai,
+    BarangHabisPakaiKeluar,
+    BarangHabisPakaiMasuk,
+    Gedung,
+    MutasiPeralatan,
+    Peminjaman,
+    PeralatanMesin,
+    ProfilRequest,
+    Reservasi,
+    Ruangan,
+    SaldoBulananBHP,
+)
+from .mutasi import pindahkan
+from .prakiraan import HARI_PER_BULAN, hapus_cache, hitung_laju_pemakaian, prakiraan_bhp
+from .saldo_bulanan import catat_mutasi, rebuild_saldo_bulanan, saldo_periode
+from .total_ruangan import geser_peralatan, rebuild_total_ruangan
+from .storage import gambar_storage
+from .thumbnail import FOLDER as FOLDER_THUMB, nama_gagal, srcset
+
+
+# halaman di-render tanpa manifest collectstatic
+TANPA_MANIFEST = override_settings(
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+)
+
+# cache terpisah dari cache file pengembangan
+CACHE_UJI = override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'uji'},
+})
+
+
+class BhpImportRekonsiliasiTest(TestCase):
+
+    def _import(self, isi):
+        file = SimpleUploadedFile('bhp.csv', isi.encode('utf-8'), content_type='text/csv')
+        self.client.post(reverse('bhp_import'), {'file': file})
+
+    def test_import_lalu_fix_tidak_mengubah_stok(self):
+        self._import('kode,nama_barang,stok,satuan\nIMPTEST-1,Kertas A4,50,rim\n')
+
+        barang = BarangHabisPakai.objects.get(kode_barang='IMPTEST-1')
+        self.assertEqual(barang.stok, 50)
+        self.assertEqual(barang.masuk.get().jumlah, 50)
+
+        out = StringIO()
+        call_command('rekonsiliasi_stok_bhp', '--fix', stdout=out)
+        self.assertIn('Semua stok sesuai dengan ledger', out.getvalue())
+
+        barang.refresh_from_db()
+        self.assertEqual(barang.stok, 50)
+
+    def test_import_ulang_mencatat_selisih_sebagai_keluar(self):
+        self._import('kode,nama_barang,stok,satuan\nIMPTEST-2,Spidol,20,pcs\n')
+        self._import('kode,nama_barang,stok,satuan\nIMPTEST-2,Spidol,12,pcs\n')
+
+        barang = BarangHabisPakai.objects.get(kode_barang='IMPTEST-2')
+        self.assertEqual(barang.stok, 12)
+        self.assertEqual(BarangHabisPakaiMasuk.objects.get(barang=barang).jumlah, 20)
+        self.assertEqual(BarangHabisPakaiKeluar.objects.get(barang=barang).jumlah, 8)
+
+        out = StringIO()
+        call_command('rekonsiliasi_stok_bhp', '--fix', stdout=out)
+        barang.refresh_from_db()
+        self.assertEqual(barang.stok, 12)
+
+
+class RekonsiliasiBarangLamaTest(TestCase):
+    """Barang dari sebelum stok awal dicatat di ledger."""
+
+    def _fix(self):
+        out = StringIO()
+        call_command('rekonsiliasi_stok_bhp', '--fix', stdout=out)
+        return out.getvalue()
+
+    def test_fix_mencatat_stok_awal_tanpa_mengubah_stok(self):
+        barang = BarangHabisPakai.objects.create(kode_barang='LAMA-1', nama_barang='Tinta', stok=30)
+
+        self._fix()
+
+        barang.refresh_from_db()
+        self.assertEqual(barang.stok, 30)
+        self.assertEqual(barang.masuk.get().jumlah, 30)
+        self.assertIn('Semua stok sesuai dengan ledger', self._fix())
+
+    def test_fix_stok_kurang_dari_ledger_dicatat_keluar(self):
+        barang = BarangHabisPakai.objects.create(kode_barang='LAMA-2', nama_barang='Lem', stok=5)
+        BarangHabisPakaiMasuk.objects.create(barang=barang, jumlah=10, sumber='Toko')
+
+        self._fix()
+
+        barang.refresh_from_db()
+        self.assertEqual(barang.stok, 5)
+        self.assertEqual(barang.keluar.get().jumlah, 5)
+
+    def test_migrasi_mengisi_stok_awal_di_tanggal_transaksi_pertama(self):
+        migrasi = importlib.import_module('sarpras.migrations.0020_bhp_stok_awal')
+        barang = BarangHabisPakai.objects.create(kode_barang='LAMA-3', nama_barang='Map', stok=40)
+        BarangHabisPakaiMasuk.objects.create(
+            barang=barang, jumlah=10, tanggal=date(2026, 1, 15), sumber='Toko',
+        )
+
+        migrasi.isi_stok_awal(apps, None)
+
+        stok_awal = barang.masuk.get(sumber='Stok awal')
+        self.assertEqual(stok_awal.jumlah, 30)
+        self.assertEqual(stok_awal.tanggal, date(2026, 1, 15))
+        saldo = barang.saldo_bulanan.get()
+        self.assertEqual((saldo.saldo_awal, saldo.masuk, saldo.saldo_akhir), (0, 40, 40))
+
+
+class KartuStokTest(TestCase):
+
+    def setUp(self):
+        # stok awal 10 dari sebelum ledger, lalu +10, +5, -3, -5
+        self.barang = BarangHabisPakai.objects.create(
+            kode_barang='KRT-1', nama_barang='Kertas', stok=17,
+        )
+        BarangHabisPakaiMasuk.objects.create(
+            barang=self.barang, jumlah=10, tanggal=date(2026, 3, 1), sumber='Toko',
+        )
+        BarangHabisPakaiKeluar.objects.create(
+            barang=self.barang, jumlah=3, tanggal=date(2026, 3, 2),
+            pengguna='TU', keperluan='Rapat',
+        )
+        BarangHabisPakaiMasuk.objects.create(
+            barang=self.barang, jumlah=5, tanggal=date(2026, 3, 2), sumber='Toko',
+        )
+        BarangHabisPakaiKeluar.objects.create(
+            barang=self.barang, jumlah=5, tanggal=date(2026, 3, 3),
+            pengguna='Guru', keperluan='Ujian',
+        )
+
+    def test_saldo_berjalan_berakhir_di_stok(self):
+        rows = kartu_stok(self.barang.id)
+
+        self.assertEqual(
+            [(r['jenis'], r['saldo']) for r in rows],
+            [('masuk', 20), ('masuk', 25), ('keluar', 22), ('keluar', 17)],
+        )
+
+    def test_cursor_melanjutkan_saldo(self):
+        halaman_1 = kartu_stok(self.barang.id, limit=2)
+        setelah = decode_cursor(encode_cursor(halaman_1[-1]))
+        halaman_2 = kartu_stok(self.barang.id, setelah=setelah, limit=2)
+
+        self.assertEqual([r['saldo'] for r in halaman_1 + halaman_2], [20, 25, 22, 17])
+        sisa = kartu_stok(self.barang.id, setelah=decode_cursor(encode_cursor(halaman_2[-1])))
+        self.assertEqual(sisa, [])
+
+    def test_cursor_tidak_valid_diabaikan(self):
+        self.assertIsNone(decode_cursor('bukan-cursor'))
+        self.assertIsNone(decode_cursor(None))
+
+
+class SaldoBulananTest(TestCase):
+
+    def setUp(self):
+        self.barang = BarangHabisPakai.objects.create(kode_barang='SPD-1', nama_barang='Spidol')
+
+    def _mutasi(self, tanggal, masuk=0, keluar=0):
+        # seperti bhp_masuk / bhp_keluar: ledger, stok, lalu snapshot
+        if masuk:
+            BarangHabisPakaiMasuk.objects.create(
+                barang=self.barang, jumlah=masuk, tanggal=tanggal, sumber='Toko',
+            )
+        else:
+            BarangHabisPakaiKeluar.objects.create(
+                barang=self.barang, jumlah=keluar, tanggal=tanggal,
+                pengguna='TU', keperluan='Kelas',
+            )
+        stok_sebelum = self.barang.stok
+        self.barang.stok += masuk - keluar
+        self.barang.save()
+        catat_mutasi(self.barang, tanggal, stok_sebelum, masuk=masuk, keluar=keluar)
+
+    def _snapshot(self):
+        return list(
+            SaldoBulananBHP.objects
+            .filter(barang=self.barang)
+            .order_by('periode')
+            .values_list('periode', 'saldo_awal', 'masuk', 'keluar', 'saldo_akhir')
+        )
+
+    def test_mutasi_mundur_menggeser_bulan_sesudahnya(self):
+        self._mutasi(date(2026, 1, 10), masuk=10)
+        self._mutasi(date(2026, 3, 5), keluar=4)
+        self._mutasi(date(2026, 2, 20), masuk=5)
+
+        self.assertEqual(self._snapshot(), [
+            (date(2026, 1, 1), 0, 10, 0, 10),
+            (date(2026, 2, 1), 10, 5, 0, 15),
+            (date(2026, 3, 1), 15, 0, 4, 11),
+        ])
+
+        inkremental = self._snapshot()
+        rebuild_saldo_bulanan()
+        self.assertEqual(self._snapshot(), inkremental)
+
+    def test_bulan_tanpa_mutasi_memakai_saldo_terakhir(self):
+        self._mutasi(date(2026, 1, 10), masuk=10)
+        self._mutasi(date(2026, 3, 5), keluar=4)
+
+        barang = saldo_periode(date(2026, 2, 1)).get(pk=self.barang.pk)
+        self.assertEqual((barang.saldo_awal, barang.saldo_akhir), (10, 10))
+        barang = saldo_periode(date(2026, 4, 1)).get(pk=self.barang.pk)
+        self.assertEqual((barang.saldo_awal, barang.saldo_akhir), (6, 6))
+
+
+class PrakiraanTest(TestCase):
+
+    def setUp(self):
+        hapus_cache()
+        self.kertas = BarangHabisPakai.objects.create(
+            kode_barang='PRK-1', nama_barang='Kertas', stok=30,
+        )
+        self.tinta = BarangHabisPakai.objects.create(
+            kode_barang='PRK-2', nama_barang='Tinta', stok=30,
+        )
+        BarangHabisPakai.objects.create(kode_barang='PRK-3', nama_barang='Lem', stok=5)
+
+    def _keluar(self, barang, jumlah, tanggal):
+        BarangHabisPakaiKeluar.objects.create(
+            barang=barang, jumlah=jumlah, tanggal=tanggal,
+            pengguna='TU', keperluan='Kelas',
+        )
+
+    def test_rata_rata_bergerak_per_barang(self):
+        for bulan in (2, 3, 4):
+            self._keluar(self.kertas, 30, date(2026, bulan, 10))
+        self._keluar(self.tinta, 60, date(2026, 2, 10))
+        # bulan berjalan belum lengkap, tidak dihitung
+        self._keluar(self.kertas, 500, date(2026, 5, 2))
+
+        laju = hitung_laju_pemakaian(hari_ini=date(2026, 5, 15))
+
+        self.assertEqual(set(laju), {self.kertas.id, self.tinta.id})
+        self.assertAlmostEqual(laju[self.kertas.id]['rata_rata'], 30)
+        self.assertAlmostEqual(laju[self.kertas.id]['per_hari'], 30 / HARI_PER_BULAN)
+        self.assertAlmostEqual(laju[self.tinta.id]['rata_rata'], 20)
+
+    def test_faktor_musiman_dari_bulan_yang_sama(self):
+        # Mei 2025 ramai (ujian), bulan lain sepi
+        self._keluar(self.kertas, 120, date(2025, 5, 10))
+        for bulan in (2, 3, 4):
+            self._keluar(self.kertas, 10, date(2026, bulan, 10))
+
+        info = hitung_laju_pemakaian(hari_ini=date(2026, 5, 15))[self.kertas.id]
+
+        self.assertAlmostEqual(info['rata_rata'], 10)
+        self.assertGreater(info['musiman'], info['rata_rata'])
+        self.assertAlmostEqual(info['per_hari'], info['musiman'] / HARI_PER_BULAN)
+
+    def test_urutan_paling_cepat_habis(self):
+        self._keluar(self.kertas, 90, timezone.localdate().replace(day=1) - timedelta(days=1))
+
+        data = prakiraan_bhp()
+
+        self.assertEqual([b.nama_barang for b in data], ['Kertas', 'Lem', 'Tinta'])
+        self.assertIsNotNone(data[0].sisa_hari)
+        self.assertIsNone(data[1].sisa_hari)
+
+
+class MediaSementaraMixin:
+
+    def setUp(self):
+        super().setUp()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+
+
+class ContentHashStorageTest(MediaSementaraMixin, TestCase):
+
+    def _alat(self, kode, isi, nama='foto.JPG'):
+        return PeralatanMesin.objects.create(
+            kode_barang=kode, nama='Kursi', jumlah=1, kondisi='Baik',
+            tahun_perolehan=2024, gambar=SimpleUploadedFile(nama, isi),
+        )
+
+    def test_isi_sama_disimpan_sekali(self):
+        a = gambar_storage.save('peralatan/kursi susun.JPG', ContentFile(b'isi-a'))
+        b = gambar_storage.save('peralatan/lain.jpg', ContentFile(b'isi-a'))
+        c = gambar_storage.save('peralatan/kursi susun.JPG', ContentFile(b'isi-b'))
+
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+        self.assertRegex(a, r'^peralatan/[0-9a-f]{64}\.jpg$')
+        self.assertEqual(len(gambar_storage.listdir('peralatan')[1]), 2)
+
+    def test_file_bersama_tidak_ikut_terhapus(self):
+        pertama = self._alat('KRS-1', b'foto-kursi')
+        kedua = self._alat('KRS-2', b'foto-kursi', nama='kursi lagi.jpg')
+        self.assertEqual(pertama.gambar.name, kedua.gambar.name)
+
+        pertama.delete()
+
+        self.assertTrue(gambar_storage.exists(kedua.gambar.name))
+
+
+def _gambar(format, ukuran=(40, 20), mode='RGB', exif=None):
+    from PIL import Image
+
+    buffer = BytesIO()
+    img = Image.new(mode, ukuran, 'red')
+    if exif:
+        img.save(buffer, format=format, exif=exif)
+    else:
+        img.save(buffer, format=format)
+    return buffer.getvalue()
+
+
+@override_settings(GAMBAR_MAKS_DIMENSI=100, GAMBAR_SIMPAN_ASLI=False)
+class NormalisasiGambarTest(MediaSementaraMixin, TestCase):
+
+    def _alat(self, isi, nama):
+        return PeralatanMesin.objects.create(
+            kode_barang='PRJ-1', nama='Proyektor', jumlah=1, kondisi='Baik',
+            tahun_perolehan=2024, gambar=SimpleUploadedFile(nama, isi),
+        )
+
+    def _buka(self, name):
+        from PIL import Image
+
+        with gambar_storage.open(name, 'rb') as f:
+            img = Image.open(f)
+            img.load()
+        return img
+
+    def test_png_besar_jadi_jpeg_kecil_dan_asli_dihapus(self):
+        alat = self._alat(_gambar('PNG', (400, 200), 'RGBA'), 'foto.png')
+        asli = alat.gambar.name
+
+        baru = normalisasi('sarpras.PeralatanMesin', asli)
+
+        alat.refresh_from_db()
+        self.assertEqual(alat.gambar.name, baru)
+        img = self._buka(baru)
+        self.assertEqual((img.format, img.size), ('JPEG', (100, 50)))
+        self.assertFalse(gambar_storage.exists(asli))
+
+    def test_orientasi_exif_diterapkan_lalu_exif_dibuang(self):
+        from PIL import Image
+
+        exif = Image.Exif()
+        exif[0x0112] = 6  # diputar 90 derajat
+        alat = self._alat(_gambar('JPEG', (40, 20), exif=exif.tobytes()), 'hp.jpg')
+
+        baru = normalisasi('sarpras.PeralatanMesin', alat.gambar.name)
+
+        img = self._buka(baru)
+        self.assertEqual(img.size, (20, 40))
+        self.assertFalse(img.getexif())
+
+    def test_jpeg_kecil_tanpa_exif_dilewati(self):
+        alat = self._alat(_gambar('JPEG'), 'kecil.jpg')
+
+        self.assertIsNone(normalisasi('sarpras.PeralatanMesin', alat.gambar.name))
+        self.assertTrue(gambar_storage.exists(alat.gambar.name))
+
+
+class ServeMediaTest(MediaSementaraMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.isi = bytes(range(256)) * 4
+        self.name = gambar_storage.save('peralatan/foto.jpg', ContentFile(self.isi))
+
+    def _get(self, path, **headers):
+        request = RequestFactory().get(f'/media/{path}', headers=headers)
+        return serve_media(request, path)
+
+    def _isi(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_file_hash_immutable_dan_304(self):
+        response = self._get(self.name)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], CACHE_IMMUTABLE)
+        self.assertEqual(self._isi(response), self.isi)
+
+        response = self._get(self.name, If_None_Match=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_file_biasa_cache_pendek(self):
+        default_storage.save('logo.png', ContentFile(b'logo'))
+        self.assertEqual(self._get('logo.png')['Cache-Control'], CACHE_BIASA)
+
+    def test_range(self):
+        response = self._get(self.name, Range='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.isi)}')
+        self.assertEqual(self._isi(response), self.isi[10:20])
+
+        response = self._get(self.name, Range='bytes=-5')
+        self.assertEqual(self._isi(response), self.isi[-5:])
+
+        response = self._get(self.name, Range=f'bytes={len(self.isi)}-')
+        self.assertEqual(response.status_code, 416)
+
+    def test_if_range_basi_mengirim_file_penuh(self):
+        response = self._get(self.name, Range='bytes=0-9', If_Range='"lama"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_file_asli_dan_di_luar_media_tidak_dilayani(self):
+        default_storage.save(f'asli/{self.name}', ContentFile(self.isi))
+
+        for path in (f'asli/{self.name}', 'tidak-ada.jpg'):
+            with self.assertRaises(Http404):
+                self._get(path)
+        # Django menjawab 400
+        with self.assertRaises(SuspiciousFileOperation):
+            self._get('../settings.py')
+
+
+class BersihkanMediaTest(MediaSementaraMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        alat = PeralatanMesin.objects.create(
+            kode_barang='PRJ-1', nama='Proyektor', jumlah=1, kondisi='Baik',
+            tahun_perolehan=2024, gambar=SimpleUploadedFile('foto.jpg', b'dipakai'),
+        )
+        stem = os.path.splitext(os.path.basename(alat.gambar.name))[0]
+
+        self.dipakai = [alat.gambar.name, f'{FOLDER_THUMB}/peralatan/{stem}_80.webp']
+        self.yatim = [
+            gambar_storage.save('peralatan/lama.jpg', ContentFile(b'yatim')),
+            f'{FOLDER_THUMB}/peralatan/{"0" * 64}_80.webp',
+        ]
+        self.baru = gambar_storage.save('peralatan/baru.jpg', ContentFile(b'baru diupload'))
+
+        default_storage.save(self.dipakai[1], ContentFile(b'thumb'))
+        default_storage.save(self.yatim[1], ContentFile(b'thumb'))
+
+        # semua file kecuali self.baru berumur dua jam
+        dua_jam_lalu = timezone.now().timestamp() - 2 * 60 * 60
+        for name in self.dipakai + self.yatim:
+            os.utime(default_storage.path(name), (dua_jam_lalu, dua_jam_lalu))
+
+    def _ada(self, names):
+        return [default_storage.exists(name) for name in names]
+
+    def test_dry_run_tidak_menghapus(self):
+        out = StringIO()
+        call_command('bersihkan_media', '--dry-run', stdout=out)
+
+        self.assertIn('2 file yatim akan dibersihkan', out.getvalue())
+        self.assertEqual(self._ada(self.dipakai + self.yatim), [True] * 4)
+
+    def test_hanya_file_yatim_yang_lama_dihapus(self):
+        call_command('bersihkan_media', stdout=StringIO())
+
+        self.assertEqual(self._ada(self.dipakai), [True, True])
+        self.assertEqual(self._ada(self.yatim), [False, False])
+        self.assertTrue(default_storage.exists(self.baru))
+
+    def test_karantina(self):
+        with tempfile.TemporaryDirectory() as karantina:
+            call_command('bersihkan_media', '--karantina', karantina, stdout=StringIO())
+
+            for name in self.yatim:
+                self.assertTrue(os.path.exists(os.path.join(karantina, name)))
+        self.assertEqual(self._ada(self.yatim), [False, False])
+
+
+class SeedSarprasTest(TestCase):
+
+    def _seed(self, *args):
+        call_command(
+            'seed_sarpras', '--skala', '0.05', '--bulan', '2', *args, stdout=StringIO()
+        )
+
+    def _jumlah(self):
+        return [
+            model.objects.count()
+            for model in (Gedung, Ruangan, PeralatanMesin, Peminjaman, BarangHabisPakai)
+        ]
+
+    def test_data_sintetis_konsisten(self):
+        self._seed()
+
+        out = StringIO()
+        call_command('rekonsiliasi_stok_bhp', stdout=out)
+        self.assertIn('Semua stok sesuai dengan ledger', out.getvalue())
+
+        sebelum = _total(Ruangan), _total(Gedung)
+        rebuild_total_ruangan()
+        self.assertEqual(sebelum, (_total(Ruangan), _total(Gedung)))
+
+        hari_ini = timezone.localdate()
+        self.assertFalse(katalog_pada_tanggal(hari_ini).filter(tersedia__lt=0).exists())
+
+    def test_seed_ulang_wajib_hapus_dan_tidak_menyentuh_data_asli(self):
+        asli = PeralatanMesin.objects.create(
+            kode_barang='ASLI-1', nama='Lemari', jumlah=1,
+            kondisi='Baik', tahun_perolehan=2020,
+        )
+        self._seed()
+        jumlah = self._jumlah()
+
+        with self.assertRaises(CommandError):
+            self._seed()
+
+        self._seed('--hapus')
+
+        self.assertEqual(self._jumlah(), jumlah)
+        self.assertTrue(PeralatanMesin.objects.filter(pk=asli.pk).exists())
+
+
+class ThumbnailGagalTest(SimpleTestCase):
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+
+    def test_gambar_rusak_tidak_didecode_ulang(self):
+        name = gambar_storage.save('peralatan/rusak.jpg', ContentFile(b'bukan gambar'))
+        gambar = SimpleNamespace(name=name)
+
+        from PIL import Image
+        with mock.patch.object(Image, 'open', wraps=Image.open) as buka:
+            self.assertIsNone(srcset(gambar))
+            self.assertIsNone(srcset(gambar))
+
+        self.assertEqual(buka.call_count, 1)
+        self.assertTrue(default_storage.exists(nama_gagal(name)))
+
+
+@TANPA_MANIFEST
+class KetersediaanTest(TestCase):
+
+    def setUp(self):
+        self.hari_ini = timezone.localdate()
+        self.alat = PeralatanMesin.objects.create(
+            kode_barang='PRJ-1', nama='Proyektor', jumlah=5,
+            kondisi='Baik', tahun_perolehan=2024,
+        )
+
+    def _hari(self, n):
+        return self.hari_ini + timedelta(days=n)
+
+    def _reservasi(self, jumlah, mulai, selesai):
+        return Reservasi.objects.create(
+            barang=self.alat, pemesan='Guru', jumlah=jumlah,
+            tanggal_mulai=self._hari(mulai), tanggal_selesai=self._hari(selesai),
+        )
+
+    def _pinjam(self, jumlah, kembali=None):
+        return self.client.post(reverse('peminjaman_create'), {
+            'barang': self.alat.id,
+            'peminjam': 'Siswa',
+            'jumlah_pinjam': jumlah,
+            'tanggal_kembali': kembali.isoformat() if kembali else '',
+        })
+
+    def _sisa(self, mulai, selesai):
+        return sisa_untuk_rentang(self.alat, self._hari(mulai), self._hari(selesai))
+
+    def test_reservasi_hanya_mengurangi_rentang_yang_beririsan(self):
+        self._reservasi(3, 10, 12)
+
+        self.assertEqual(self._sisa(11, 11), 2)
+        self.assertEqual(self._sisa(13, 14), 5)
+
+    def test_puncak_bukan_jumlah_reservasi_yang_tidak_bersamaan(self):
+        self._reservasi(3, 1, 2)
+        self._reservasi(3, 4, 5)
+
+        self.assertEqual(self._sisa(0, 6), 2)
+
+    def test_reservasi_melebihi_sisa_ditolak(self):
+        self._reservasi(3, 10, 12)
+
+        self.client.post(reverse('reservasi_tambah'), {
+            'barang': self.alat.id,
+            'pemesan': 'Guru',
+            'jumlah': 3,
+            'tanggal_mulai': self._hari(12).isoformat(),
+            'tanggal_selesai': self._hari(15).isoformat(),
+        })
+
+        self.assertEqual(Reservasi.objects.count(), 1)
+
+    def test_peminjaman_hanya_menempati_unit_sampai_tanggal_kembali(self):
+        self._pinjam(2, self._hari(3))
+
+        self.alat.refresh_from_db()
+        self.assertEqual(self.alat.jumlah, 3)
+        self.assertEqual(self._sisa(1, 2), 3)
+        self.assertEqual(self._sisa(5, 6), 5)
+
+        alat = katalog_rentang(self._hari(5), self._hari(6)).get(pk=self.alat.pk)
+        self.assertEqual((alat.milik, alat.dipesan, alat.tersedia), (5, 0, 5))
+        alat = katalog_pada_tanggal(self.hari_ini).get(pk=self.alat.pk)
+        self.assertEqual((alat.milik, alat.dipesan, alat.tersedia), (5, 2, 3))
+
+    def test_peminjaman_tidak_boleh_memakai_unit_yang_direservasi(self):
+        self._reservasi(4, 2, 4)
+
+        self._pinjam(2, self._hari(5))
+        self.assertFalse(Peminjaman.objects.exists())
+
+        self._pinjam(2)
+        self.assertFalse(Peminjaman.objects.exists())
+
+        self._pinjam(2, self._hari(1))
+        self.assertEqual(Peminjaman.objects.get().jumlah_pinjam, 2)
+
+    def test_reservasi_memperhitungkan_peminjaman_yang_belum_kembali(self):
+        self._pinjam(4, self._hari(3))
+
+        self.assertEqual(self._sisa(2, 4), 1)
+        self.assertEqual(self._sisa(4, 6), 5)
+
+    def test_peminjaman_terlambat_tetap_menempati_unit_hari_ini(self):
+        Peminjaman.objects.create(
+            barang=self.alat, peminjam='Siswa', jumlah_pinjam=2,
+            tanggal_kembali=self._hari(-3),
+        )
+        self.alat.jumlah = 3
+        self.alat.save(update_fields=['jumlah'])
+
+        self.assertEqual(self._sisa(0, 0), 3)
+        self.assertEqual(self._sisa(1, 1), 5)
+
+    def test_reservasi_tanpa_barang_ditolak_bukan_500(self):
+        response = self.client.post(reverse('reservasi_tambah'), {
+            'pemesan': 'Guru',
+            'jumlah': 1,
+            'tanggal_mulai': self._hari(1).isoformat(),
+            'tanggal_selesai': self._hari(2).isoformat(),
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Peralatan wajib dipilih')
+        self.assertFalse(Reservasi.objects.exists())
+
+    def test_batal_reservasi_hanya_lewat_post(self):
+        reservasi = self._reservasi(1, 1, 2)
+        url = reverse('reservasi_batal', args=[reservasi.id])
+
+        self.assertEqual(self.client.get(url).status_code, 405)
+        reservasi.refresh_from_db()
+        self.assertEqual(reservasi.status, 'aktif')
+
+        self.client.post(url)
+        reservasi.refresh_from_db()
+        self.assertEqual(reservasi.status, 'batal')
+
+    def test_katalog_pada_tanggal_hanya_menghitung_hari_itu(self):
+        self._reservasi(2, 1, 3)
+        self._reservasi(1, 3, 5)
+        Reservasi.objects.create(
+            barang=self.alat, pemesan='Guru', jumlah=2, status='batal',
+            tanggal_mulai=self._hari(3), tanggal_selesai=self._hari(3),
+        )
+
+        def tersedia(n):
+            return katalog_pada_tanggal(self._hari(n)).get(pk=self.alat.pk).tersedia
+
+        self.assertEqual(tersedia(0), 5)
+        self.assertEqual(tersedia(1), 3)
+        self.assertEqual(tersedia(3), 2)
+        self.assertEqual(tersedia(5), 4)
+
+
+def _total(model):
+    return dict(model.objects.values_list('id', 'item_count')), \
+        dict(model.objects.values_list('id', 'total_unit'))
+
+
+class TotalRuanganTest(TestCase):
+
+    def setUp(self):
+        self.gedung = Gedung.objects.create(
+            kode_barang='G-1', nama='Gedung A', lokasi='Sekolah',
+            luas=100, kondisi='Baik', tahun_perolehan=2020,
+        )
+        self.gedung_lain = Gedung.objects.create(
+            kode_barang='G-2', nama='Gedung B', lokasi='Sekolah',
+            luas=100, kondisi='Baik', tahun_perolehan=2020,
+        )
+        self.lab = Ruangan.objects.create(gedung=self.gedung, nama='Lab', kode='R-1')
+        self.kelas = Ruangan.objects.create(gedung=self.gedung, nama='Kelas', kode='R-2')
+
+        self.alat = []
+        for i, jumlah in enumerate((3, 4, 5)):
+            alat = PeralatanMesin.objects.create(
+                kode_barang=f'PC-{i}', nama='Komputer', jumlah=jumlah,
+                kondisi='Baik', tahun_perolehan=2024, ruangan=self.lab,
+            )
+            geser_peralatan(baru=(self.lab.id, jumlah))
+            self.alat.append(alat)
+
+    def assertSamaDenganRebuild(self):
+        sebelum = _total(Ruangan), _total(Gedung)
+        rebuild_total_ruangan()
+        self.assertEqual(sebelum, (_total(Ruangan), _total(Gedung)))
+
+    def test_pindahkan_menjaga_total(self):
+        pindahkan([a.id for a in self.alat[:2]], self.kelas.id)
+        self.kelas.refresh_from_db()
+        self.assertEqual((self.kelas.item_count, self.kelas.total_unit), (2, 7))
+        self.assertSamaDenganRebuild()
+
+    def test_pindahkan_mencatat_riwayat_dan_melewati_yang_sudah_di_tujuan(self):
+        pindahkan([self.alat[0].id], self.kelas.id)
+
+        jumlah = pindahkan([a.id for a in self.alat], self.kelas.id, 'Renovasi lab')
+
+        self.assertEqual(jumlah, 2)
+        self.assertEqual(
+            sorted(
+                MutasiPeralatan.objects
+                .values_list('peralatan_id', 'dari_ruangan_id', 'ke_ruangan_id')
+            ),
+            [(a.id, self.lab.id, self.kelas.id) for a in self.alat],
+        )
+        self.lab.refresh_from_db()
+        self.assertEqual((self.lab.item_count, self.lab.total_unit), (0, 0))
+        self.assertSamaDenganRebuild()
+
+    def test_pindahkan_dari_tanpa_ruangan(self):
+        alat = PeralatanMesin.objects.create(
+            kode_barang='PC-X', nama='Printer', jumlah=2,
+            kondisi='Baik', tahun_perolehan=2024,
+        )
+
+        pindahkan([alat.id], self.lab.id)
+
+        self.assertEqual(MutasiPeralatan.objects.get().dari_ruangan_id, None)
+        self.assertSamaDenganRebuild()
+
+    @TANPA_MANIFEST
+    def test_tambah_edit_hapus_peralatan_lewat_view(self):
+        data = {
+            'kode_barang': 'PRJ-9', 'nama': 'Proyektor', 'jumlah': 2,
+            'kondisi': 'Baik', 'tahun_perolehan': 2024, 'ruangan': self.kelas.id,
+        }
+        self.client.post(reverse('peralatan_tambah'), data)
+        alat = PeralatanMesin.objects.get(kode_barang='PRJ-9')
+        self.assertSamaDenganRebuild()
+
+        self.client.post(
+            reverse('peralatan_edit', args=[alat.id]),
+            {**data, 'jumlah': 6, 'ruangan': self.lab.id},
+        )
+        self.lab.refresh_from_db()
+        self.assertEqual((self.lab.item_count, self.lab.total_unit), (4, 18))
+        self.assertSamaDenganRebuild()
+
+        self.client.get(reverse('peralatan_hapus', args=[alat.id]))
+        self.assertSamaDenganRebuild()
+
+    def test_hapus_ruangan_mengurangi_total_gedung(self):
+        self.client.get(reverse('ruangan_hapus', args=[self.lab.pk]))
+
+        self.gedung.refresh_from_db()
+        self.assertEqual((self.gedung.item_count, self.gedung.total_unit), (0, 0))
+        self.assertSamaDenganRebuild()
+
+    def test_simpan_ruangan_basi_tidak_menimpa_total(self):
+        basi = Ruangan.objects.get(pk=self.lab.pk)
+        pindahkan([self.alat[0].id], self.kelas.id)
+
+        basi.penanggung_jawab = 'Pak Budi'
+        basi.save()
+
+        self.assertSamaDenganRebuild()
+
+    @TANPA_MANIFEST
+    def test_edit_ruangan_dan_gedung_setelah_mutasi(self):
+        pindahkan([self.alat[0].id], self.kelas.id)
+
+        self.client.post(reverse('ruangan_edit', args=[self.kelas.pk]), {
+            'gedung': self.gedung_lain.pk,
+            'nama': 'Kelas',
+            'kode': 'R-2',
+            'penanggung_jawab': 'Bu Ani',
+        })
+        self.client.post(reverse('gedung_edit', args=[self.gedung.pk]), {
+            'kode_barang': 'G-1', 'nama': 'Gedung A', 'lokasi': 'Sekolah',
+            'luas': 120, 'kondisi': 'Baik', 'tahun_perolehan': 2020,
+        })
+
+        self.gedung_lain.refresh_from_db()
+        self.assertEqual((self.gedung_lain.item_count, self.gedung_lain.total_unit), (1, 3))
+        self.assertSamaDenganRebuild()
+
+
+@CACHE_UJI
+class HierarkiAsetTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        gedung = Gedung.objects.create(
+            kode_barang='G-1', nama='Gedung A', lokasi='Sekolah',
+            luas=100, kondisi='Baik', tahun_perolehan=2020,
+        )
+        for i in range(3):
+            ruangan = Ruangan.objects.create(gedung=gedung, nama=f'Ruang {i}', kode=f'R-{i}')
+            PeralatanMesin.objects.create(
+                kode_barang=f'MJ-{i}', nama='Meja', jumlah=2,
+                kondisi='Baik', tahun_perolehan=2024, ruangan=ruangan,
+            )
+            geser_peralatan(baru=(ruangan.id, 2))
+        PeralatanMesin.objects.create(
+            kode_barang='LMR-1', nama='Lemari', jumlah=1,
+            kondisi='Baik', tahun_perolehan=2024,
+        )
+
+    def _ambil(self):
+        response = self.client.get(reverse('api_hierarki_aset'))
+        isi = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, json.loads(isi)
+
+    def test_pohon_lengkap_dengan_jumlah_query_tetap(self):
+        with self.assertNumQueries(4):
+            _, data = self._ambil()
+
+        self.assertEqual(data['jumlah'], {'gedung': 1, 'ruangan': 3, 'item': 4, 'unit': 7})
+        self.assertEqual(
+            [len(r['peralatan']) for r in data['gedung'][0]['ruangan']], [1, 1, 1]
+        )
+        self.assertEqual([p['kode_barang'] for p in data['tanpa_ruangan']], ['LMR-1'])
+
+    def test_cache_diganti_saat_peralatan_berubah(self):
+        self._ambil()
+        with self.assertNumQueries(0):
+            response, _ = self._ambil()
+        self.assertFalse(response.streaming)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PeralatanMesin.objects.filter(kode_barang='LMR-1').delete()
+
+        _, data = self._ambil()
+        self.assertEqual(data['tanpa_ruangan'], [])
+
+    async def test_stream_async_di_asgi(self):
+        response = await AsyncClient().get(reverse('api_hierarki_aset'))
+        isi = b''.join([bagian async for bagian in response.streaming_content])
+
+        self.assertEqual(json.loads(isi)['jumlah']['item'], 4)
+
+
+@TANPA_MANIFEST
+class MutasiPeralatanHalamanTest(TestCase):
+
+    def test_daftar_mutasi_dipaginasi(self):
+        PeralatanMesin.objects.bulk_create(
+            PeralatanMesin(
+                kode_barang=f'KRS-{i:03}', nama='Kursi', jumlah=1,
+                kondisi='Baik', tahun_perolehan=2024,
+            )
+            for i in range(60)
+        )
+
+        response = self.client.get(reverse('peralatan_mutasi'), {'q': 'Kursi'})
+        self.assertEqual(len(response.context['data']), 50)
+        self.assertContains(response, 'page=2&q=Kursi')
+
+        response = self.client.get(reverse('peralatan_mutasi'), {'q': 'Kursi', 'page': 2})
+        self.assertEqual(len(response.context['data']), 10)
+
+
+class MetrikTest(TestCase):
+
+    @override_settings(METRIK_TOKEN='', DEBUG=False)
+    def test_tanpa_token_tertutup_di_produksi(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+
+    @override_settings(METRIK_TOKEN='', DEBUG=True)
+    def test_tanpa_token_terbuka_saat_debug(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
+
+    def _nilai(self, sample, **labels):
+        from prometheus_client.parser import text_string_to_metric_families
+
+        isi, _ = metrik.ekspor()
+        for family in text_string_to_metric_families(isi.decode()):
+            for s in family.samples:
+                if s.name == sample and s.labels == labels:
+                    return s.value
+        return 0
+
+    @TANPA_MANIFEST
+    def test_request_dihitung_per_nama_url(self):
+        label = {'view': 'reservasi_list', 'method': 'GET'}
+        total = self._nilai('sarpras_request_total', status='200', **label)
+        jumlah = self._nilai('sarpras_request_durasi_detik_count', **label)
+        tanpa_nama = self._nilai(
+            'sarpras_request_total', view=metrik.TANPA_NAMA, method='GET', status='404'
+        )
+
+        self.client.get(reverse('reservasi_list'))
+        self.client.get(reverse('reservasi_list'))
+        self.client.get('/tidak-ada-halaman-ini/')
+
+        self.assertEqual(self._nilai('sarpras_request_total', status='200', **label), total + 2)
+        self.assertEqual(self._nilai('sarpras_request_durasi_detik_count', **label), jumlah + 2)
+        self.assertEqual(
+            self._nilai(
+                'sarpras_request_total', view=metrik.TANPA_NAMA, method='GET', status='404'
+            ),
+            tanpa_nama + 1,
+        )
+
+    def test_mutasi_stok_dihitung_setelah_commit(self):
+        sebelum = self._nilai('sarpras_mutasi_stok_unit_total', arah='keluar')
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            metrik.catat_mutasi_stok(keluar=3)
+        self.assertEqual(self._nilai('sarpras_mutasi_stok_unit_total', arah='keluar'), sebelum)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self._nilai('sarpras_mutasi_stok_unit_total', arah='keluar'), sebelum + 3)
+
+    @override_settings(METRIK_TOKEN='rahasia', DEBUG=False)
+    def test_token_wajib_cocok(self):
+        url = reverse('metrics')
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.assertEqual(
+            self.client.get(url, HTTP_AUTHORIZATION='Bearer salah').status_code, 401
+        )
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer rahasia')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'sarpras_request')
+
+
+@TANPA_MANIFEST
+@override_settings(PROFIL_AKTIF=True, PROFIL_MAKS=2)
+class ProfilRetensiTest(TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.storage = FileSystemStorage(location=folder.name)
+        patcher = mock.patch.object(
+            ProfilRequest._meta.get_field('berkas'), 'storage', self.storage
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        admin = get_user_model().objects.create_superuser('admin', 'a@a.id', 'rahasia')
+        self.client.force_login(admin)
+
+    def _berkas(self):
+        hasil = []
+        for folder in self.storage.listdir('')[0]:
+            for bulan in self.storage.listdir(folder)[0]:
+                hasil += self.storage.listdir(f'{folder}/{bulan}')[1]
+        return hasil
+
+    def test_hanya_profil_terbaru_disimpan(self):
+        for _ in range(3):
+            self.client.get(reverse('peralatan_mutasi'), {'profil': '1'})
+
+        self.assertEqual(ProfilRequest.objects.count(), 2)
+        self.assertEqual(len(self._berkas()), 2)
+
+    @override_settings(PROFIL_AKTIF=False)
+    def test_mati_tanpa_profil(self):
+        self.client.get(reverse('peralatan_mutasi'), {'profil': '1'})
+        self.assertFalse(ProfilRequest.objects.exists())
+
+
+@TANPA_MANIFEST
+class DashboardTest(TestCase):
+
+    def test_ringkasan_dan_jumlah_query(self):
+        alat = PeralatanMesin.objects.create(
+            kode_barang='PRJ-1', nama='Proyektor', jumlah=5,
+            kondisi='Baik', tahun_perolehan=2024,
+        )
+        Gedung.objects.create(
+            kode_barang='GD-1', nama='Gedung A', lokasi='Utara',
+            luas=100, kondisi='Baik', tahun_perolehan=2020,
+        )
+        Peminjaman.objects.create(barang=alat, peminjam='Siswa', jumlah_pinjam=1)
+        Peminjaman.objects.create(
+            barang=alat, peminjam='Guru', jumlah_pinjam=1, status='kembali'
+        )
+        BarangHabisPakai.objects.create(kode_barang='KRT', nama_barang='Kertas', stok=0)
+
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('dashboard'))
+
+        self.assertEqual(response.context['total_aset'], 2)
+        self.assertEqual(response.context['peminjaman_aktif'], 1)
+        self.assertEqual(response.context['stok_habis'], 1)
+
+
+@TANPA_MANIFEST
+class TimingMiddlewareTest(TestCase):
+
+    def test_server_timing_menghitung_query(self):
+        response = self.client.get(reverse('dashboard'))
+
+        timing = response['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('desc="4 query"', timing)
+        self.assertRegex(timing, r'tpl;dur=[\d.]+, total;dur=[\d.]+$')
+
+    async def test_query_di_thread_db_ikut_terhitung_di_asgi(self):
+        response = await AsyncClient().get(reverse('ruangan_list'))
+        self.assertIn('desc="1 query"', response['Server-Timing'])
+
+    @override_settings(SERVER_TIMING=False, REQUEST_LAMBAT_MS=0.001)
+    def test_request_lambat_dicatat_sebagai_json(self):
+        with self.assertLogs('sarpras.lambat', 'WARNING') as log:
+            response = self.client.get(reverse('dashboard'))
+
+        self.assertNotIn('Server-Timing', response)
+        baris = json.loads(log.records[0].getMessage())
+        self.assertEqual((baris['view'], baris['status'], baris['query']), ('dashboard', 200, 4))
+
+
+@TANPA_MANIFEST
+@CACHE_UJI
+class HalamanAsyncTest(TestCase):
+    HALAMAN = (
+        'peralatan_rekap', 'peminjaman_list', 'pengembalian_list', 'reservasi_list',
+        'aset_per_ruangan', 'ruangan_list', 'bhp_restock', 'dashboard',
+    )
+
+    def setUp(self):
+        cache.clear()
+        alat = PeralatanMesin.objects.create(
+            kode_barang='PRJ-1', nama='Proyektor', jumlah=3,
+            kondisi='Baik', tahun_perolehan=2024,
+        )
+        Peminjaman.objects.create(barang=alat, peminjam='Siswa', jumlah_pinjam=1)
+
+    def test_halaman_di_wsgi(self):
+        for nama in self.HALAMAN:
+            with self.subTest(nama):
+                self.assertEqual(self.client.get(reverse(nama)).status_code, 200)
+
+    async def test_halaman_di_asgi(self):
+        client = AsyncClient()
+        for nama in self.HALAMAN:
+            with self.subTest(nama):
+                response = await client.get(reverse(nama))
+                self.assertEqual(response.status_code, 200)
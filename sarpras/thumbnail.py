@@ -0,0 +1,147 @@
+# =========================================================
+# THUMBNAIL GAMBAR (PERALATAN & BUKU)
+# =========================================================
+# Halaman daftar hanya menampilkan gambar kecil (max 80px), jadi
+# dibuatkan thumbnail ukuran tetap dalam format WebP dan JPEG:
+#
+#   peralatan/<hash>.jpg -> thumbs/peralatan/<hash>_80.webp
+#                           thumbs/peralatan/<hash>_80.jpg
+#                           thumbs/peralatan/<hash>_160.webp  (layar 2x)
+#                           thumbs/peralatan/<hash>_160.jpg
+#
+# Thumbnail dibuat saat pertama kali dibutuhkan (template tag
+# `thumbnail`) lalu disimpan di disk; backfill lewat command
+# `buat_thumbnail`. Karena nama gambar asli = hash isi, nama thumbnail
+# juga tidak pernah berubah isinya.
+#
+# Gambar yang gagal dibaca Pillow ditandai dengan file kosong
+# thumbs/peralatan/<hash>_gagal, supaya halaman daftar tidak mencoba
+# decode ulang di setiap render. `buat_thumbnail --timpa` mencoba lagi
+# dan menghapus tanda itu jika berhasil.
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from .storage import gambar_storage
+
+
+FOLDER = 'thumbs'
+
+# tinggi/lebar maksimum (px): 1x dan 2x dari max-height 80px di template
+UKURAN = (80, 160)
+
+# format -> (ekstensi, opsi simpan Pillow)
+FORMAT = {
+    'webp': ('webp', {'format': 'WEBP', 'quality': 75, 'method': 4}),
+    'jpeg': ('jpg', {'format': 'JPEG', 'quality': 80, 'optimize': True, 'progressive': True}),
+}
+
+
+def nama_thumbnail(name, ukuran, fmt):
+    stem = os.path.splitext(name)[0]
+    return f'{FOLDER}/{stem}_{ukuran}.{FORMAT[fmt][0]}'
+
+
+def nama_gagal(name):
+    stem = os.path.splitext(name)[0]
+    return f'{FOLDER}/{stem}_gagal'
+
+
+def _semua_nama(name):
+    return [
+        (ukuran, fmt, nama_thumbnail(name, ukuran, fmt))
+        for ukuran in UKURAN
+        for fmt in FORMAT
+    ]
+
+
+def _terakhir(name):
+    # varian yang ditulis paling akhir oleh buat_thumbnail(): jika ada,
+    # varian lain juga sudah ada
+    return _semua_nama(name)[-1][2]
+
+
+def buat_thumbnail(name, timpa=False):
+    """
+    Buat semua varian thumbnail untuk gambar `name` yang belum ada.
+    Mengembalikan jumlah file yang dibuat; 0 jika gambar tidak bisa dibaca.
+    """
+    gagal = nama_gagal(name)
+    if not timpa and default_storage.exists(gagal):
+        return 0
+
+    belum = [
+        item for item in _semua_nama(name)
+        if timpa or not default_storage.exists(item[2])
+    ]
+    if not belum:
+        return 0
+
+    from PIL import Image, ImageOps
+
+    try:
+        with gambar_storage.open(name, 'rb') as f:
+            img = Image.open(f)
+            img = ImageOps.exif_transpose(img)
+            img.load()
+    except FileNotFoundError:
+        return 0
+    except (OSError, Image.DecompressionBombError, ValueError):
+        if not default_storage.exists(gagal):
+            default_storage.save(gagal, ContentFile(b''))
+        return 0
+
+    if img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+
+    dibuat = 0
+    for ukuran in UKURAN:
+        kecil = img.copy()
+        kecil.thumbnail((ukuran, ukuran), Image.LANCZOS)
+
+        for u, fmt, thumb in belum:
+            if u != ukuran:
+                continue
+
+            buffer = BytesIO()
+            kecil.save(buffer, **FORMAT[fmt][1])
+
+            if timpa and default_storage.exists(thumb):
+                default_storage.delete(thumb)
+            default_storage.save(thumb, ContentFile(buffer.getvalue()))
+            dibuat += 1
+
+    if timpa and default_storage.exists(gagal):
+        default_storage.delete(gagal)
+
+    return dibuat
+
+
+def srcset(gambar):
+    """
+    dict {'webp': srcset, 'jpeg': srcset, 'src': url 1x} untuk field
+    gambar, atau None jika thumbnail tidak bisa dibuat (template lalu
+    memakai gambar asli).
+    """
+    if not gambar:
+        return None
+
+    name = gambar.name
+    terakhir = _terakhir(name)
+
+    if not default_storage.exists(terakhir):
+        buat_thumbnail(name)
+        if not default_storage.exists(terakhir):
+            return None
+
+    hasil = {
+        fmt: ', '.join(
+            f'{default_storage.url(nama_thumbnail(name, ukuran, fmt))} {i}x'
+            for i, ukuran in enumerate(UKURAN, start=1)
+        )
+        for fmt in FORMAT
+    }
+    hasil['src'] = default_storage.url(nama_thumbnail(name, UKURAN[0], 'jpeg'))
+    return hasil
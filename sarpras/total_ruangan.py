@@ -0,0 +1,111 @@
+# =========================================================
+# TOTAL PERALATAN PER RUANGAN & GEDUNG
+# =========================================================
+# Ruangan.item_count / total_unit dan rollup-nya di Gedung disimpan
+# sebagai kolom, jadi daftar ruangan dan gedung tidak perlu JOIN +
+# COUNT/SUM ke tabel peralatan. Setiap view yang mengubah peralatan
+# (tambah, edit, hapus, mutasi, peminjaman) memanggil fungsi di sini;
+# perubahan ditulis sebagai F() update sehingga aman dipanggil dari
+# request yang berjalan bersamaan.
+#
+# Jika angka sempat meleset (misalnya data diubah lewat admin atau
+# shell), jalankan command `rebuild_total_ruangan`.
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from . import cache_versi
+from .models import Gedung, PeralatanMesin, Ruangan
+
+
+def ubah_total(ruangan_id, item=0, unit=0):
+    """Tambahkan selisih item/unit ke satu ruangan dan gedungnya."""
+    if not ruangan_id or not (item or unit):
+        return
+
+    Ruangan.objects.filter(id=ruangan_id).update(
+        item_count=F('item_count') + item,
+        total_unit=F('total_unit') + unit,
+    )
+    Gedung.objects.filter(ruangan=ruangan_id).update(
+        item_count=F('item_count') + item,
+        total_unit=F('total_unit') + unit,
+    )
+    cache_versi.naikkan(Ruangan, Gedung)
+
+
+def geser_peralatan(lama=None, baru=None):
+    """
+    Terapkan perubahan satu peralatan ke total ruangan.
+
+    `lama` dan `baru` adalah pasangan (ruangan_id, jumlah) sebelum dan
+    sesudah perubahan; None untuk peralatan yang baru dibuat / dihapus.
+    """
+    lama_ruangan, lama_jumlah = lama or (None, 0)
+    baru_ruangan, baru_jumlah = baru or (None, 0)
+
+    if lama_ruangan == baru_ruangan:
+        ubah_total(baru_ruangan, unit=baru_jumlah - lama_jumlah)
+        return
+
+    ubah_total(lama_ruangan, item=-1, unit=-lama_jumlah)
+    ubah_total(baru_ruangan, item=1, unit=baru_jumlah)
+
+
+def pindah_gedung(ruangan, gedung_lama_id):
+    """Ruangan pindah gedung: total ruangan ikut berpindah."""
+    if gedung_lama_id == ruangan.gedung_id:
+        return
+
+    Gedung.objects.filter(id=gedung_lama_id).update(
+        item_count=F('item_count') - ruangan.item_count,
+        total_unit=F('total_unit') - ruangan.total_unit,
+    )
+    Gedung.objects.filter(id=ruangan.gedung_id).update(
+        item_count=F('item_count') + ruangan.item_count,
+        total_unit=F('total_unit') + ruangan.total_unit,
+    )
+    cache_versi.naikkan(Gedung)
+
+
+def lepas_ruangan(ruangan):
+    """Ruangan dihapus: peralatannya menjadi tanpa ruangan (SET_NULL)."""
+    Gedung.objects.filter(id=ruangan.gedung_id).update(
+        item_count=F('item_count') - ruangan.item_count,
+        total_unit=F('total_unit') - ruangan.total_unit,
+    )
+    cache_versi.naikkan(Gedung)
+
+
+# =====================================================
+# HITUNG ULANG SEMUA (COMMAND rebuild_total_ruangan)
+# =====================================================
+def _agregat(qs, field, fungsi):
+    return Coalesce(
+        Subquery(
+            qs.order_by()
+            .values(field)
+            .annotate(total=fungsi)
+            .values('total')
+        ),
+        0,
+    )
+
+
+@transaction.atomic
+def rebuild_total_ruangan():
+    """Hitung ulang semua kolom total dengan dua UPDATE ... SET (subquery)."""
+    peralatan = PeralatanMesin.objects.filter(ruangan=OuterRef('pk'))
+    Ruangan.objects.update(
+        item_count=_agregat(peralatan, 'ruangan', Count('id')),
+        total_unit=_agregat(peralatan, 'ruangan', Sum('jumlah')),
+    )
+
+    ruangan = Ruangan.objects.filter(gedung=OuterRef('pk'))
+    jumlah = Gedung.objects.update(
+        item_count=_agregat(ruangan, 'gedung', Sum('item_count')),
+        total_unit=_agregat(ruangan, 'gedung', Sum('total_unit')),
+    )
+
+    cache_versi.naikkan(Ruangan, Gedung)
+    return jumlah
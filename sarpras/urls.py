@@ -27,6 +27,8 @@ urlpatterns = [
     path('peralatan/import/', views.peralatan_import, name='peralatan_import'),
     path('peralatan/export/excel/', views.peralatan_export_excel, name='peralatan_export_excel'),
     path('peralatan/cetak/pdf/', views.peralatan_cetak_pdf, name='peralatan_cetak_pdf'),
+    path('peralatan/mutasi/', views.peralatan_mutasi, name='peralatan_mutasi'),
+    path('peralatan/<int:id>/mutasi/', views.peralatan_riwayat_mutasi, name='peralatan_riwayat_mutasi'),
 
 
     #peminjamanan alat
@@ -48,6 +50,13 @@ path(
     name='cetak_surat_peminjaman'
 ),
 
+    #reservasi alat (tanggal mendatang)
+    #=============================================================================
+    path('reservasi/', views.reservasi_list, name='reservasi_list'),
+    path('reservasi/tambah/', views.reservasi_tambah, name='reservasi_tambah'),
+    path('reservasi/<int:id>/batal/', views.reservasi_batal, name='reservasi_batal'),
+    path('reservasi/ketersediaan/', views.ketersediaan, name='ketersediaan'),
+
     # ===============================
     # KIB C - GEDUNG & BANGUNAN
     # ===============================
@@ -60,6 +69,7 @@ path(
     #-------------------------
     #ruangan
     path('aset-per-ruangan/', views.aset_per_ruangan, name='aset_per_ruangan'),
+    path('api/hierarki-aset/', views.api_hierarki_aset, name='api_hierarki_aset'),
 
     path('ruangan/', views.ruangan_list, name='ruangan_list'),
     path('ruangan/tambah/', views.ruangan_tambah, name='ruangan_tambah'),
@@ -111,9 +121,22 @@ path('cetak/semua-kib/', views.semua_kib_cetak_pdf, name='semua_kib_cetak_pdf'),
 
  path('bhp/transaksi/', views.bhp_transaksi, name='bhp_transaksi'),
  path('bhp/transaksi/pdf/', views.bhp_transaksi_pdf, name='bhp_transaksi_pdf'),
+ path('bhp/saldo-bulanan/', views.bhp_saldo_bulanan, name='bhp_saldo_bulanan'),
+ path('bhp/restock/', views.bhp_restock, name='bhp_restock'),
+ path('bhp/restock/excel/', views.bhp_restock_excel, name='bhp_restock_excel'),
+ path('bhp/prakiraan/', views.bhp_prakiraan, name='bhp_prakiraan'),
  path('bhp/<int:barang_id>/riwayat/',views.bhp_barang_riwayat, name='bhp_barang_riwayat'),
+ path('bhp/<int:barang_id>/kartu-stok/', views.bhp_kartu_stok, name='bhp_kartu_stok'),
+ path('bhp/<int:barang_id>/kartu-stok/excel/', views.bhp_kartu_stok_excel, name='bhp_kartu_stok_excel'),
 
  path('ruangan/<int:id>/cetak/', views.cetak_kir, name='cetak_kir'),
+ path('ruangan/<int:id>/cetak/pdf/', views.cetak_kir_pdf, name='cetak_kir_pdf'),
+ path('ruangan/cetak/kir/', views.cetak_kir_batch, name='cetak_kir_batch'),
+
+    # ===============================
+    # METRIK PROMETHEUS
+    # ===============================
+    path('metrics', views.metrics, name='metrics'),
 
 
 
@@ -0,0 +1,96 @@
+# =========================================================
+# VIEWS SARPRAS (PER SUBSISTEM)
+# =========================================================
+# dashboard  : ringkasan & grafik
+# kib        : KIB A-E (tanah, peralatan, gedung, jalan, buku), import Excel
+# peminjaman : peminjaman, pengembalian, reservasi, ketersediaan
+# bhp        : barang habis pakai, kartu stok, prakiraan
+# ruangan    : ruangan & hierarki aset per ruangan
+# reports    : semua cetak PDF & export Excel (library berat di-import
+#              di dalam fungsi, lihat reports.py)
+# metrik     : endpoint Prometheus /metrics
+#
+# Semua view di-export ulang di sini supaya urls.py tetap memakai
+# views.<nama_view>.
+from .dashboard import (
+    dashboard,
+)
+from .kib import (
+    tanah_list,
+    tanah_tambah,
+    tanah_edit,
+    tanah_hapus,
+    peralatan_list,
+    peralatan_tambah,
+    peralatan_edit,
+    peralatan_hapus,
+    peralatan_mutasi,
+    peralatan_riwayat_mutasi,
+    peralatan_import,
+    peralatan_rekap,
+    gedung_list,
+    gedung_tambah,
+    gedung_edit,
+    gedung_hapus,
+    jalan_list,
+    jalan_tambah,
+    jalan_edit,
+    jalan_hapus,
+    buku_list,
+    buku_tambah,
+    buku_edit,
+    buku_hapus,
+    buku_rekap,
+    buku_import,
+)
+from .peminjaman import (
+    peminjaman_list,
+    peminjaman_create,
+    pengembalian_list,
+    peminjaman_kembali,
+    reservasi_list,
+    reservasi_tambah,
+    reservasi_batal,
+    ketersediaan,
+)
+from .bhp import (
+    bhp_list,
+    bhp_tambah,
+    bhp_masuk,
+    bhp_keluar,
+    bhp_import,
+    bhp_transaksi,
+    bhp_saldo_bulanan,
+    bhp_barang_riwayat,
+    bhp_restock,
+    bhp_prakiraan,
+    bhp_kartu_stok,
+)
+from .ruangan import (
+    aset_per_ruangan,
+    api_hierarki_aset,
+    ruangan_list,
+    ruangan_tambah,
+    ruangan_edit,
+    ruangan_hapus,
+)
+from .reports import (
+    tanah_cetak_pdf,
+    peralatan_export_excel,
+    peralatan_cetak_pdf,
+    gedung_cetak_pdf,
+    jalan_cetak_pdf,
+    buku_export_excel,
+    buku_cetak_pdf,
+    semua_kib_cetak_pdf,
+    cetak_surat_peminjaman,
+    bhp_transaksi_pdf,
+    bhp_restock_excel,
+    bhp_kartu_stok_excel,
+    cetak_kir,
+    cetak_kir_pdf,
+    cetak_kir_batch,
+)
+from .metrik import (
+    metrics,
+)
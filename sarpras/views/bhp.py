@@ -0,0 +1,422 @@
+
+# =========================================================
+# DJANGO CORE
+# =========================================================
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib import messages
+from django.utils import timezone
+from django.db import transaction
+from django.db.models import Q, Sum
+
+# =========================================================
+# PYTHON STANDARD LIBRARY
+# =========================================================
+import csv
+from io import TextIOWrapper
+from datetime import date
+from time import perf_counter
+
+# =========================================================
+# LOCAL MODELS
+# =========================================================
+from ..models import (
+    BarangHabisPakai,
+    BarangHabisPakaiMasuk,
+    BarangHabisPakaiKeluar,
+)
+from ..kartu_stok import kartu_stok, encode_cursor, decode_cursor
+from ..saldo_bulanan import catat_mutasi, saldo_periode
+from ..prakiraan import prakiraan_bhp
+from .. import metrik
+
+# ===========================================================
+# BARANG HABIS PAKAI (BHP)
+# ===========================================================
+
+def bhp_list(request):
+    q = request.GET.get('q', '')
+
+    data = BarangHabisPakai.objects.all().order_by('nama_barang')
+
+    if q:
+        data = data.filter(
+            Q(nama_barang__icontains=q) |
+            Q(kode_barang__icontains=q)
+        )
+
+    return render(request, 'bhp/list.html', {
+        'data': data,
+        'q': q,
+    })
+
+
+
+def bhp_tambah(request):
+    if request.method == 'POST':
+        stok = int(request.POST.get('stok', 0))
+
+        with transaction.atomic():
+            barang = BarangHabisPakai.objects.create(
+                kode_barang=request.POST['kode_barang'],
+                nama_barang=request.POST['nama_barang'],
+                satuan=request.POST['satuan'],
+                stok=stok,
+                stok_minimum=int(request.POST.get('stok_minimum') or 0)
+            )
+
+            # stok awal dicatat sebagai barang masuk agar ledger tetap
+            # sama dengan stok (lihat command rekonsiliasi_stok_bhp)
+            if stok:
+                tanggal = timezone.localdate()
+                BarangHabisPakaiMasuk.objects.create(
+                    barang=barang,
+                    jumlah=stok,
+                    tanggal=tanggal,
+                    sumber='Stok awal',
+                )
+                catat_mutasi(barang, tanggal, 0, masuk=stok)
+
+        messages.success(
+            request,
+            'Barang habis pakai berhasil ditambahkan'
+        )
+        return redirect('bhp_list')
+
+    return render(request, 'bhp/tambah.html')
+
+
+def bhp_masuk(request):
+    if request.method == 'POST':
+        with transaction.atomic():
+            barang = get_object_or_404(
+                BarangHabisPakai.objects.select_for_update(),
+                id=request.POST['barang']
+            )
+
+            jumlah = int(request.POST['jumlah'])
+            tanggal = timezone.localdate()
+            stok_sebelum = barang.stok
+
+            barang.stok += jumlah
+            barang.save(update_fields=['stok'])
+
+            BarangHabisPakaiMasuk.objects.create(
+                barang=barang,
+                jumlah=jumlah,
+                tanggal=tanggal,
+                sumber=request.POST['sumber'],
+                keterangan=request.POST.get('keterangan', '')
+            )
+
+            catat_mutasi(barang, tanggal, stok_sebelum, masuk=jumlah)
+
+        messages.success(
+            request,
+            'Barang masuk berhasil dicatat'
+        )
+        return redirect('bhp_list')
+
+    return render(request, 'bhp/masuk.html', {
+        'barang': BarangHabisPakai.objects.all()
+    })
+
+
+def bhp_keluar(request):
+    if request.method == 'POST':
+        with transaction.atomic():
+            barang = get_object_or_404(
+                BarangHabisPakai.objects.select_for_update(),
+                id=request.POST['barang']
+            )
+
+            jumlah = int(request.POST['jumlah'])
+
+            if barang.stok < jumlah:
+                messages.error(
+                    request,
+                    f"Stok tidak cukup! Sisa stok: {barang.stok}"
+                )
+                return redirect('bhp_keluar')
+
+            tanggal = timezone.localdate()
+            stok_sebelum = barang.stok
+
+            barang.stok -= jumlah
+            barang.save(update_fields=['stok'])
+
+            BarangHabisPakaiKeluar.objects.create(
+                barang=barang,
+                jumlah=jumlah,
+                tanggal=tanggal,
+                pengguna=request.POST['pengguna'],
+                keperluan=request.POST['keperluan'],
+                keterangan=request.POST.get('keterangan', '')
+            )
+
+            catat_mutasi(barang, tanggal, stok_sebelum, keluar=jumlah)
+
+        messages.success(
+            request,
+            'Barang keluar berhasil dicatat'
+        )
+        return redirect('bhp_list')
+
+    return render(request, 'bhp/keluar.html', {
+        'barang': BarangHabisPakai.objects.all()
+    })
+
+
+#======================================
+#Import Habis Pakai
+#========================================
+def _baris_kosong(nilai):
+    return all(v is None or str(v).strip() == '' for v in nilai)
+
+
+def _simpan_import(kode, nama, stok, satuan):
+    """
+    Simpan satu baris import. Selisih stok lama dan baru dicatat sebagai
+    barang masuk / keluar penyesuaian agar ledger tetap sama dengan stok
+    (lihat command rekonsiliasi_stok_bhp).
+    """
+    with transaction.atomic():
+        barang = (
+            BarangHabisPakai.objects
+            .select_for_update()
+            .filter(kode_barang=kode)
+            .first()
+        )
+        if barang is None:
+            barang = BarangHabisPakai(kode_barang=kode)
+
+        stok_sebelum = barang.stok
+        barang.nama_barang = nama
+        barang.satuan = satuan
+        barang.stok = stok
+        barang.save()
+
+        selisih = stok - stok_sebelum
+        if not selisih:
+            return
+
+        tanggal = timezone.localdate()
+        if selisih > 0:
+            BarangHabisPakaiMasuk.objects.create(
+                barang=barang,
+                jumlah=selisih,
+                tanggal=tanggal,
+                sumber='Import (penyesuaian stok)',
+            )
+            catat_mutasi(barang, tanggal, stok_sebelum, masuk=selisih)
+        else:
+            BarangHabisPakaiKeluar.objects.create(
+                barang=barang,
+                jumlah=-selisih,
+                tanggal=tanggal,
+                pengguna='Import',
+                keperluan='Penyesuaian stok',
+            )
+            catat_mutasi(barang, tanggal, stok_sebelum, keluar=-selisih)
+
+
+def bhp_import(request):
+    if request.method != 'POST':
+        return redirect('bhp_list')
+
+    file = request.FILES.get('file')
+
+    if not file:
+        messages.error(request, 'File belum dipilih')
+        return redirect('bhp_list')
+
+    # baris tanpa kode / nama dilewati; yang tidak kosong dihitung ditolak
+    disimpan = 0
+    ditolak = 0
+    mulai = perf_counter()
+
+    try:
+        # ===============================
+        # IMPORT CSV
+        # ===============================
+        if file.name.endswith('.csv'):
+            csv_file = TextIOWrapper(file.file, encoding='utf-8')
+            reader = csv.DictReader(csv_file)
+
+            for row in reader:
+                if not row.get('kode') or not row.get('nama_barang'):
+                    if not _baris_kosong(row.values()):
+                        ditolak += 1
+                    continue
+
+                try:
+                    stok = int(row.get('stok', 0))
+                except ValueError:
+                    stok = 0
+
+                _simpan_import(row['kode'], row['nama_barang'], stok, row.get('satuan', ''))
+                disimpan += 1
+
+        # ===============================
+        # IMPORT EXCEL
+        # ===============================
+        elif file.name.endswith('.xlsx'):
+            import openpyxl
+
+            wb = openpyxl.load_workbook(file)
+            sheet = wb.active
+
+            for row in sheet.iter_rows(min_row=2, values_only=True):
+                kode, nama, stok, satuan = row
+
+                # Lewati baris kosong
+                if not kode or not nama:
+                    if not _baris_kosong(row):
+                        ditolak += 1
+                    continue
+
+                # Amankan stok
+                try:
+                    stok = int(stok) if stok is not None else 0
+                except ValueError:
+                    stok = 0
+
+                _simpan_import(str(kode), nama, stok, satuan if satuan else '')
+                disimpan += 1
+
+        else:
+            messages.error(request, 'Format file harus CSV atau XLSX')
+            return redirect('bhp_list')
+
+        messages.success(request, 'Import barang habis pakai berhasil')
+
+    except Exception as e:
+        messages.error(request, f'Gagal import: {e}')
+
+    metrik.catat_import('bhp', disimpan, ditolak, perf_counter() - mulai)
+
+    return redirect('bhp_list')
+
+
+#========================================
+# transaksi bhp
+#========================================
+
+def bhp_transaksi(request):
+    masuk = BarangHabisPakaiMasuk.objects.select_related('barang').order_by('-tanggal')
+    keluar = BarangHabisPakaiKeluar.objects.select_related('barang').order_by('-tanggal')
+
+    return render(request, 'bhp/transaksi.html', {
+        'masuk': masuk,
+        'keluar': keluar
+    })
+
+
+
+
+#========================================
+# saldo bulanan bhp (dari snapshot)
+#========================================
+
+def bhp_saldo_bulanan(request):
+    hari_ini = timezone.localdate()
+
+    try:
+        bulan = int(request.GET.get('bulan', hari_ini.month))
+        tahun = int(request.GET.get('tahun', hari_ini.year))
+        periode = date(tahun, bulan, 1)
+    except ValueError:
+        periode = hari_ini.replace(day=1)
+
+    return render(request, 'bhp/saldo_bulanan.html', {
+        'data': saldo_periode(periode),
+        'periode': periode,
+        'bulan_list': range(1, 13),
+    })
+
+
+#riwayat habis pakai ===========
+
+
+def bhp_barang_riwayat(request, barang_id):
+    barang = get_object_or_404(BarangHabisPakai, id=barang_id)
+
+    masuk = BarangHabisPakaiMasuk.objects.filter(
+        barang=barang
+    ).order_by('-tanggal')
+
+    keluar = BarangHabisPakaiKeluar.objects.filter(
+        barang=barang
+    ).order_by('-tanggal')
+
+    total_masuk = masuk.aggregate(
+        total=Sum('jumlah')
+    )['total'] or 0
+
+    total_keluar = keluar.aggregate(
+        total=Sum('jumlah')
+    )['total'] or 0
+
+    context = {
+        'barang': barang,
+        'masuk': masuk,
+        'keluar': keluar,
+        'total_masuk': total_masuk,
+        'total_keluar': total_keluar,
+        'stok_sisa': barang.stok,
+    }
+
+    return render(
+        request,
+        'bhp/riwayat_barang.html',
+        context
+    )
+
+
+#========================================
+# daftar restock bhp (stok <= stok minimum)
+#========================================
+
+async def bhp_restock(request):
+    # perlu_restock + index -> langsung lookup, tanpa hitung ulang
+    data = [
+        b async for b in
+        BarangHabisPakai.objects.filter(perlu_restock=True).order_by('nama_barang')
+    ]
+
+    return render(request, 'bhp/restock.html', {
+        'data': data,
+    })
+
+#========================================
+# prakiraan pemakaian bhp
+#========================================
+
+def bhp_prakiraan(request):
+    return render(request, 'bhp/prakiraan.html', {
+        'data': prakiraan_bhp(),
+    })
+
+
+#========================================
+# kartu stok bhp (saldo berjalan)
+#========================================
+
+KARTU_STOK_PER_HALAMAN = 50
+
+
+def bhp_kartu_stok(request, barang_id):
+    barang = get_object_or_404(BarangHabisPakai, id=barang_id)
+
+    setelah = decode_cursor(request.GET.get('setelah'))
+
+    # ambil satu baris lebih untuk tahu apakah masih ada halaman berikutnya
+    rows = kartu_stok(barang.id, setelah=setelah, limit=KARTU_STOK_PER_HALAMAN + 1)
+    ada_berikutnya = len(rows) > KARTU_STOK_PER_HALAMAN
+    rows = rows[:KARTU_STOK_PER_HALAMAN]
+
+    return render(request, 'bhp/kartu_stok.html', {
+        'barang': barang,
+        'rows': rows,
+        'cursor_berikutnya': encode_cursor(rows[-1]) if ada_berikutnya else None,
+        'halaman_pertama': setelah is None,
+    })
@@ -0,0 +1,116 @@
+
+# =========================================================
+# DJANGO CORE
+# =========================================================
+from django.shortcuts import render
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+
+# =========================================================
+# PYTHON STANDARD LIBRARY
+# =========================================================
+import json
+
+# =========================================================
+# LOCAL MODELS
+# =========================================================
+from ..models import (
+    Tanah,
+    PeralatanMesin,
+    Gedung,
+    Jalan,
+    Buku,
+    Peminjaman,
+    BarangHabisPakai,
+)
+
+# =========================================================
+# DASHBOARD
+# =========================================================
+MODEL_ASET = (Tanah, PeralatanMesin, Gedung, Jalan, Buku)
+
+
+def _total_aset():
+    # satu COUNT(*) atas UNION ALL pk kelima tabel KIB, bukan lima query
+    pertama, *lainnya = (
+        model.objects.order_by().values('pk') for model in MODEL_ASET
+    )
+    return pertama.union(*lainnya, all=True).count()
+
+
+def dashboard(request):
+    # =====================================================
+    # QUERY DIGABUNG
+    # =====================================================
+    # View sync: ORM async Django tetap menjalankan query satu per satu
+    # di thread DB request, jadi asyncio.gather tidak membuatnya paralel.
+    # Yang dikurangi adalah jumlah round-trip: total aset satu query,
+    # tiga hitungan BHP satu aggregate, peminjaman aktif ikut aggregate
+    # grafik bulanan.
+    total_aset = _total_aset()
+
+    bhp = BarangHabisPakai.objects.aggregate(
+        total=Count('id'),
+        stok_habis=Count('id', filter=Q(stok=0)),
+        perlu_restock=Count('id', filter=Q(perlu_restock=True)),
+    )
+
+    # GRAFIK PERTUMBUHAN ASET (PER TAHUN)
+    aset_per_tahun = list(
+        PeralatanMesin.objects
+        .values("tahun_perolehan")
+        .annotate(total=Count("id"))
+        .order_by("tahun_perolehan")
+    )
+
+    # GRAFIK PEMINJAMAN (PER BULAN)
+    pinjam_per_bulan = list(
+        Peminjaman.objects
+        .annotate(bulan=TruncMonth("tanggal_pinjam"))
+        .values("bulan")
+        .annotate(
+            total=Count("id"),
+            aktif=Count("id", filter=Q(status='dipinjam')),
+        )
+        .order_by("bulan")
+    )
+    peminjaman_aktif = sum(item["aktif"] for item in pinjam_per_bulan)
+
+    # =====================================================
+    # TOTAL ASET & RINGKASAN
+    # =====================================================
+    total_bhp = bhp['total']
+    stok_habis = bhp['stok_habis']
+    perlu_restock = bhp['perlu_restock']
+
+    labels_aset = [str(item["tahun_perolehan"]) for item in aset_per_tahun]
+    data_aset = [item["total"] for item in aset_per_tahun]
+
+    labels_pinjam = [
+        item["bulan"].strftime("%b %Y")
+        for item in pinjam_per_bulan
+        if item["bulan"]
+    ]
+
+    data_pinjam = [
+        item["total"]
+        for item in pinjam_per_bulan
+        if item["bulan"]
+    ]
+
+    # ======================================================
+    # CONTEXT
+    # ======================================================
+    context = {
+        "total_aset": total_aset,
+        "total_bhp": total_bhp,
+        "peminjaman_aktif": peminjaman_aktif,
+        "stok_habis": stok_habis,
+        "perlu_restock": perlu_restock,
+        "labels_aset": json.dumps(labels_aset),
+        "data_aset": json.dumps(data_aset),
+        "labels_pinjam": json.dumps(labels_pinjam),
+        "data_pinjam": json.dumps(data_pinjam),
+    }
+
+    return render(request, "sarpras/dashboard.html", context)
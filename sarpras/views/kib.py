@@ -0,0 +1,623 @@
+
+# =========================================================
+# DJANGO CORE
+# =========================================================
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib import messages
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.core.paginator import Paginator
+
+# =========================================================
+# PYTHON STANDARD LIBRARY
+# =========================================================
+from time import perf_counter
+
+# =========================================================
+# LOCAL MODELS
+# =========================================================
+from ..models import (
+    Tanah,
+    PeralatanMesin,
+    Gedung,
+    Ruangan,
+    Jalan,
+    Buku,
+    MutasiPeralatan,
+)
+from ..mutasi import pindahkan
+from .. import cache_versi, metrik
+from ..gambar import jadwalkan as jadwalkan_normalisasi_gambar
+from ..total_ruangan import geser_peralatan
+
+# ===============================================================
+# KIB A - TANAH
+# ===============================================================
+def tanah_list(request):
+    # queryset lazy: tidak dieksekusi jika fragmen tabel masih di cache
+    data = Tanah.objects.all().order_by('kode_barang')
+    return render(request, 'sarpras/tanah.html', {
+        'data': data,
+        'versi': cache_versi.versi(Tanah),
+    })
+
+def tanah_tambah(request):
+    if request.method == "POST":
+        Tanah.objects.create(
+            kode_barang=request.POST.get('kode_barang'),
+            nama=request.POST.get('nama'),
+            luas=float(request.POST.get('luas')),
+            lokasi=request.POST.get('lokasi'),
+            status=request.POST.get('status'),
+            tahun_perolehan=int(request.POST.get('tahun_perolehan')),
+        )
+        return redirect('tanah_list')
+
+    return render(request, 'sarpras/tanah_form.html')
+
+def tanah_edit(request, pk):
+    data = get_object_or_404(Tanah, pk=pk)
+
+    if request.method == "POST":
+        data.kode_barang = request.POST.get('kode_barang')
+        data.nama = request.POST.get('nama')
+        data.luas = float(request.POST.get('luas'))
+        data.lokasi = request.POST.get('lokasi')
+        data.status = request.POST.get('status')
+        data.tahun_perolehan = int(request.POST.get('tahun_perolehan'))
+        data.save()
+
+        return redirect('tanah_list')
+
+    return render(request, 'sarpras/tanah_form.html', {
+        'data': data,
+        'edit': True
+    })
+
+def tanah_hapus(request, pk):
+    tanah = get_object_or_404(Tanah, pk=pk)
+    tanah.delete()
+    return redirect('tanah_list')
+
+# ===================================================================
+# KIB B - PERALATAN & MESIN
+# ===================================================================
+
+def peralatan_list(request):
+    query = request.GET.get('q', '')
+    gedung_id = request.GET.get('gedung')
+
+    qs = PeralatanMesin.objects.select_related('ruangan__gedung').all().order_by('-id')
+
+    # 🔎 Filter pencarian
+    if query:
+        qs = qs.filter(
+            Q(kode_barang__icontains=query) |
+            Q(nama__icontains=query) |
+            Q(kondisi__icontains=query)
+        )
+
+    # 🏢 Filter berdasarkan gedung
+    if gedung_id:
+        qs = qs.filter(ruangan__gedung_id=gedung_id)
+
+    paginator = Paginator(qs, 5)
+    page_number = request.GET.get('page')
+    peralatan = paginator.get_page(page_number)
+
+    return render(request, 'sarpras/peralatan.html', {
+        'data': peralatan,
+        'peralatan': peralatan,
+        'query': query,
+        'gedungs': Gedung.objects.all(),
+        'selected_gedung': gedung_id,
+    })
+
+
+def peralatan_tambah(request):
+    gedungs = Gedung.objects.all()
+    ruangans = Ruangan.objects.all()
+
+    if request.method == 'POST':
+        ruangan_id = request.POST.get('ruangan')
+
+        with transaction.atomic():
+            data = PeralatanMesin.objects.create(
+                kode_barang=request.POST.get('kode_barang'),
+                nama=request.POST.get('nama'),
+                jumlah=int(request.POST.get('jumlah') or 0),
+                kondisi=request.POST.get('kondisi'),
+                tahun_perolehan=request.POST.get('tahun_perolehan'),
+                gambar=request.FILES.get('gambar'),
+                ruangan_id=ruangan_id if ruangan_id else None
+            )
+            geser_peralatan(baru=(data.ruangan_id, data.jumlah))
+            jadwalkan_normalisasi_gambar(data)
+
+        return redirect('peralatan_list')
+
+    return render(request, 'sarpras/peralatan_form.html', {
+        'gedungs': gedungs,
+        'ruangans': ruangans
+    })
+
+
+def peralatan_edit(request, id):
+    data = get_object_or_404(PeralatanMesin, id=id)
+
+    if request.method == 'POST':
+        lama = (data.ruangan_id, data.jumlah)
+
+        data.kode_barang = request.POST.get('kode_barang')
+        data.nama = request.POST.get('nama')
+        data.jumlah = int(request.POST.get('jumlah') or 0)
+        data.kondisi = request.POST.get('kondisi')
+        data.tahun_perolehan = request.POST.get('tahun_perolehan')
+
+        gambar_baru = request.FILES.get('gambar')
+        if gambar_baru:
+            data.gambar = gambar_baru
+
+        ruangan_id = request.POST.get('ruangan')
+        ruangan_id = int(ruangan_id) if ruangan_id else None
+
+        with transaction.atomic():
+            # pindah ruangan lewat form edit ikut tercatat sebagai mutasi
+            if ruangan_id != data.ruangan_id:
+                MutasiPeralatan.objects.create(
+                    peralatan=data,
+                    dari_ruangan_id=data.ruangan_id,
+                    ke_ruangan_id=ruangan_id,
+                    keterangan='Edit data peralatan'
+                )
+                data.ruangan_id = ruangan_id
+
+            data.save()
+            geser_peralatan(lama, (data.ruangan_id, data.jumlah))
+
+            if gambar_baru:
+                jadwalkan_normalisasi_gambar(data)
+
+        return redirect('peralatan_list')
+
+    return render(
+        request,
+        'sarpras/peralatan_form.html',
+        {'data': data,
+         'edit': True,
+         'gedungs': Gedung.objects.all(),
+         'ruangans': Ruangan.objects.all()
+         })
+
+def peralatan_hapus(request, id):
+    data = get_object_or_404(PeralatanMesin, id=id)
+
+    with transaction.atomic():
+        geser_peralatan(lama=(data.ruangan_id, data.jumlah))
+        data.delete()
+
+    return redirect('peralatan_list')
+
+
+#Mutasi peralatan (pindah ruangan massal)========================
+
+MUTASI_PER_HALAMAN = 50
+
+
+def peralatan_mutasi(request):
+    if request.method == 'POST':
+        ids = request.POST.getlist('peralatan')
+        ke_ruangan = get_object_or_404(Ruangan, id=request.POST.get('ke_ruangan'))
+
+        if not ids:
+            messages.error(request, 'Pilih minimal satu peralatan')
+            return redirect('peralatan_mutasi')
+
+        jumlah = pindahkan(ids, ke_ruangan.id, request.POST.get('keterangan', ''))
+
+        messages.success(
+            request,
+            f'{jumlah} peralatan dipindahkan ke {ke_ruangan}'
+        )
+        return redirect('peralatan_mutasi')
+
+    query = request.GET.get('q', '')
+    ruangan_id = request.GET.get('ruangan')
+
+    qs = PeralatanMesin.objects.select_related('ruangan__gedung').order_by('nama')
+
+    if query:
+        qs = qs.filter(
+            Q(kode_barang__icontains=query) |
+            Q(nama__icontains=query)
+        )
+
+    if ruangan_id == 'kosong':
+        qs = qs.filter(ruangan__isnull=True)
+    elif ruangan_id:
+        qs = qs.filter(ruangan_id=ruangan_id)
+
+    # satu halaman saja yang di-render; pilih ruangan asal / cari untuk
+    # mempersempit daftar sebelum memindahkan
+    paginator = Paginator(qs, MUTASI_PER_HALAMAN)
+    halaman = paginator.get_page(request.GET.get('page'))
+
+    return render(request, 'sarpras/peralatan_mutasi.html', {
+        'data': halaman,
+        'query': query,
+        'selected_ruangan': ruangan_id,
+        'ruangans': Ruangan.objects.select_related('gedung').order_by('gedung__nama', 'nama'),
+    })
+
+
+def peralatan_riwayat_mutasi(request, id):
+    peralatan = get_object_or_404(PeralatanMesin.objects.select_related('ruangan__gedung'), id=id)
+
+    # memakai index (peralatan, tanggal)
+    riwayat = (
+        MutasiPeralatan.objects
+        .filter(peralatan=peralatan)
+        .select_related('dari_ruangan__gedung', 'ke_ruangan__gedung')
+        .order_by('-tanggal')
+    )
+
+    return render(request, 'sarpras/peralatan_riwayat_mutasi.html', {
+        'peralatan': peralatan,
+        'riwayat': riwayat,
+    })
+
+
+#Import peralatan========================
+
+def peralatan_import(request):
+    if request.method == 'POST' and request.FILES.get('file'):
+        import openpyxl
+
+        file = request.FILES['file']
+        wb = openpyxl.load_workbook(file)
+        sheet = wb.active
+
+        berhasil = 0
+        gagal = 0
+        mulai = perf_counter()
+
+        for row in sheet.iter_rows(min_row=2, values_only=True):
+            try:
+                if not row[0]:
+                    continue
+
+                PeralatanMesin.objects.create(
+                    kode_barang=str(row[0]).strip(),
+                    nama=str(row[1]).strip(),
+                    jumlah=int(float(row[2])) if row[2] else 0,                                    
+                    kondisi=str(row[4]).strip(),
+                    tahun_perolehan=int(float(row[4])) if row[4] else 0,
+                )
+                berhasil += 1
+
+            except Exception:
+                gagal += 1
+                continue
+
+        metrik.catat_import('peralatan', berhasil, gagal, perf_counter() - mulai)
+
+        messages.success(
+            request,
+            f'Import selesai. Data gagal: {gagal}'
+        )
+        return redirect('peralatan_list')
+
+    return render(request, 'sarpras/peralatan_import.html')
+
+
+# Rekap KIB B ==========================================
+
+async def _rekap_peralatan():
+    data = [
+        row async for row in
+        PeralatanMesin.objects
+        .values('nama')
+        .annotate(total=Sum('jumlah'))
+        .order_by('nama')
+    ]
+
+    total_semua = (
+        (await PeralatanMesin.objects.aaggregate(total=Sum('jumlah')))
+        ['total'] or 0
+    )
+
+    return data, total_semua
+
+
+async def peralatan_rekap(request):
+    data, total_semua = await cache_versi.aambil(
+        'peralatan_rekap', [PeralatanMesin], _rekap_peralatan
+    )
+
+    return render(
+        request,
+        'sarpras/peralatan_rekap.html',
+        {
+            'data': data,
+            'total_semua': total_semua
+        }
+    )
+
+# =========================
+# KIB C - GEDUNG & BANGUNAN
+# =========================
+def gedung_list(request):
+    data = Gedung.objects.all().order_by('kode_barang')
+    return render(request, 'sarpras/gedung.html', {
+        'data': data,
+        'versi': cache_versi.versi(Gedung),
+    })
+
+def gedung_tambah(request):
+    if request.method == 'POST':
+        Gedung.objects.create(
+            kode_barang=request.POST.get('kode_barang'),
+            nama=request.POST.get('nama'),
+            lokasi=request.POST.get('lokasi'),
+            luas=request.POST.get('luas'),
+            kondisi=request.POST.get('kondisi'),
+            tahun_perolehan=request.POST.get('tahun_perolehan')
+        )
+        return redirect('/gedung/')
+
+    return render(request, 'sarpras/gedung_form.html')
+
+
+
+def gedung_edit(request, pk):
+    gedung = get_object_or_404(Gedung, pk=pk)
+
+    if request.method == 'POST':
+        gedung.kode_barang = request.POST.get('kode_barang')
+        gedung.nama = request.POST.get('nama')
+        gedung.lokasi = request.POST.get('lokasi')
+        gedung.luas = request.POST.get('luas')
+        gedung.kondisi = request.POST.get('kondisi')
+        gedung.tahun_perolehan = request.POST.get('tahun_perolehan')
+        gedung.save()
+        return redirect('gedung_list')
+
+    return render(request, 'sarpras/gedung_form.html', {'gedung': gedung})
+
+def gedung_hapus(request, pk):
+    gedung = get_object_or_404(Gedung, pk=pk)
+    gedung.delete()
+    return redirect('gedung_list')
+
+
+# =====================
+# KIB D - JALAN / IRIGASI / JARINGAN
+# =====================
+def jalan_list(request):
+    data = Jalan.objects.all().order_by('kode_barang')
+    return render(request, 'sarpras/jalan.html', {
+        'data': data,
+        'versi': cache_versi.versi(Jalan),
+    })
+
+def jalan_tambah(request):
+    if request.method == 'POST':
+        Jalan.objects.create(
+            kode_barang=request.POST.get('kode_barang'),
+            nama=request.POST.get('nama'),
+            panjang=request.POST.get('panjang'),
+            lokasi=request.POST.get('lokasi'),
+            kondisi=request.POST.get('kondisi'),
+            tahun_perolehan=request.POST.get('tahun_perolehan')
+        )
+        return redirect('/jalan/')
+
+    return render(request, 'sarpras/jalan_form.html')
+
+def jalan_edit(request, pk):
+    jalan = get_object_or_404(Jalan, pk=pk)
+
+    if request.method == 'POST':
+        jalan.kode_barang = request.POST.get('kode_barang')
+        jalan.nama = request.POST.get('nama')
+        jalan.panjang = request.POST.get('panjang')
+        jalan.lokasi = request.POST.get('lokasi')
+        jalan.kondisi = request.POST.get('kondisi')
+        jalan.tahun_perolehan = request.POST.get('tahun_perolehan')
+        jalan.save()
+        return redirect('jalan_list')
+
+    return render(request, 'sarpras/jalan_form.html', {'jalan': jalan})
+
+def jalan_hapus(request, pk):
+    jalan = get_object_or_404(Jalan, pk=pk)
+    jalan.delete()
+    return redirect('jalan_list')
+
+# ==============================================================================
+# KIB E - BUKU
+# ==============================================================================
+
+def buku_list(request):
+    query = request.GET.get('q', '')
+
+    buku_qs = Buku.objects.all().order_by('-id')
+
+    if query:
+        buku_qs = buku_qs.filter(
+            Q(judul__icontains=query) |
+            Q(kode_barang__icontains=query) |
+            Q(pengarang__icontains=query)
+        )
+
+    paginator = Paginator(buku_qs, 10)  # ⬅️ 10 buku per halaman
+    page_number = request.GET.get('page')
+    buku = paginator.get_page(page_number)
+
+    context = {
+        'buku': buku,
+        'query': query,
+    }
+    return render(request, 'sarpras/buku.html', context)
+
+def buku_tambah(request):
+    if request.method == 'POST':
+        buku = Buku.objects.create(
+            kode_barang=request.POST.get('kode_barang'),
+            judul=request.POST.get('judul'),
+            pengarang=request.POST.get('pengarang'),
+            jumlah=request.POST.get('jumlah'),
+            kondisi=request.POST.get('kondisi'),
+            tahun_terbit=request.POST.get('tahun_terbit'),
+            gambar=request.FILES.get('gambar')
+        )
+        jadwalkan_normalisasi_gambar(buku)
+        return redirect('/buku/')
+
+    return render(request, 'sarpras/buku_form.html')
+
+def buku_edit(request, pk):
+    buku = get_object_or_404(Buku, pk=pk)
+
+    if request.method == 'POST':
+        buku.kode_barang = request.POST.get('kode_barang')
+        buku.judul = request.POST.get('judul')
+        buku.pengarang = request.POST.get('pengarang')
+        buku.jumlah = request.POST.get('jumlah')
+        buku.kondisi = request.POST.get('kondisi')
+        buku.tahun_terbit = request.POST.get('tahun_terbit')
+
+        gambar_baru = request.FILES.get('gambar')
+        if gambar_baru:
+            buku.gambar = gambar_baru
+
+        buku.save()
+
+        if gambar_baru:
+            jadwalkan_normalisasi_gambar(buku)
+        return redirect('buku_list')
+
+    return render(request, 'sarpras/buku_form.html', {
+        'buku': buku,
+        'edit': True
+        })
+
+
+def buku_hapus(request, pk):
+    buku = get_object_or_404(Buku, pk=pk)
+    buku.delete()
+    return redirect('buku_list')
+
+
+# KIB E - REKAP BUKU ================================================================
+
+async def _rekap_buku(keyword):
+    buku_qs = Buku.objects.all()
+
+    if keyword:
+        buku_qs = buku_qs.filter(judul__icontains=keyword)
+
+    # ======================
+    # RINGKASAN
+    # ======================
+    total_judul = await buku_qs.values('judul').distinct().acount()
+    total_eksemplar = (await buku_qs.aaggregate(
+        total=Sum('jumlah')
+    ))['total'] or 0
+
+    # ======================
+    # REKAP KONDISI
+    # ======================
+    rekap_kondisi = [
+        row async for row in
+        buku_qs
+        .values('kondisi')
+        .annotate(total=Sum('jumlah'))
+        .order_by('kondisi')
+    ]
+
+    # ======================
+    # REKAP PER JUDUL
+    # ======================
+    rekap_judul = [
+        row async for row in
+        buku_qs
+        .values('judul')
+        .annotate(total=Sum('jumlah'))
+        .order_by('-total')
+    ]
+
+    return total_judul, total_eksemplar, rekap_kondisi, rekap_judul
+
+
+async def buku_rekap(request):
+    # ======================
+    # AMBIL KEYWORD
+    # ======================
+    keyword = request.GET.get('q', '').strip()
+
+    # hasil rekap di-cache per keyword sampai tabel Buku berubah
+    total_judul, total_eksemplar, rekap_kondisi, rekap_judul = await cache_versi.aambil(
+        'buku_rekap', [Buku], lambda: _rekap_buku(keyword), keyword=keyword
+    )
+
+    # ======================
+    # PAGINATION (SEARCH-AWARE)
+    # ======================
+    paginator = Paginator(rekap_judul, 10)  # 10 judul / halaman
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+
+    context = {
+        'total_judul': total_judul,
+        'total_eksemplar': total_eksemplar,
+        'rekap_kondisi': rekap_kondisi,
+        'page_obj': page_obj,
+        'keyword': keyword,
+    }
+
+    return render(request, 'sarpras/buku_rekap.html', context)
+
+# ======================
+# Inport Buku Exel
+# ======================
+def buku_import(request):
+    if request.method == 'POST' and request.FILES.get('file'):
+        import openpyxl
+
+        file = request.FILES['file']
+        wb = openpyxl.load_workbook(file)
+        sheet = wb.active
+
+        berhasil = 0
+        gagal = 0
+        mulai = perf_counter()
+
+        for row in sheet.iter_rows(min_row=2, values_only=True):
+            try:
+                if not row[0]:
+                    continue
+
+                Buku.objects.create(
+                    kode_barang=str(row[0]).strip(),
+                    judul=str(row[1]).strip(),
+                    pengarang=str(row[2]).strip(),
+                    jumlah=int(float(row[3])) if row[3] else 0,
+                    kondisi=str(row[4]).strip(),
+                    tahun_terbit=int(float(row[5])) if row[5] else 0,
+                )
+                berhasil += 1
+
+            except Exception as e:
+                gagal += 1
+                continue
+
+        metrik.catat_import('buku', berhasil, gagal, perf_counter() - mulai)
+
+        messages.success(
+            request,
+            f'Import selesai. Data gagal: {gagal}'
+        )
+        return redirect('buku_list')
+
+    return render(request, 'sarpras/buku_import.html')
@@ -0,0 +1,34 @@
+# =========================================================
+# DJANGO CORE
+# =========================================================
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+
+# =========================================================
+# PYTHON STANDARD LIBRARY
+# =========================================================
+import hmac
+
+# =========================================================
+# LOCAL
+# =========================================================
+from .. import metrik
+
+# =========================================================
+# ENDPOINT PROMETHEUS
+# =========================================================
+# Tanpa METRIK_TOKEN endpoint hanya terbuka saat DEBUG; di produksi
+# metrik (trafik per view, volume import) tidak boleh publik.
+@require_GET
+def metrics(request):
+    token = settings.METRIK_TOKEN
+    if token:
+        dikirim = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(dikirim, f'Bearer {token}'):
+            return HttpResponse(status=401)
+    elif not settings.DEBUG:
+        raise Http404
+
+    isi, content_type = metrik.ekspor()
+    return HttpResponse(isi, content_type=content_type)
@@ -0,0 +1,262 @@
+
+# =========================================================
+# DJANGO CORE
+# =========================================================
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib import messages
+from django.utils import timezone
+from django.db import transaction
+from django.views.decorators.http import require_POST
+
+# =========================================================
+# PYTHON STANDARD LIBRARY
+# =========================================================
+from datetime import date
+
+# =========================================================
+# LOCAL MODELS
+# =========================================================
+from ..models import PeralatanMesin, Peminjaman, Reservasi
+from ..total_ruangan import ubah_total
+from ..ketersediaan import (
+    katalog_pada_tanggal,
+    katalog_rentang,
+    sisa_untuk_rentang,
+)
+
+# =====================================================
+# LIST PEMINJAMAN
+# =====================================================
+async def peminjaman_list(request):
+    data = [
+        p async for p in
+        Peminjaman.objects.select_related('barang').order_by('-tanggal_pinjam')
+    ]
+    return render(request, 'peminjaman/list.html', {'data': data})
+
+
+# =====================================================
+# TAMBAH PEMINJAMAN (KURANGI STOK SEKALI SAJA)
+# =====================================================
+def peminjaman_create(request):
+    if request.method == 'POST':
+        def gagal(error):
+            return render(request, 'peminjaman/form.html', {
+                'barang': PeralatanMesin.objects.all(),
+                'error': error
+            })
+
+        hari_ini = timezone.localdate()
+        kembali = _parse_tanggal(request.POST.get('tanggal_kembali'))
+
+        try:
+            jumlah = int(request.POST.get('jumlah_pinjam', 0))
+        except ValueError:
+            jumlah = 0
+
+        # VALIDASI
+        if jumlah <= 0:
+            return gagal('Jumlah pinjam harus lebih dari 0')
+
+        if kembali and kembali < hari_ini:
+            return gagal('Tanggal kembali tidak boleh sebelum hari ini')
+
+        with transaction.atomic():
+            barang = get_object_or_404(
+                PeralatanMesin.objects.select_for_update(),
+                id=request.POST.get('barang')
+            )
+
+            # unit yang sudah direservasi orang lain selama masa pinjam
+            # tidak boleh ikut dipinjam (tanpa tanggal kembali = tanpa batas)
+            sisa = min(
+                barang.jumlah,
+                sisa_untuk_rentang(barang, hari_ini, kembali or date.max),
+            )
+            if jumlah > sisa:
+                return gagal(f'Stok tidak cukup. Sisa {max(sisa, 0)}')
+
+            # 🔥 SATU-SATUNYA TEMPAT KURANGI STOK
+            barang.jumlah = barang.jumlah - jumlah
+            barang.save(update_fields=['jumlah'])
+            ubah_total(barang.ruangan_id, unit=-jumlah)
+
+            # CATAT PEMINJAMAN (TIDAK MENGUBAH STOK)
+            Peminjaman.objects.create(
+                barang=barang,
+                peminjam=request.POST['peminjam'],
+                jumlah_pinjam=jumlah,
+                tanggal_kembali=kembali,
+                status='dipinjam'
+            )
+
+        return redirect('peminjaman_list')
+
+    return render(request, 'peminjaman/form.html', {
+        'barang': PeralatanMesin.objects.all()
+    })
+
+
+# =====================================================
+# LIST BARANG YANG MASIH DIPINJAM
+# =====================================================
+async def pengembalian_list(request):
+    data = [
+        p async for p in
+        Peminjaman.objects
+        .select_related('barang')
+        .filter(status='dipinjam')
+        .order_by('-tanggal_pinjam')
+    ]
+    return render(request, 'peminjaman/pengembalian_list.html', {
+        'data': data
+    })
+
+
+# =====================================================
+# KONFIRMASI PENGEMBALIAN (TAMBAH STOK SEKALI SAJA)
+# =====================================================
+def peminjaman_kembali(request, id):
+    with transaction.atomic():
+        pinjam = get_object_or_404(
+            Peminjaman.objects.select_for_update(),
+            id=id
+        )
+
+        # CEGAH KLIK GANDA
+        if pinjam.status == 'kembali':
+            return redirect('pengembalian_list')
+
+        barang = pinjam.barang
+
+        # 🔥 SATU-SATUNYA TEMPAT TAMBAH STOK
+        barang.jumlah = barang.jumlah + pinjam.jumlah_pinjam
+        barang.save(update_fields=['jumlah'])
+        ubah_total(barang.ruangan_id, unit=pinjam.jumlah_pinjam)
+
+        pinjam.status = 'kembali'
+        pinjam.tanggal_kembali = timezone.now().date()
+        pinjam.save(update_fields=['status', 'tanggal_kembali'])
+
+    return redirect('pengembalian_list')
+
+# =====================================================
+# RESERVASI PERALATAN (TANGGAL MENDATANG)
+# =====================================================
+def _parse_tanggal(value, default=None):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return default
+
+
+async def reservasi_list(request):
+    data = [
+        r async for r in
+        Reservasi.objects
+        .select_related('barang')
+        .filter(status='aktif', tanggal_selesai__gte=timezone.now().date())
+        .order_by('tanggal_mulai')
+    ]
+    return render(request, 'reservasi/list.html', {'data': data})
+
+
+def reservasi_tambah(request):
+    if request.method == 'POST':
+        mulai = _parse_tanggal(request.POST.get('tanggal_mulai'))
+        selesai = _parse_tanggal(request.POST.get('tanggal_selesai'))
+
+        pemesan = request.POST.get('pemesan', '').strip()
+
+        try:
+            barang_id = int(request.POST.get('barang', ''))
+        except ValueError:
+            barang_id = None
+
+        try:
+            jumlah = int(request.POST.get('jumlah', 0))
+        except ValueError:
+            jumlah = 0
+
+        error = None
+        if barang_id is None:
+            error = 'Peralatan wajib dipilih'
+        elif not pemesan:
+            error = 'Nama pemesan wajib diisi'
+        elif not mulai or not selesai:
+            error = 'Tanggal mulai dan selesai wajib diisi'
+        elif selesai < mulai:
+            error = 'Tanggal selesai tidak boleh sebelum tanggal mulai'
+        elif jumlah <= 0:
+            error = 'Jumlah reservasi harus lebih dari 0'
+
+        if not error:
+            with transaction.atomic():
+                # kunci baris barang agar dua reservasi bersamaan tidak lolos
+                barang = get_object_or_404(
+                    PeralatanMesin.objects.select_for_update(),
+                    id=barang_id
+                )
+
+                sisa = sisa_untuk_rentang(barang, mulai, selesai)
+                if jumlah > sisa:
+                    error = f'Stok tidak cukup pada rentang tersebut. Sisa {max(sisa, 0)}'
+                else:
+                    Reservasi.objects.create(
+                        barang=barang,
+                        pemesan=pemesan,
+                        keperluan=request.POST.get('keperluan', ''),
+                        jumlah=jumlah,
+                        tanggal_mulai=mulai,
+                        tanggal_selesai=selesai,
+                    )
+
+        if not error:
+            messages.success(request, 'Reservasi berhasil disimpan')
+            return redirect('reservasi_list')
+
+        return render(request, 'reservasi/form.html', {
+            'barang': PeralatanMesin.objects.all().order_by('nama'),
+            'error': error,
+        })
+
+    return render(request, 'reservasi/form.html', {
+        'barang': PeralatanMesin.objects.all().order_by('nama')
+    })
+
+
+@require_POST
+def reservasi_batal(request, id):
+    reservasi = get_object_or_404(Reservasi, id=id)
+    reservasi.status = 'batal'
+    reservasi.save(update_fields=['status'])
+    messages.success(request, 'Reservasi dibatalkan')
+    return redirect('reservasi_list')
+
+
+# =====================================================
+# KETERSEDIAAN SELURUH KATALOG (SATU QUERY)
+# =====================================================
+def ketersediaan(request):
+    hari_ini = timezone.now().date()
+    mulai = _parse_tanggal(request.GET.get('mulai'), hari_ini)
+    selesai = _parse_tanggal(request.GET.get('selesai'), mulai)
+
+    if selesai < mulai:
+        selesai = mulai
+
+    if mulai == selesai:
+        data = katalog_pada_tanggal(mulai)
+    else:
+        data = katalog_rentang(mulai, selesai)
+
+    hanya_tersedia = request.GET.get('tersedia') == '1'
+    if hanya_tersedia:
+        data = data.filter(tersedia__gt=0)
+
+    return render(request, 'reservasi/ketersediaan.html', {
+        'data': data.order_by('nama'),
+        'mulai': mulai,
+        'selesai': selesai,
+        'hanya_tersedia': hanya_tersedia,
+    })
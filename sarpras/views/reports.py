@@ -0,0 +1,746 @@
+
+# =========================================================
+# CETAK PDF & EXPORT EXCEL
+# =========================================================
+# xhtml2pdf (reportlab, html5lib, pyhanko, pypdf), openpyxl dan
+# qrcode di-import di dalam view yang memakainya, bukan di atas
+# modul. Worker yang hanya melayani halaman daftar tidak perlu
+# memuat library tersebut (lihat scripts/bench_startup.py).
+
+# =========================================================
+# DJANGO CORE
+# =========================================================
+from django.shortcuts import render, redirect, get_object_or_404
+from django.http import HttpResponse
+from django.contrib import messages
+from django.utils import timezone
+from django.db.models import Sum
+from django.template.loader import get_template, render_to_string
+from django.conf import settings
+
+# =========================================================
+# PYTHON STANDARD LIBRARY
+# =========================================================
+import os
+import calendar
+import base64
+from io import BytesIO
+from datetime import date
+
+# =========================================================
+# LOCAL MODELS
+# =========================================================
+from ..models import (
+    Tanah,
+    PeralatanMesin,
+    Gedung,
+    Ruangan,
+    Jalan,
+    Buku,
+    Peminjaman,
+    BarangHabisPakai,
+    BarangHabisPakaiMasuk,
+    BarangHabisPakaiKeluar,
+)
+from ..kartu_stok import kartu_stok
+from ..saldo_bulanan import saldo_periode, bulan_berikutnya
+from .. import kir
+from ..pengukuran import ukur
+
+#================================================================
+#CETAK TANAH PDF
+#================================================================
+
+
+def tanah_cetak_pdf(request):
+    import qrcode
+    from xhtml2pdf import pisa
+
+    data = Tanah.objects.all().order_by('nama')
+
+    total_bidang = data.count()
+    total_luas = data.aggregate(total=Sum('luas'))['total'] or 0
+
+    # ================= LOGO =================
+    logo_path = os.path.join(
+        settings.BASE_DIR,
+        'sarpras',
+        'static',
+        'sarpras',
+        'logo_sekolah.png'
+    )
+
+    with open(logo_path, "rb") as image_file:
+        logo_base64 = base64.b64encode(image_file.read()).decode()
+
+    # ================= QR CODE =================
+    qr_text = (
+        "DOKUMEN RESMI\n"
+        "Laporan Tanah KIB A\n"
+        f"Tanggal Cetak: {timezone.now().strftime('%d-%m-%Y %H:%M')}\n"
+        "Sumber: Sistem SARPRAS"
+    )
+
+    qr = qrcode.make(qr_text)
+    buffer = BytesIO()
+    qr.save(buffer, format="PNG")
+    qr_base64 = base64.b64encode(buffer.getvalue()).decode()
+
+    context = {
+        'data': data,
+        'tahun': timezone.now().year,
+        'tanggal': timezone.now(),
+        'lokasi': 'Lubuklinggau',
+        'qr_code': qr_base64,
+        'logo_base64': logo_base64,
+        'total_bidang': total_bidang,
+        'total_luas': total_luas,
+    }
+
+    template = get_template("sarpras/tanah_cetak_pdf.html")
+    html = template.render(context)
+
+    response = HttpResponse(content_type='application/pdf')
+    response['Content-Disposition'] = 'inline; filename="laporan_tanah.pdf"'
+
+    with ukur('pdf'):
+        pisa.CreatePDF(html, dest=response)
+
+    return response
+
+#export Peralatan==================================
+
+
+def peralatan_export_excel(request):
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, Alignment
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "KIB B - Peralatan & Mesin"
+
+    # =====================
+    # HEADER
+    # =====================
+    headers = [
+        "No",
+        "Kode Barang",
+        "Nama Peralatan",
+        "Jumlah",
+        "Kondisi",
+        "Tahun Perolehan"
+        
+    ]
+
+    ws.append(headers)
+
+    # Style header
+    for col in range(1, len(headers) + 1):
+        cell = ws.cell(row=1, column=col)
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal="center")
+
+    # =====================
+    # DATA
+    # =====================
+    data = PeralatanMesin.objects.all().order_by('nama')
+
+    for i, peralatan in enumerate(data, start=1):
+        ws.append([
+            i,
+            peralatan.kode_barang,
+            peralatan.nama,
+            peralatan.jumlah,
+            peralatan.kondisi,
+            peralatan.tahun_perolehan,
+           
+        ])
+
+    # =====================
+    # RESPONSE
+    # =====================
+    response = HttpResponse(
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    response["Content-Disposition"] = 'attachment; filename="kib_B_Peralatan.xlsx"'
+
+    wb.save(response)
+    return response
+
+#cetak peralatan pdf =================================
+
+def peralatan_cetak_pdf(request):
+    import qrcode
+    from xhtml2pdf import pisa
+
+    data = PeralatanMesin.objects.all().order_by('nama')
+
+    total_jenis = data.count()
+    total_unit = data.aggregate(total=Sum('jumlah'))['total'] or 0
+
+    # ================= LOGO BASE64 =================
+    logo_path = os.path.join(
+        settings.BASE_DIR,
+        'sarpras',
+        'static',
+        'sarpras',
+        'logo_sekolah.png'
+    )
+
+    with open(logo_path, "rb") as image_file:
+        logo_base64 = base64.b64encode(image_file.read()).decode()
+
+    # ================= QR CODE =================
+    qr_text = (
+        "DOKUMEN RESMI\n"
+        "Laporan Peralatan KIB B\n"
+        f"Tanggal Cetak: {timezone.now().strftime('%d-%m-%Y %H:%M')}\n"
+        "Sumber: Sistem SARPRAS"
+    )
+
+    qr = qrcode.make(qr_text)
+    buffer = BytesIO()
+    qr.save(buffer, format="PNG")
+    qr_base64 = base64.b64encode(buffer.getvalue()).decode()
+
+    context = {
+        "data": data,
+        "logo_base64": logo_base64,
+        "qr_code": qr_base64,
+        "total_jenis": total_jenis,
+        "total_unit": total_unit,
+        "tahun": timezone.now().year,
+        "tanggal": timezone.now(),
+        "lokasi": "Lubuklinggau",
+    }
+
+    template = get_template("sarpras/peralatan_cetak_pdf.html")
+    html = template.render(context)
+
+    response = HttpResponse(content_type='application/pdf')
+    response['Content-Disposition'] = 'inline; filename="laporan_peralatan.pdf"'
+
+    with ukur('pdf'):
+        pisa.CreatePDF(html, dest=response)
+
+    return response
+
+#cetak gedung pdf
+
+def gedung_cetak_pdf(request):
+    import qrcode
+    from xhtml2pdf import pisa
+
+    data = Gedung.objects.all().order_by('nama')
+
+    total_gedung = data.count()
+    total_luas = data.aggregate(total=Sum('luas'))['total'] or 0
+
+    # ================= LOGO BASE64 =================
+    logo_path = os.path.join(
+        settings.BASE_DIR,
+        'sarpras',
+        'static',
+        'sarpras',
+        'logo_sekolah.png'
+    )
+
+    with open(logo_path, "rb") as image_file:
+        logo_base64 = base64.b64encode(image_file.read()).decode()
+
+    # ================= QR CODE =================
+    qr_text = (
+        "DOKUMEN RESMI\n"
+        "Laporan Gedung KIB C\n"
+        f"Tanggal Cetak: {timezone.now().strftime('%d-%m-%Y %H:%M')}\n"
+        "Sumber: Sistem SARPRAS"
+    )
+
+    qr = qrcode.make(qr_text)
+    buffer = BytesIO()
+    qr.save(buffer, format="PNG")
+    qr_base64 = base64.b64encode(buffer.getvalue()).decode()
+
+    context = {
+        'data': data,
+        'tahun': timezone.now().year,
+        'tanggal': timezone.now(),
+        'lokasi': 'Lubuklinggau',
+        'qr_code': qr_base64,
+        'logo_base64': logo_base64,   # 🔥 WAJIB
+        'total_gedung': total_gedung,
+        'total_luas': total_luas,
+    }
+
+    template = get_template("sarpras/gedung_cetak_pdf.html")
+    html = template.render(context)
+
+    response = HttpResponse(content_type='application/pdf')
+    response['Content-Disposition'] = 'inline; filename="laporan_gedung.pdf"'
+
+    with ukur('pdf'):
+        pisa.CreatePDF(html, dest=response)
+
+    return response
+
+#cetak jalan pdf ====================================
+
+
+def jalan_cetak_pdf(request):
+    import qrcode
+    from xhtml2pdf import pisa
+
+    data = Jalan.objects.all().order_by('nama')
+
+    total_jalan = data.count()
+    total_panjang = data.aggregate(total=Sum('panjang'))['total'] or 0
+
+    # ================= LOGO BASE64 =================
+    logo_path = os.path.join(
+        settings.BASE_DIR,
+        'sarpras',
+        'static',
+        'sarpras',
+        'logo_sekolah.png'
+    )
+
+    with open(logo_path, "rb") as image_file:
+        logo_base64 = base64.b64encode(image_file.read()).decode()
+
+    # ================= QR CODE =================
+    qr_text = (
+        "DOKUMEN RESMI\n"
+        "Laporan Jalan KIB D\n"
+        f"Tanggal Cetak: {timezone.now().strftime('%d-%m-%Y %H:%M')}\n"
+        "Sumber: Sistem SARPRAS"
+    )
+
+    qr = qrcode.make(qr_text)
+    buffer = BytesIO()
+    qr.save(buffer, format="PNG")
+    qr_base64 = base64.b64encode(buffer.getvalue()).decode()
+
+    context = {
+        'data': data,
+        'tahun': timezone.now().year,
+        'tanggal': timezone.now(),
+        'lokasi': 'Lubuklinggau',
+        'qr_code': qr_base64,
+        'logo_base64': logo_base64,
+        'total_jalan': total_jalan,
+        'total_panjang': total_panjang,
+    }
+
+    template = get_template("sarpras/jalan_cetak_pdf.html")
+    html = template.render(context)
+
+    response = HttpResponse(content_type='application/pdf')
+    response['Content-Disposition'] = 'inline; filename="laporan_jalan.pdf"'
+
+    with ukur('pdf'):
+        pisa.CreatePDF(html, dest=response)
+
+    return response
+
+#===================================
+#export buku exel
+#====================================
+
+def buku_export_excel(request):
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, Alignment
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "KIB E - Buku"
+
+    # =====================
+    # HEADER
+    # =====================
+    headers = [
+        "No",
+        "Kode Buku",
+        "Judul Buku",
+        "Pengarang",
+        "Jumlah",
+        "Kondisi",
+        "Tahun Terbit"
+    ]
+
+    ws.append(headers)
+
+    # Style header
+    for col in range(1, len(headers) + 1):
+        cell = ws.cell(row=1, column=col)
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal="center")
+
+    # =====================
+    # DATA
+    # =====================
+    data = Buku.objects.all().order_by('judul')
+
+    for i, buku in enumerate(data, start=1):
+        ws.append([
+            i,
+            buku.kode_barang,
+            buku.judul,
+            buku.pengarang,
+            buku.jumlah,
+            buku.kondisi,
+            buku.tahun_terbit,
+        ])
+
+    # =====================
+    # RESPONSE
+    # =====================
+    response = HttpResponse(
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    response["Content-Disposition"] = 'attachment; filename="kib_e_buku.xlsx"'
+
+    wb.save(response)
+    return response
+
+
+# cetak pdf ===============================
+
+def buku_cetak_pdf(request):
+    data = Buku.objects.all().order_by('judul')
+
+    # =========================
+    # AMBIL LOGO DARI STATIC → BASE64 (PALING STABIL)
+    # =========================
+    from django.contrib.staticfiles import finders
+    import base64
+    from io import BytesIO
+    import qrcode
+    from xhtml2pdf import pisa
+
+    logo_path = finders.find('sarpras/logo_sekolah.png')
+
+    if not logo_path:
+        raise Exception("Logo tidak ditemukan di static!")
+
+    with open(logo_path, "rb") as img_file:
+        logo_base64 = base64.b64encode(img_file.read()).decode()
+
+    # =========================
+    # QR CODE
+    # =========================
+    qr_text = (
+        "DOKUMEN RESMI\n"
+        "Laporan Buku KIB E\n"
+        f"Tanggal Cetak: {timezone.now().strftime('%d-%m-%Y %H:%M')}\n"
+        "Sumber: Sistem SARPRAS"
+    )
+
+    qr = qrcode.make(qr_text)
+    buffer = BytesIO()
+    qr.save(buffer, format="PNG")
+    qr_base64 = base64.b64encode(buffer.getvalue()).decode()
+
+    # =========================
+    # RENDER TEMPLATE
+    # =========================
+    template = get_template('sarpras/buku_cetak_pdf.html')
+    html = template.render({
+        'data': data,
+        'tahun': timezone.now().year,
+        'tanggal': timezone.now(),
+        'lokasi': 'Lubuklinggau',
+        'qr_code': qr_base64,
+        'logo_base64': logo_base64,
+    })
+
+    # =========================
+    # GENERATE PDF
+    # =========================
+    response = HttpResponse(content_type='application/pdf')
+    response['Content-Disposition'] = 'inline; filename="laporan_kib_e_buku.pdf"'
+
+    with ukur('pdf'):
+        pisa.CreatePDF(html, dest=response)
+
+    return response
+
+
+    # =========================
+    # RESPONSE PDF
+    # =========================
+    response = HttpResponse(content_type='application/pdf')
+    response['Content-Disposition'] = 'inline; filename="laporan_kib_e_buku.pdf"'
+
+    # 🔥 LINK CALLBACK (INI KUNCI UTAMA)
+    def link_callback(uri, rel):
+        if uri.startswith('file:///'):
+            return uri.replace('file:///', '')
+        return uri
+
+    with ukur('pdf'):
+        pisa.CreatePDF(
+            html,
+            dest=response,
+            link_callback=link_callback
+        )
+
+    return response
+
+#=============================
+# Cetak Semua KIB PDF
+#=============================
+
+def semua_kib_cetak_pdf(request):
+    import qrcode
+    from xhtml2pdf import pisa
+
+    qr = qrcode.make("Laporan Lengkap Aset Sekolah | Sistem SARPRAS")
+    buffer = BytesIO()
+    qr.save(buffer, format="PNG")
+    qr_base64 = base64.b64encode(buffer.getvalue()).decode()
+
+    template = get_template('sarpras/semua_kib_cetak_pdf.html')
+    html = template.render({
+        'tanah': Tanah.objects.all(),
+        'peralatan': PeralatanMesin.objects.all(),
+        'gedung': Gedung.objects.all(),
+        'jalan': Jalan.objects.all(),
+        'buku': Buku.objects.all(),
+        'tanggal': timezone.now(),
+        'qr_code': qr_base64,
+    })
+
+    response = HttpResponse(content_type='application/pdf')
+    response['Content-Disposition'] = 'inline; filename="laporan_semua_kib.pdf"'
+    with ukur('pdf'):
+        pisa.CreatePDF(html, dest=response)
+    return response
+
+
+# =====================================================
+# CETAK SURAT PEMINJAMAN PERALATAN (PDF RESMI)
+# =====================================================
+def cetak_surat_peminjaman(request, id):
+    from xhtml2pdf import pisa
+
+    # 1. Ambil data peminjaman
+    p = get_object_or_404(Peminjaman, id=id)
+
+    # 2. Data statis sekolah (boleh nanti pindah ke setting / model)
+    context = {
+        'p': p,
+        'sekolah': 'Kabupaten XXXXX',
+        'dinas': 'Dinas Pendidikan Kabupaten XXXXX',
+        'nama_sekolah': 'SMKN XXXXX',
+        'alamat_sekolah': 'Jl. XXXXX No. XX',
+        'kepala_sekolah': 'Nama Kepala Sekolah',
+        'nomor_surat': f'421.5/{p.id}/SARPRAS/{p.tanggal_pinjam.year}',
+        'tanggal_hari_ini': timezone.now().date(),
+    }
+
+    # 3. Render HTML → string
+    html = render_to_string(
+        'peminjaman/surat_peminjaman.html',
+        context
+    )
+
+    # 4. Generate PDF
+    response = HttpResponse(content_type='application/pdf')
+    response['Content-Disposition'] = (
+        f'inline; filename="surat_peminjaman_{p.id}.pdf"'
+    )
+
+    with ukur('pdf'):
+        pisa.CreatePDF(html, dest=response)
+
+    return response
+
+
+#========================================
+# laporan transaksi bhp (pdf)
+#========================================
+
+def bhp_transaksi_pdf(request):
+    from xhtml2pdf import pisa
+
+    bulan = request.GET.get('bulan')
+    tahun = request.GET.get('tahun')
+
+    masuk = BarangHabisPakaiMasuk.objects.select_related('barang')
+    keluar = BarangHabisPakaiKeluar.objects.select_related('barang')
+
+    judul_periode = "Semua Periode"
+    saldo = None
+
+    if bulan and tahun:
+        periode = date(int(tahun), int(bulan), 1)
+
+        # filter rentang (bukan __month/__year) agar index tanggal terpakai
+        masuk = masuk.filter(tanggal__gte=periode, tanggal__lt=bulan_berikutnya(periode))
+        keluar = keluar.filter(tanggal__gte=periode, tanggal__lt=bulan_berikutnya(periode))
+
+        # saldo awal/akhir dibaca dari snapshot bulanan
+        saldo = saldo_periode(periode)
+
+        nama_bulan = calendar.month_name[int(bulan)]
+        judul_periode = f"{nama_bulan} {tahun}"
+
+    masuk = masuk.order_by('tanggal')
+    keluar = keluar.order_by('tanggal')
+
+    template = get_template('bhp/transaksi_pdf.html')
+    html = template.render({
+        'masuk': masuk,
+        'keluar': keluar,
+        'saldo': saldo,
+        'tanggal_cetak': date.today(),
+        'periode': judul_periode
+    })
+
+    response = HttpResponse(content_type='application/pdf')
+    response['Content-Disposition'] = 'inline; filename="laporan_bhp.pdf"'
+
+    with ukur('pdf'):
+        pisa.CreatePDF(html, dest=response)
+    return response
+
+
+#========================================
+# export daftar restock bhp
+#========================================
+
+def bhp_restock_excel(request):
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, Alignment
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Daftar Restock BHP"
+
+    headers = ["No", "Kode Barang", "Nama Barang", "Satuan", "Stok", "Stok Minimum", "Kekurangan"]
+    ws.append(headers)
+
+    for col in range(1, len(headers) + 1):
+        cell = ws.cell(row=1, column=col)
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal="center")
+
+    data = BarangHabisPakai.objects.filter(perlu_restock=True).order_by('nama_barang')
+
+    for i, b in enumerate(data, start=1):
+        ws.append([
+            i,
+            b.kode_barang,
+            b.nama_barang,
+            b.satuan,
+            b.stok,
+            b.stok_minimum,
+            b.kekurangan,
+        ])
+
+    response = HttpResponse(
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    response["Content-Disposition"] = 'attachment; filename="daftar_restock_bhp.xlsx"'
+
+    wb.save(response)
+    return response
+
+
+#========================================
+# export kartu stok bhp
+#========================================
+
+def bhp_kartu_stok_excel(request, barang_id):
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, Alignment
+
+    barang = get_object_or_404(BarangHabisPakai, id=barang_id)
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Kartu Stok"
+
+    ws.append([f"Kartu Stok: {barang.kode_barang} - {barang.nama_barang} ({barang.satuan})"])
+    ws.append([])
+
+    headers = ["No", "Tanggal", "Jenis", "Pihak", "Keterangan", "Masuk", "Keluar", "Saldo"]
+    ws.append(headers)
+
+    for col in range(1, len(headers) + 1):
+        cell = ws.cell(row=3, column=col)
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal="center")
+
+    for i, row in enumerate(kartu_stok(barang.id), start=1):
+        ws.append([
+            i,
+            row['tanggal'],
+            row['jenis'].title(),
+            row['pihak'],
+            row['keterangan'],
+            row['masuk'],
+            row['keluar'],
+            row['saldo'],
+        ])
+
+    response = HttpResponse(
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="kartu_stok_{barang.kode_barang}.xlsx"'
+    )
+
+    wb.save(response)
+    return response
+
+
+#============Cetak KIR ==================
+
+def cetak_kir(request, id):
+    ruangan = get_object_or_404(Ruangan.objects.select_related('gedung'), id=id)
+    peralatan = ruangan.peralatan.all().order_by('nama')
+
+    return render(request, 'sarpras/kartu_inventaris_ruangan.html', {
+        'ruangan': ruangan,
+        'peralatan': peralatan,
+        'total_unit': ruangan.total_unit
+    })
+
+
+def cetak_kir_pdf(request, id):
+    get_object_or_404(Ruangan, id=id)
+    data, pdf = kir.kir_pdf(id)
+
+    response = HttpResponse(pdf, content_type='application/pdf')
+    response['Content-Disposition'] = f'inline; filename="{kir.nama_file(data)}"'
+    return response
+
+
+#============Cetak KIR semua ruangan (batch) ==================
+
+def cetak_kir_batch(request):
+    ruangan = Ruangan.objects.all()
+
+    gedung_id = request.GET.get('gedung')
+    if gedung_id:
+        gedung = get_object_or_404(Gedung, id=gedung_id)
+        ruangan = ruangan.filter(gedung=gedung)
+        nama = f"KIR_{gedung.nama}".replace(' ', '_').replace('/', '-')
+    else:
+        nama = "KIR_semua_ruangan"
+
+    hasil = kir.kir_pdf_batch(ruangan)
+
+    if not hasil:
+        messages.error(request, 'Tidak ada ruangan untuk dicetak')
+        return redirect('ruangan_list')
+
+    if request.GET.get('format') == 'zip':
+        response = HttpResponse(kir.gabung_zip(hasil), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="{nama}.zip"'
+        return response
+
+    response = HttpResponse(kir.gabung_pdf(hasil), content_type='application/pdf')
+    response['Content-Disposition'] = f'inline; filename="{nama}.pdf"'
+    return response
@@ -0,0 +1,123 @@
+
+# =========================================================
+# DJANGO CORE
+# =========================================================
+from django.shortcuts import render, redirect, get_object_or_404
+from django.http import HttpResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.views.decorators.http import require_GET
+from django.db import transaction
+from django.db.models import Prefetch
+
+# =========================================================
+# THIRD PARTY LIBRARY
+# =========================================================
+from asgiref.sync import sync_to_async
+
+# =========================================================
+# LOCAL MODELS
+# =========================================================
+from ..models import PeralatanMesin, Gedung, Ruangan
+from ..hierarki import ahierarki_json, hierarki_json
+from ..total_ruangan import lepas_ruangan, pindah_gedung
+
+#ruangan baru=================
+
+
+async def aset_per_ruangan(request):
+    gedungs = [
+        g async for g in Gedung.objects.prefetch_related(
+            Prefetch('ruangan', queryset=Ruangan.objects.order_by('nama')),
+            Prefetch('ruangan__peralatan', queryset=PeralatanMesin.objects.order_by('nama')),
+        ).order_by('nama')
+    ]
+    return render(request, 'sarpras/aset_per_ruangan.html', {
+        'gedungs': gedungs
+    })
+
+
+# JSON hierarki gedung -> ruangan -> peralatan (read-only)
+@require_GET
+async def api_hierarki_aset(request):
+    # ASGI: stream async generator. WSGI (runserver / gunicorn sync):
+    # iterator biasa, karena StreamingHttpResponse di WSGI harus
+    # mengumpulkan seluruh iterator async sebelum mengirim.
+    if isinstance(request, ASGIRequest):
+        versi, cached, stream = await ahierarki_json()
+    else:
+        versi, cached, stream = await sync_to_async(hierarki_json)()
+
+    if cached is not None:
+        response = HttpResponse(cached, content_type='application/json')
+    else:
+        response = StreamingHttpResponse(stream, content_type='application/json')
+
+    response['X-Hierarki-Versi'] = str(versi)
+    return response
+
+
+# =====================
+# RUANGAN
+# =====================
+
+
+async def ruangan_list(request):
+    data = [
+        r async for r in
+        Ruangan.objects.select_related('gedung').all().order_by('gedung__nama', 'nama')
+    ]
+    return render(request, 'sarpras/ruangan.html', {'data': data})
+
+
+def ruangan_tambah(request):
+    if request.method == "POST":
+        Ruangan.objects.create(
+            gedung_id=request.POST.get('gedung'),
+            nama=request.POST.get('nama'),
+            kode=request.POST.get('kode'),
+            penanggung_jawab=request.POST.get('penanggung_jawab'),
+        )
+        return redirect('ruangan_list')
+
+    gedungs = Gedung.objects.all()
+    return render(request, 'sarpras/ruangan_form.html', {
+        'gedungs': gedungs
+    })
+
+
+def ruangan_edit(request, pk):
+    ruangan = get_object_or_404(Ruangan, pk=pk)
+
+    if request.method == "POST":
+        with transaction.atomic():
+            # baca ulang dengan kunci: pindah_gedung memindahkan total
+            # ruangan ini, jadi angkanya harus yang terbaru
+            ruangan = Ruangan.objects.select_for_update().get(pk=pk)
+            gedung_lama_id = ruangan.gedung_id
+
+            ruangan.gedung_id = int(request.POST.get('gedung'))
+            ruangan.nama = request.POST.get('nama')
+            ruangan.kode = request.POST.get('kode')
+            ruangan.penanggung_jawab = request.POST.get('penanggung_jawab')
+
+            ruangan.save()
+            pindah_gedung(ruangan, gedung_lama_id)
+
+        return redirect('ruangan_list')
+
+    gedungs = Gedung.objects.all()
+    return render(request, 'sarpras/ruangan_form.html', {
+        'data': ruangan,
+        'gedungs': gedungs,
+        'edit': True
+    })
+
+
+def ruangan_hapus(request, pk):
+    ruangan = get_object_or_404(Ruangan, pk=pk)
+
+    with transaction.atomic():
+        lepas_ruangan(ruangan)
+        ruangan.delete()
+
+    return redirect('ruangan_list')
@@ -0,0 +1,137 @@
+"""
+Benchmark waktu import saat worker start (python -X importtime).
+
+Setiap putaran menjalankan interpreter baru yang melakukan hal yang
+sama seperti worker gunicorn sebelum melayani request pertama:
+django.setup(), membuat WSGI handler, lalu memuat seluruh URLconf
+(yang meng-import semua modul views).
+
+Library berat (xhtml2pdf/reportlab, openpyxl, qrcode, numpy, pypdf)
+seharusnya hanya di-import di code path cetak / import / prakiraan.
+Jika salah satunya ikut ter-import saat start, script keluar dengan
+status 1, begitu juga jika median waktu import melewati --maks-ms.
+
+Contoh:
+
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py -n 10 --top 25 --maks-ms 400
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+KODE_START = (
+    'import django\n'
+    'django.setup()\n'
+    'from django.core.wsgi import get_wsgi_application\n'
+    'get_wsgi_application()\n'
+    'from django.urls import get_resolver\n'
+    'get_resolver().url_patterns\n'
+)
+
+# paket yang tidak boleh ter-import saat worker start
+DILARANG = (
+    'xhtml2pdf',
+    'reportlab',
+    'pyhanko',
+    'html5lib',
+    'openpyxl',
+    'qrcode',
+    'numpy',
+    'pypdf',
+    'PIL',
+    'lxml',
+)
+
+BARIS = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def jalankan():
+    """Satu interpreter baru: (detik wall time, list (self_us, kumulatif_us, level, modul))."""
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+    mulai = time.perf_counter()
+    proses = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', KODE_START],
+        cwd=BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    durasi = time.perf_counter() - mulai
+
+    if proses.returncode != 0:
+        sys.stderr.write(proses.stderr)
+        raise SystemExit(proses.returncode)
+
+    modul = []
+    for baris in proses.stderr.splitlines():
+        cocok = BARIS.match(baris)
+        if cocok:
+            modul.append((
+                int(cocok.group(1)),
+                int(cocok.group(2)),
+                len(cocok.group(3)) // 2,
+                cocok.group(4),
+            ))
+    return durasi, modul
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', type=int, default=5, help='jumlah putaran')
+    parser.add_argument('--top', type=int, default=15, help='jumlah modul terberat yang ditampilkan')
+    parser.add_argument('--maks-ms', type=float, help='gagal jika median total import melebihi ini')
+    args = parser.parse_args()
+
+    total_ms = []
+    wall_ms = []
+    modul = []
+    for _ in range(args.n):
+        durasi, modul = jalankan()
+        wall_ms.append(durasi * 1000)
+        total_ms.append(sum(m[0] for m in modul) / 1000)
+
+    median = statistics.median(total_ms)
+    print(f'{args.n} putaran, {len(modul)} modul di-import')
+    print(f'total import  : median {median:.1f} ms (min {min(total_ms):.1f}, maks {max(total_ms):.1f})')
+    print(f'wall time     : median {statistics.median(wall_ms):.1f} ms')
+
+    # modul tingkat atas (level 0) dari putaran terakhir, urut kumulatif
+    print()
+    print(f'{"kumulatif (ms)":>15}{"sendiri (ms)":>14}  modul')
+    for self_us, kumulatif_us, _, nama in sorted(
+        (m for m in modul if m[2] == 0), key=lambda m: m[1], reverse=True
+    )[:args.top]:
+        print(f'{kumulatif_us / 1000:>15.1f}{self_us / 1000:>14.1f}  {nama}')
+
+    gagal = False
+
+    berat = sorted({
+        m[3] for m in modul if m[3].split('.')[0] in DILARANG
+    })
+    if berat:
+        gagal = True
+        akar = sorted({nama.split('.')[0] for nama in berat})
+        print()
+        print(f'GAGAL: library berat ter-import saat start: {", ".join(akar)}')
+
+    if args.maks_ms is not None and median > args.maks_ms:
+        gagal = True
+        print()
+        print(f'GAGAL: median {median:.1f} ms > batas {args.maks_ms:.1f} ms')
+
+    if gagal:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
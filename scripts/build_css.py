@@ -0,0 +1,296 @@
+"""
+Bangun subset CSS Bootstrap dan Bootstrap Icons yang dipakai base.html.
+
+bootstrap.min.css dan bootstrap-icons.min.css di sarpras/static/sarpras/vendor
+disalin apa adanya dari rilis resminya; halaman memuat versi
+*.subset.min.css hasil script ini. Semua kata di template, kode Python
+(attrs widget form) dan JS aplikasi dikumpulkan, lalu setiap selector
+yang memakai class / atribut yang tidak pernah muncul dibuang, mirip
+PurgeCSS. :root, @font-face dan @keyframes yang masih dirujuk tetap ada.
+
+Class yang dibentuk saat render (mis. "alert-{{ message.tags }}") tidak
+terlihat sebagai kata utuh, daftarkan di SAFELIST.
+
+Jalankan ulang setiap kali template menambah class Bootstrap / ikon baru,
+lalu commit hasilnya. --cek gagal (exit 1) jika subset sudah tertinggal.
+
+Contoh:
+
+    python scripts/build_css.py
+    python scripts/build_css.py --cek
+"""
+import argparse
+import re
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+VENDOR = BASE_DIR / 'sarpras' / 'static' / 'sarpras' / 'vendor'
+
+# (sumber, hasil)
+BERKAS = [
+    (VENDOR / 'bootstrap' / 'bootstrap.min.css', VENDOR / 'bootstrap' / 'bootstrap.subset.min.css'),
+    (VENDOR / 'bootstrap-icons' / 'bootstrap-icons.min.css', VENDOR / 'bootstrap-icons' / 'bootstrap-icons.subset.min.css'),
+]
+
+# tempat class dipakai; file CSS milik aplikasi sengaja tidak ikut
+# karena di sana class didefinisikan, bukan dipakai
+POLA_SUMBER = [
+    ('sarpras/templates', '**/*.html'),
+    ('templates', '**/*.html'),
+    ('sarpras', '**/*.py'),
+    ('sarpras/static/sarpras', '*.js'),
+]
+
+SAFELIST = {
+    # alert-{{ message.tags }} di daftar pesan Django
+    'alert-debug', 'alert-info', 'alert-success', 'alert-warning', 'alert-danger',
+}
+
+GRUP = ('@media', '@supports', '@container', '@layer')
+
+KATA = re.compile(r'[A-Za-z0-9_-]+')
+CLASS = re.compile(r'\.((?:[\w-]|\\.)+)')
+ATRIBUT = re.compile(r'\[\s*([\w-]+)[^\]]*\]')
+NOT = re.compile(r':not\([^()]*\)')
+
+
+# =====================================================
+# KATA YANG DIPAKAI
+# =====================================================
+def kata_dipakai():
+    kata = set(SAFELIST)
+    for folder, pola in POLA_SUMBER:
+        folder = BASE_DIR / folder
+        if not folder.is_dir():
+            continue
+        for path in folder.glob(pola):
+            if 'migrations' in path.parts:
+                continue
+            kata.update(KATA.findall(path.read_text(encoding='utf-8', errors='ignore')))
+    return kata
+
+
+# =====================================================
+# PARSER CSS SEDERHANA
+# =====================================================
+# Cukup untuk CSS hasil build (Bootstrap / Icons): aturan, komentar,
+# @charset / @import, blok @media / @supports yang bersarang, dan
+# at-rule berblok lain (@font-face, @keyframes) yang isinya disimpan
+# utuh. String dan komentar dilewati agar "{", "}" dan ";" di dalamnya
+# tidak dihitung.
+def _lewati_string(css, i):
+    kutip = css[i]
+    i += 1
+    while i < len(css) and css[i] != kutip:
+        i += 2 if css[i] == '\\' else 1
+    return i + 1
+
+
+def _cari(css, i, tanda):
+    """Indeks karakter pertama dari `tanda` di luar string / komentar / kurung."""
+    kurung = 0
+    while i < len(css):
+        c = css[i]
+        if c in '"\'':
+            i = _lewati_string(css, i)
+            continue
+        if css.startswith('/*', i):
+            i = css.index('*/', i + 2) + 2
+            continue
+        if c in '([':
+            kurung += 1
+        elif c in ')]':
+            kurung -= 1
+        elif kurung == 0 and c in tanda:
+            return i
+        i += 1
+    return len(css)
+
+
+def _akhir_blok(css, i):
+    """Indeks "}" penutup untuk "{" di posisi i."""
+    dalam = 0
+    while i < len(css):
+        c = css[i]
+        if c in '"\'':
+            i = _lewati_string(css, i)
+            continue
+        if css.startswith('/*', i):
+            i = css.index('*/', i + 2) + 2
+            continue
+        if c == '{':
+            dalam += 1
+        elif c == '}':
+            dalam -= 1
+            if dalam == 0:
+                return i
+        i += 1
+    raise ValueError('kurung kurawal tidak seimbang')
+
+
+def parse(css, i=0):
+    """List node: ('komentar', teks) / ('pernyataan', teks) /
+    ('grup', prelude, anak) / ('aturan', prelude, isi)."""
+    node = []
+    while True:
+        while i < len(css) and css[i].isspace():
+            i += 1
+        if i >= len(css):
+            return node, i
+        if css[i] == '}':
+            return node, i + 1
+        if css.startswith('/*', i):
+            j = css.index('*/', i + 2) + 2
+            node.append(('komentar', css[i:j]))
+            i = j
+            continue
+
+        j = _cari(css, i, '{;}')
+        prelude = css[i:j].strip()
+        if j >= len(css) or css[j] != '{':
+            node.append(('pernyataan', prelude + ';'))
+            i = j + 1 if j < len(css) and css[j] == ';' else j
+            continue
+
+        if prelude.lower().startswith(GRUP):
+            anak, i = parse(css, j + 1)
+            node.append(('grup', prelude, anak))
+        else:
+            k = _akhir_blok(css, j)
+            node.append(('aturan', prelude, css[j + 1:k]))
+            i = k + 1
+
+
+def _pecah_selector(prelude):
+    bagian = []
+    i = 0
+    while i < len(prelude):
+        j = _cari(prelude, i, ',')
+        bagian.append(prelude[i:j].strip())
+        i = j + 1
+    return bagian
+
+
+# =====================================================
+# PENYARINGAN
+# =====================================================
+def _unescape(nama):
+    return re.sub(r'\\(.)', r'\1', nama)
+
+
+def selector_dipakai(selector, kata):
+    # isi :not(...) tidak wajib ada: .btn:not(.disabled) tetap berlaku
+    # untuk .btn biasa
+    while True:
+        baru = NOT.sub('', selector)
+        if baru == selector:
+            break
+        selector = baru
+
+    if any(nama not in kata for nama in ATRIBUT.findall(selector)):
+        return False
+    selector = re.sub(r'\[[^\]]*\]', '', selector)
+    return all(_unescape(nama) in kata for nama in CLASS.findall(selector))
+
+
+def _nama_keyframes(prelude):
+    bagian = prelude.split(None, 1)
+    if bagian[0].lower().endswith('keyframes') and len(bagian) == 2:
+        return bagian[1].strip()
+    return None
+
+
+def saring(node, kata, keyframes=None, akar=True):
+    """Node yang tetap dipakai. keyframes=None: semua @keyframes disimpan
+    (putaran pertama); selain itu hanya yang namanya ada di set."""
+    hasil = []
+    for n in node:
+        jenis = n[0]
+        if jenis == 'komentar':
+            # hanya komentar lisensi (/*! ... */) di paling atas
+            if akar and n[1].startswith('/*!'):
+                hasil.append(n)
+        elif jenis == 'pernyataan':
+            hasil.append(n)
+        elif jenis == 'grup':
+            anak = saring(n[2], kata, keyframes, akar=False)
+            if anak:
+                hasil.append(('grup', n[1], anak))
+        elif n[1].startswith('@'):
+            nama = _nama_keyframes(n[1])
+            if nama is None or keyframes is None or nama in keyframes:
+                hasil.append(n)
+        else:
+            selector = [s for s in _pecah_selector(n[1]) if selector_dipakai(s, kata)]
+            if selector:
+                hasil.append(('aturan', ','.join(selector), n[2]))
+    return hasil
+
+
+def tulis(node):
+    teks = []
+    for n in node:
+        if n[0] in ('komentar', 'pernyataan'):
+            teks.append(n[1])
+        elif n[0] == 'grup':
+            teks.append(f'{n[1]}{{{tulis(n[2])}}}')
+        else:
+            teks.append(f'{n[1]}{{{n[2]}}}')
+    return ''.join(teks)
+
+
+def _semua_keyframes(node):
+    for n in node:
+        if n[0] == 'grup':
+            yield from _semua_keyframes(n[2])
+        elif n[0] == 'aturan' and n[1].startswith('@'):
+            nama = _nama_keyframes(n[1])
+            if nama:
+                yield nama
+
+
+def subset(css, kata):
+    node, _ = parse(css)
+    tersaring = saring(node, kata)
+
+    # @keyframes hanya disimpan jika namanya masih disebut aturan lain
+    tanpa_keyframes = tulis(saring(tersaring, kata, keyframes=set()))
+    dirujuk = {
+        nama for nama in _semua_keyframes(tersaring)
+        if re.search(rf'(?<![\w-]){re.escape(nama)}(?![\w-])', tanpa_keyframes)
+    }
+    return tulis(saring(tersaring, kata, keyframes=dirujuk)) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cek', action='store_true',
+                        help='jangan menulis, gagal jika subset yang ada sudah tertinggal')
+    args = parser.parse_args()
+
+    kata = kata_dipakai()
+    tertinggal = []
+
+    for sumber, tujuan in BERKAS:
+        asli = sumber.read_text(encoding='utf-8')
+        hasil = subset(asli, kata)
+        nama = tujuan.relative_to(BASE_DIR)
+
+        if args.cek:
+            lama = tujuan.read_text(encoding='utf-8') if tujuan.exists() else None
+            if lama != hasil:
+                tertinggal.append(nama)
+            continue
+
+        tujuan.write_text(hasil, encoding='utf-8')
+        print(f'{nama}: {len(asli.encode()) / 1024:.1f} KB -> {len(hasil.encode()) / 1024:.1f} KB')
+
+    if tertinggal:
+        for nama in tertinggal:
+            print(f'{nama} tertinggal dari template, jalankan: python scripts/build_css.py')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
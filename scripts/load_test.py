@@ -0,0 +1,311 @@
+"""
+Uji beban: campuran URL berbobot, banyak klien bersamaan, ke server lokal.
+
+Script ini memakai settings Django hanya untuk membangun URL (reverse)
+dan mengambil contoh id ruangan / barang dari database yang SAMA dengan
+server yang diuji, jadi jalankan dengan DATABASE_URL yang sama. Isi
+dulu database dengan `python manage.py seed_sarpras --skala N`.
+
+Setiap klien adalah satu thread dengan koneksi HTTP keep-alive sendiri.
+Hasilnya per endpoint: jumlah request, error (status >= 400 / gagal
+koneksi), throughput, serta latensi p50 / p95 / p99 / maks.
+
+Contoh:
+
+    gunicorn config.asgi:application -k uvicorn_worker.UvicornWorker -w 4 &
+    python scripts/load_test.py -c 20 --durasi 60
+    python scripts/load_test.py --url http://127.0.0.1:8000 -c 50 --tulis --json hasil.json
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.cookies import SimpleCookie
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from sarpras.models import BarangHabisPakai, Buku, PeralatanMesin, Ruangan  # noqa: E402
+
+
+# (bobot, nama URL, jenis parameter); bobot kira-kira mengikuti pemakaian
+# harian: halaman daftar & dashboard jauh lebih sering dari cetak PDF.
+# Cetak PDF / Excel seluruh KIB tidak ikut: durasinya tumbuh linear
+# dengan jumlah data dan satu request bisa memakan worker beberapa menit
+# pada skala kabupaten, jadi ukur terpisah. KIR per ruangan tetap ikut.
+CAMPURAN = [
+    (20, 'dashboard', None),
+    (12, 'peralatan_list', 'halaman'),
+    (4, 'peralatan_list', 'cari'),
+    (8, 'buku_list', 'halaman'),
+    (8, 'bhp_list', None),
+    (6, 'ruangan_list', None),
+    (4, 'aset_per_ruangan', None),
+    (6, 'peminjaman_list', None),
+    (3, 'pengembalian_list', None),
+    (3, 'reservasi_list', None),
+    (3, 'ketersediaan', None),
+    (3, 'peralatan_rekap', None),
+    (3, 'buku_rekap', None),
+    (3, 'bhp_restock', None),
+    (2, 'bhp_prakiraan', None),
+    (4, 'bhp_kartu_stok', 'bhp'),
+    (2, 'bhp_saldo_bulanan', None),
+    (2, 'api_hierarki_aset', None),
+    (2, 'cetak_kir', 'ruangan'),
+    (1, 'cetak_kir_pdf', 'ruangan'),
+]
+
+# transaksi BHP (POST dengan token CSRF), hanya dengan --tulis
+CAMPURAN_TULIS = [
+    (3, 'bhp_keluar', 'post_keluar'),
+    (2, 'bhp_masuk', 'post_masuk'),
+]
+
+KATA_CARI = ['Meja', 'Kursi', 'Proyektor', 'Laptop', 'Printer', 'Lemari']
+
+
+def _contoh_id(queryset, n=200):
+    ids = list(queryset.order_by('?').values_list('id', flat=True)[:n])
+    if not ids:
+        raise SystemExit(
+            f'Tidak ada data {queryset.model.__name__}; jalankan dulu '
+            '`python manage.py seed_sarpras`'
+        )
+    return ids
+
+
+class Klien:
+    """Satu koneksi keep-alive; dibuka ulang jika server memutus."""
+
+    def __init__(self, url, host):
+        bagian = urlsplit(url)
+        self.kelas = http.client.HTTPSConnection if bagian.scheme == 'https' else http.client.HTTPConnection
+        self.netloc = bagian.netloc
+        self.host = host
+        self.cookie = {}
+        self.koneksi = None
+
+    def kirim(self, method, path, body=None, header=None):
+        header = dict(header or {})
+        header['Host'] = self.host
+        if self.cookie:
+            header['Cookie'] = '; '.join(f'{k}={v}' for k, v in self.cookie.items())
+
+        for percobaan in range(2):
+            if self.koneksi is None:
+                self.koneksi = self.kelas(self.netloc, timeout=120)
+            try:
+                self.koneksi.request(method, path, body=body, headers=header)
+                response = self.koneksi.getresponse()
+                response.read()
+            except (http.client.HTTPException, OSError):
+                self.koneksi.close()
+                self.koneksi = None
+                if percobaan:
+                    raise
+                continue
+
+            for baris in response.headers.get_all('Set-Cookie') or []:
+                for nama, morsel in SimpleCookie(baris).items():
+                    self.cookie[nama] = morsel.value
+            if response.getheader('Connection', '').lower() == 'close':
+                self.koneksi.close()
+                self.koneksi = None
+            return response.status
+
+    def csrf(self):
+        if 'csrftoken' not in self.cookie:
+            self.kirim('GET', reverse('bhp_masuk'))
+        return self.cookie.get('csrftoken', '')
+
+
+class Uji:
+    def __init__(self, args):
+        self.args = args
+        self.host = args.host or _host_default()
+
+        self.ruangan = _contoh_id(Ruangan.objects.all())
+        self.bhp = _contoh_id(BarangHabisPakai.objects.all())
+        self.jumlah_halaman = {
+            'peralatan_list': max(1, PeralatanMesin.objects.count() // 5),
+            'buku_list': max(1, Buku.objects.count() // 10),
+        }
+
+        campuran = CAMPURAN + (CAMPURAN_TULIS if args.tulis else [])
+        self.bobot = [c[0] for c in campuran]
+        self.endpoint = [(nama, jenis) for _, nama, jenis in campuran]
+
+        self.hasil = defaultdict(list)
+        self.error = defaultdict(int)
+        self.kunci = threading.Lock()
+
+    def label(self, nama, jenis):
+        # pencarian dipisah dari daftar biasa karena query-nya berbeda
+        return f'{nama}?q' if jenis == 'cari' else nama
+
+    def permintaan(self, rng, klien, nama, jenis):
+        """(method, path, body, header) untuk satu request."""
+        if jenis == 'halaman':
+            return 'GET', reverse(nama) + '?' + urlencode({'page': rng.randint(1, self.jumlah_halaman[nama])}), None, None
+        if jenis == 'cari':
+            return 'GET', reverse(nama) + '?' + urlencode({'q': rng.choice(KATA_CARI)}), None, None
+        if jenis == 'ruangan':
+            return 'GET', reverse(nama, args=[rng.choice(self.ruangan)]), None, None
+        if jenis == 'bhp':
+            return 'GET', reverse(nama, args=[rng.choice(self.bhp)]), None, None
+        if jenis in ('post_keluar', 'post_masuk'):
+            token = klien.csrf()
+            data = {'barang': rng.choice(self.bhp), 'jumlah': rng.randint(1, 3)}
+            if jenis == 'post_keluar':
+                data.update(pengguna='Uji Beban', keperluan='KBM')
+            else:
+                data.update(sumber='Uji Beban')
+            header = {
+                'Content-Type': 'application/x-www-form-urlencoded',
+                'X-CSRFToken': token,
+            }
+            return 'POST', reverse(nama), urlencode(data), header
+        return 'GET', reverse(nama), None, None
+
+    def pekerja(self, nomor, batas_waktu):
+        rng = random.Random(self.args.seed * 1000 + nomor)
+        klien = Klien(self.args.url, self.host)
+
+        while time.monotonic() < batas_waktu:
+            nama, jenis = rng.choices(self.endpoint, weights=self.bobot)[0]
+            method, path, body, header = self.permintaan(rng, klien, nama, jenis)
+
+            mulai = time.perf_counter()
+            try:
+                status = klien.kirim(method, path, body, header)
+            except (http.client.HTTPException, OSError):
+                status = None
+            durasi = time.perf_counter() - mulai
+
+            label = self.label(nama, jenis)
+            with self.kunci:
+                if status is None or status >= 400:
+                    self.error[label] += 1
+                else:
+                    self.hasil[label].append(durasi)
+
+    def jalankan(self):
+        if self.args.pemanasan:
+            self._putaran(self.args.pemanasan)
+            self.hasil.clear()
+            self.error.clear()
+
+        return self._putaran(self.args.durasi)
+
+    def _putaran(self, detik):
+        batas_waktu = time.monotonic() + detik
+        thread = [
+            threading.Thread(target=self.pekerja, args=(i, batas_waktu), daemon=True)
+            for i in range(self.args.c)
+        ]
+        mulai = time.perf_counter()
+        for t in thread:
+            t.start()
+        for t in thread:
+            t.join()
+        return time.perf_counter() - mulai
+
+
+def _host_default():
+    host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else 'localhost'
+    return 'localhost' if host in ('*', '') else host.lstrip('.')
+
+
+def persentil(data_urut, p):
+    """Persentil nearest-rank dari list yang sudah diurutkan."""
+    if not data_urut:
+        return 0.0
+    indeks = max(0, min(len(data_urut) - 1, round(p / 100 * len(data_urut) + 0.5) - 1))
+    return data_urut[indeks]
+
+
+def ringkas(label, latensi, error, durasi):
+    latensi = sorted(latensi)
+    return {
+        'endpoint': label,
+        'n': len(latensi),
+        'error': error,
+        'rps': len(latensi) / durasi,
+        'p50_ms': persentil(latensi, 50) * 1000,
+        'p95_ms': persentil(latensi, 95) * 1000,
+        'p99_ms': persentil(latensi, 99) * 1000,
+        'maks_ms': (latensi[-1] if latensi else 0) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='alamat server yang diuji')
+    parser.add_argument('--host', help='header Host (default: ALLOWED_HOSTS[0])')
+    parser.add_argument('-c', type=int, default=10, help='jumlah klien bersamaan')
+    parser.add_argument('--durasi', type=float, default=30, help='lama pengukuran (detik)')
+    parser.add_argument('--pemanasan', type=float, default=5, help='pemanasan sebelum diukur (detik, 0 = tanpa)')
+    parser.add_argument('--tulis', action='store_true', help='ikutkan transaksi BHP masuk / keluar (POST)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='simpan hasil ke file JSON')
+    args = parser.parse_args()
+
+    uji = Uji(args)
+    print(f'{args.url} (Host: {uji.host}), {args.c} klien, {args.durasi:g} detik'
+          + (', dengan transaksi tulis' if args.tulis else ''))
+    durasi = uji.jalankan()
+
+    baris = [
+        ringkas(label, uji.hasil.get(label, []), uji.error.get(label, 0), durasi)
+        for label in sorted(set(uji.hasil) | set(uji.error))
+    ]
+    baris.sort(key=lambda b: b['p95_ms'], reverse=True)
+    total = ringkas(
+        'TOTAL',
+        [x for latensi in uji.hasil.values() for x in latensi],
+        sum(uji.error.values()),
+        durasi,
+    )
+
+    print()
+    print(f'{"endpoint":<28}{"n":>7}{"err":>6}{"req/s":>8}{"p50":>9}{"p95":>9}{"p99":>9}{"maks":>9}  (ms)')
+    for b in baris + [total]:
+        print(
+            f'{b["endpoint"][:27]:<28}{b["n"]:>7}{b["error"]:>6}{b["rps"]:>8.1f}'
+            f'{b["p50_ms"]:>9.1f}{b["p95_ms"]:>9.1f}{b["p99_ms"]:>9.1f}{b["maks_ms"]:>9.1f}'
+        )
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'url': args.url,
+                'klien': args.c,
+                'durasi_detik': durasi,
+                'tulis': args.tulis,
+                'endpoint': baris,
+                'total': total,
+            }, f, indent=2)
+        print(f'\nhasil disimpan ke {args.json}')
+
+    if total['error']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()